@@ -45,13 +45,22 @@ def get_optimizer_settings():
                 "enable_scheduler_tuning": True,
                 "governor": "performance",
                 "priority_processes": ["python3", "nginx"],
+                "priority_nice": -5,
                 "scheduler_policy": "SCHED_FIFO",
-                "target_processes": ["python3"]
+                "scheduler_priority": 50,
+                "target_processes": ["python3"],
+                # true 면 프로세스 이름 대신 전체 명령줄에서 검색 (pgrep -f)
+                "match_cmdline": False
             },
             "io": {
                 "enable": True,
-                "scheduler": "deadline",
-                "read_ahead_kb": 128
+                # 장치 종류별(rotational/ssd/nvme/stacked/virtual) 기본 프로필을 덮어쓸 값
+                "profiles": {},
+                # 장치 이름 또는 글롭별 덮어쓰기 (예: {"nvme*": {"read_ahead_kb": 64}, "sdb": {"scheduler": "bfq"}})
+                "devices": {},
+                # 경로가 위치한 디스크별 덮어쓰기 (예: {"/var/lib/postgresql": {"read_ahead_kb": 64}})
+                "paths": {},
+                "exclude": ["loop*", "ram*", "zram*"]
             }
         },
 
@@ -59,7 +68,22 @@ def get_optimizer_settings():
             "swappiness": 10,
             "drop_caches_on_schedule": True,
             "drop_cache_mode": "3",
-            "low_memory_threshold_percent": 15
+            # PSI 미지원 커널에서만 사용하는 대체 임계치
+            "low_memory_threshold_percent": 15,
+            # /proc/pressure 기반 단계적 회수 (compact -> drop_caches=1 -> drop_caches=3)
+            "pressure_monitor": {
+                "enable": True,
+                "interval_seconds": 5,
+                "use_triggers": True,
+                "trigger_stall_ms": 150,
+                "trigger_window_ms": 2000,
+                "high_some_avg10": 10.0,
+                "high_full_avg10": 5.0,
+                "low_some_avg10": 2.0,
+                "cooldown_seconds": 60,
+                "settle_seconds": 10,
+                "io_full_avg10_limit": 20.0
+            }
         },
 
         "service_management": {
@@ -71,7 +95,14 @@ def get_optimizer_settings():
         },
 
         "automation": {
-            "use_crontab": True,
+            # 예약 작업은 crontab 대신 상주 스케줄러(python -m src.main scheduler)가 실행
+            "use_crontab": False,
+            "scheduler": {
+                "state_path": "cache/scheduler_state.json",
+                "jitter_seconds": 30,
+                "catch_up_missed": True,
+                "class_limits": {"backup": 1, "maintenance": 2, "cleanup": 1}
+            },
             "scheduled_tasks": [
                 {
                     "name": "memory_cache_cleaner",
@@ -82,6 +113,10 @@ def get_optimizer_settings():
                     "name": "zombie_checker",
                     "schedule": "*/30 * * * *",
                     "command": "ps -eo stat,ppid | awk '$1 ~ /Z/ { print $2 }' | xargs -r kill -9"
+                },
+                {
+                    "name": "unified_cleanup",
+                    "schedule": "30 3 * * *"
                 }
             ]
         },
@@ -114,7 +149,12 @@ def get_optimizer_settings():
                 ],
                 "min_file_age_minutes": 30,
                 "remove_empty_dirs": True,
-                "log_file_path": "logs/unified_cleanup.log"
+                "log_file_path": "logs/unified_cleanup.log",
+                "workers": 4,
+                "log_batch_size": 1000,
+                "incremental": True,
+                "scan_cache_path": "cache/unified_cleanup.sqlite",
+                "full_rescan_hours": 24
             }
         },
 
@@ -123,8 +163,14 @@ def get_optimizer_settings():
             "backup_interval_hours": 24,
             "backup_location": "/home/사용자명/backups",
             "backup_format": "zip",
+            "compression_level": 6,
+            "compression_workers": os.cpu_count() or 1,
+            "incremental": True,
+            "synthetic_full_every": 7,
             "restore_cycle_days": 7,
             "restore_points": 5,
+            # 보존 정책 GFS 단계 (일/주/월별 대표 백업 보존 개수, 0 이면 사용 안 함)
+            "gfs_retention": {"daily": 0, "weekly": 0, "monthly": 0},
 
             "restore_targets": {
                 "sshd_config": "/etc/ssh/sshd_config",
@@ -145,7 +191,33 @@ def get_optimizer_settings():
             "enable": True,
             "log_level": "INFO",
             "log_file_path": str(Path("logs/system.log")),
-            "max_log_size_mb": 50
+            "max_log_size_mb": 50,
+            "backup_count": 5,
+            "compress_rotated": True,
+            "json_log_path": None
+        },
+
+        "metrics": {
+            "enable": True,
+            "textfile_dir": "/var/lib/node_exporter/textfile_collector",
+            "interval_seconds": 60
+        },
+
+        "daemon": {
+            "socket_path": "/run/linux-optimizer.sock",
+            "socket_group": None,
+            "max_queue": 16
+        },
+
+        "execution": {
+            "max_workers": 4,
+            "default_timeout_seconds": 600,
+            "section_timeouts": {
+                "Disk": 3600
+            },
+            "dependencies": {
+                "Disk": ["I/O"]
+            }
         },
 
         "notification_settings": {
@@ -0,0 +1,286 @@
+import copy
+import json
+import math
+import mmap
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RESULTS_DIR = "benchmarks/results"
+# O_DIRECT 는 tmpfs 에서 지원되지 않는 경우가 많아 기본 작업 디렉토리는 디스크 기반 /var/tmp
+DEFAULT_WORK_DIR = "/var/tmp"
+BLOCK_SIZE = 4096
+DEFAULT_SIZES = {
+    "cpu_iterations": 2_000_000,
+    "memory_mb": 64,
+    "alloc_count": 200_000,
+    "file_mb": 64,
+    "random_reads": 2_000,
+    "fork_count": 50,
+    "fsync_count": 50,
+}
+SEED = 1234
+
+# 95% 양측 t 분포 임계값 (자유도 1~30, 그 이상은 정규분포 근사)
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def _t_critical(df):
+    if df < 1:
+        return float("inf")
+    return T_95[int(df) - 1] if df <= len(T_95) else 1.96
+
+
+# ── 작업 부하 (각 함수는 고정된 양의 작업을 수행, 측정값은 소요 시간) ──
+
+def cpu_loop(sizes, work_dir):
+    total = 0
+    for i in range(sizes["cpu_iterations"]):
+        total = (total + i * i) % 1_000_003
+    return total
+
+
+def memory_bandwidth(sizes, work_dir):
+    src = bytearray(sizes["memory_mb"] * 1024 * 1024)
+    dst = bytearray(len(src))
+    view = memoryview(dst)
+    for _ in range(4):
+        view[:] = src
+    return len(src) * 4
+
+
+def memory_alloc(sizes, work_dir):
+    blocks = [bytearray(256) for _ in range(sizes["alloc_count"])]
+    blocks.clear()
+    large = [bytearray(1024 * 1024) for _ in range(sizes["memory_mb"])]
+    return len(large)
+
+
+def _aligned_buffer(size):
+    # O_DIRECT 는 버퍼 주소/길이가 블록 단위로 정렬되어야 하므로 페이지 정렬된 익명 mmap 사용
+    buf = mmap.mmap(-1, size)
+    buf.write(random.Random(SEED).randbytes(size))
+    return buf
+
+
+def _open_direct(path, flags):
+    """O_DIRECT 로 열고, 파일 시스템이 지원하지 않으면 일반 모드로 열기 (반환: fd, direct 여부)"""
+    direct = getattr(os, "O_DIRECT", 0)
+    if direct:
+        try:
+            return os.open(path, flags | direct, 0o600), True
+        except OSError:
+            pass
+    return os.open(path, flags, 0o600), False
+
+
+def _data_file(work_dir):
+    return os.path.join(work_dir, f".optimizer-bench-{os.getpid()}.dat")
+
+
+def seq_write(sizes, work_dir):
+    path = _data_file(work_dir)
+    chunk = 1024 * 1024
+    buf = _aligned_buffer(chunk)
+    fd, direct = _open_direct(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    try:
+        for _ in range(sizes["file_mb"]):
+            os.write(fd, buf)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+        buf.close()
+    return direct
+
+
+def seq_read(sizes, work_dir):
+    path = _data_file(work_dir)
+    chunk = 1024 * 1024
+    buf = mmap.mmap(-1, chunk)
+    fd, direct = _open_direct(path, os.O_RDONLY)
+    try:
+        while os.readv(fd, [buf]) > 0:
+            pass
+    finally:
+        os.close(fd)
+        buf.close()
+    return direct
+
+
+def random_read(sizes, work_dir):
+    path = _data_file(work_dir)
+    rng = random.Random(SEED)
+    blocks = sizes["file_mb"] * 1024 * 1024 // BLOCK_SIZE
+    buf = mmap.mmap(-1, BLOCK_SIZE)
+    fd, direct = _open_direct(path, os.O_RDONLY)
+    try:
+        for _ in range(sizes["random_reads"]):
+            os.preadv(fd, [buf], rng.randrange(blocks) * BLOCK_SIZE)
+    finally:
+        os.close(fd)
+        buf.close()
+    return direct
+
+
+def fork_exec(sizes, work_dir):
+    for _ in range(sizes["fork_count"]):
+        subprocess.run(["true"], check=True)
+    return sizes["fork_count"]
+
+
+def fsync_latency(sizes, work_dir):
+    path = os.path.join(work_dir, f".optimizer-bench-{os.getpid()}.fsync")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        block = b"x" * BLOCK_SIZE
+        for _ in range(sizes["fsync_count"]):
+            os.write(fd, block)
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+        os.unlink(path)
+    return sizes["fsync_count"]
+
+
+# 실행 순서가 중요 (seq_write 가 만든 파일을 seq_read/random_read 가 읽음)
+WORKLOADS = [
+    ("cpu_loop", cpu_loop),
+    ("memory_bandwidth", memory_bandwidth),
+    ("memory_alloc", memory_alloc),
+    ("seq_write", seq_write),
+    ("seq_read", seq_read),
+    ("random_read", random_read),
+    ("fork_exec", fork_exec),
+    ("fsync_latency", fsync_latency),
+]
+
+
+def summarize(samples):
+    """평균과 95% 신뢰구간 반폭"""
+    mean = statistics.fmean(samples)
+    if len(samples) < 2:
+        return {"mean": mean, "ci95": None, "stdev": 0.0, "samples": samples}
+    stdev = statistics.stdev(samples)
+    return {"mean": mean, "ci95": _t_critical(len(samples) - 1) * stdev / math.sqrt(len(samples)),
+            "stdev": stdev, "samples": samples}
+
+
+def run_workloads(samples=5, sizes=None, work_dir=DEFAULT_WORK_DIR, only=None):
+    """
+    각 작업 부하를 1회 워밍업 후 samples 회 측정 (값: 초, 작을수록 좋음)
+    반환: {이름: {"mean", "ci95", "stdev", "samples", "direct_io"?}}
+    """
+    sizes = dict(DEFAULT_SIZES, **(sizes or {}))
+    os.makedirs(work_dir, exist_ok=True)
+    results = {}
+    try:
+        for name, workload in WORKLOADS:
+            if only and name not in only:
+                continue
+            workload(sizes, work_dir)
+            durations = []
+            for _ in range(samples):
+                start = time.perf_counter()
+                outcome = workload(sizes, work_dir)
+                durations.append(time.perf_counter() - start)
+            results[name] = summarize(durations)
+            if name in ("seq_write", "seq_read", "random_read"):
+                results[name]["direct_io"] = bool(outcome)
+            logger.info(f"[PASS] bench {name} | 평균 {results[name]['mean']:.4f}s")
+    finally:
+        data = _data_file(work_dir)
+        if os.path.exists(data):
+            os.unlink(data)
+    return results
+
+
+def compare(before, after):
+    """
+    작업 부하별 변화율(%)과 평균 차이의 95% 신뢰구간 (Welch t)
+    음수 = 빨라짐, 신뢰구간이 0 을 포함하지 않으면 significant
+    """
+    deltas = {}
+    for name in before:
+        if name not in after:
+            continue
+        b, a = before[name], after[name]
+        nb, na = len(b["samples"]), len(a["samples"])
+        diff = a["mean"] - b["mean"]
+        ci = None
+        if nb > 1 and na > 1:
+            vb, va = b["stdev"] ** 2 / nb, a["stdev"] ** 2 / na
+            se = math.sqrt(vb + va)
+            if se > 0:
+                df = (vb + va) ** 2 / ((vb ** 2) / (nb - 1) + (va ** 2) / (na - 1))
+                ci = _t_critical(max(1, math.floor(df))) * se
+            else:
+                ci = 0.0
+        deltas[name] = {
+            "before": b["mean"], "after": a["mean"], "diff": diff,
+            "percent": diff / b["mean"] * 100 if b["mean"] else None,
+            "ci95": ci,
+            "significant": ci is not None and abs(diff) > ci,
+        }
+    return deltas
+
+
+def format_deltas(deltas):
+    lines = []
+    for name, d in deltas.items():
+        ci = f"±{d['ci95'] * 1000:.2f}ms" if d["ci95"] is not None else "±?"
+        percent = f"{d['percent']:+.1f}%" if d["percent"] is not None else "-"
+        if not d["significant"]:
+            mark = "➖"
+        else:
+            mark = "✅" if d["diff"] < 0 else "❌"
+        lines.append(f"{mark} {name:<17} {d['before'] * 1000:10.2f}ms -> {d['after'] * 1000:10.2f}ms "
+                     f"{percent:>8} (차이 {d['diff'] * 1000:+.2f}ms {ci})")
+    return lines
+
+
+def save_result(result, results_dir=RESULTS_DIR):
+    """측정 결과를 사용한 설정과 함께 저장 (반환: 파일 경로)"""
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=4, ensure_ascii=False)
+    os.replace(tmp, path)
+    return path
+
+
+def run_bench(config, apply, samples=5, sizes=None, work_dir=DEFAULT_WORK_DIR, results_dir=RESULTS_DIR,
+              label=None):
+    """
+    프로필 적용 전 측정 -> apply() -> 적용 후 측정, 변화량 계산 후 결과 파일 저장
+    apply 가 None 이면 적용 없이 같은 조건에서 두 번 측정 (측정 잡음 확인용)
+    """
+    config = copy.deepcopy(config)
+    before = run_workloads(samples, sizes, work_dir)
+    applied = apply() if apply is not None else None
+    after = run_workloads(samples, sizes, work_dir)
+    result = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "label": label,
+        "host": os.uname().nodename,
+        "kernel": os.uname().release,
+        "python": sys.version.split()[0],
+        "samples": samples,
+        "sizes": dict(DEFAULT_SIZES, **(sizes or {})),
+        "config": config,
+        "applied": applied,
+        "before": before,
+        "after": after,
+        "deltas": compare(before, after),
+    }
+    result["path"] = save_result(result, results_dir)
+    return result
@@ -0,0 +1,464 @@
+import collections
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import struct
+import threading
+import time
+from pathlib import Path
+from src.optimizer import optimize_system
+from src.restore import (CATALOG_DIR_NAME, CUSTOM_BACKUP_DIR, backup_directory, backup_directory_stream,
+                         backup_file, backup_file_stream, restore_custom_backup, restore_custom_backup_members,
+                         write_file_stream, write_tar_stream)
+from src.utils.config import DEFAULT_CONFIG_PATH
+from src.utils.daemon_client import DEFAULT_SETTINGS, RpcError, load_settings
+from src.utils.logger import get_logger, set_process
+from src.utils import events, metrics
+
+logger = get_logger(__name__)
+
+# JSON-RPC 2.0 오류 코드 (-32000 은 구현 정의 영역)
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+QUEUE_FULL = -32000
+PERMISSION_DENIED = -32001
+
+# 시스템 전체를 바꾸는 메서드는 root 만 호출 가능 (backup/restore 는 호출자 권한으로 검사)
+ROOT_ONLY = {"optimize", "install_defaults"}
+# 데몬이 root 권한으로 만든 백업의 요청자 uid (백업 디렉토리 스캔으로는 알 수 없으므로 별도 기록)
+OWNERS_PATH = CUSTOM_BACKUP_DIR / CATALOG_DIR_NAME / "owners.json"
+
+# SO_PEERCRED 로 얻은 접속 프로세스 정보 (얻지 못하면 모두 None -> 권한 없음으로 처리)
+Caller = collections.namedtuple("Caller", "pid uid gid")
+
+
+def _error(request_id, code, message):
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class ConnectionEmitter(events.EventEmitter):
+    """이벤트를 요청한 클라이언트 연결로 JSON-RPC 알림(method=event) 전송"""
+
+    def __init__(self, send):
+        super().__init__()
+        self._send = send
+
+    def emit(self, event_type, **fields):
+        self._send({"jsonrpc": "2.0", "method": "event",
+                    "params": {"ts": round(time.time(), 3), "type": event_type, **fields}})
+
+
+def _drop_privileges(caller):
+    try:
+        import pwd
+        groups = os.getgrouplist(pwd.getpwuid(caller.uid).pw_name, caller.gid)
+    except KeyError:
+        groups = [caller.gid]
+    os.setgroups(groups)
+    os.setgid(caller.gid)
+    os.setuid(caller.uid)
+
+
+def run_as(caller, func, *args):
+    """
+    fork 한 자식 프로세스에서 호출자 uid/gid 로 권한을 낮춘 뒤 func 실행 (접근 권한은 커널이 검사)
+    결과는 JSON 으로 파이프를 통해 전달, 자식이 실패하면 PERMISSION_DENIED
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.close(read_fd)
+            _drop_privileges(caller)
+            result = func(*args)
+            with os.fdopen(write_fd, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, default=str)
+            code = 0
+        except BaseException:
+            pass
+        finally:
+            os._exit(code)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "r", encoding="utf-8") as f:
+        data = f.read()
+    _, status = os.waitpid(pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0 or not data:
+        raise RpcError(PERMISSION_DENIED, f"uid {caller.uid} 권한으로 실행 실패")
+    return json.loads(data)
+
+
+class ChildStream:
+    """
+    fork 한 자식이 호출자 uid/gid 로 권한을 낮춘 뒤 produce(path, out) 로 쓴 데이터를 읽는 파일 객체
+    root 인 부모는 원본을 직접 열지 않으므로 검사 후 심볼릭 링크로 바꿔치기해도 호출자가 읽을 수 있는 것만 담김
+    EOF 에서 자식이 실패했으면 OSError (잘린 스트림이 완료된 백업으로 저장되지 않도록)
+    """
+
+    def __init__(self, caller, produce, path):
+        read_fd, write_fd = os.pipe()
+        err_read, err_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                os.close(read_fd)
+                os.close(err_read)
+                _drop_privileges(caller)
+                with os.fdopen(write_fd, "wb") as out:
+                    produce(path, out)
+                code = 0
+            except BaseException as e:
+                try:
+                    os.write(err_write, str(e).encode("utf-8")[:4096])
+                except OSError:
+                    pass
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        os.close(err_write)
+        self._pid = pid
+        self._file = os.fdopen(read_fd, "rb")
+        self._err_fd = err_read
+        self.error = None
+        self.returncode = None
+
+    def _reap(self):
+        if self.returncode is None:
+            _, status = os.waitpid(self._pid, 0)
+            self.returncode = os.waitstatus_to_exitcode(status)
+            with os.fdopen(self._err_fd, "rb") as f:
+                message = f.read().decode("utf-8", "replace")
+            if self.returncode != 0:
+                self.error = message or f"종료 코드 {self.returncode}"
+
+    def read(self, size=-1):
+        data = self._file.read(size)
+        if not data and size != 0:
+            self._reap()
+            if self.error is not None:
+                raise OSError(self.error)
+        return data
+
+    def close(self):
+        # 받는 쪽이 먼저 끝나도 자식이 파이프 쓰기에서 멈추지 않도록 남은 데이터를 비운 뒤 회수
+        while self._file.read(1024 * 1024):
+            pass
+        self._file.close()
+        self._reap()
+
+
+class Job:
+    def __init__(self, method, params, send, caller):
+        self.method = method
+        self.params = params
+        self.send = send
+        self.caller = caller
+        self.queued = time.time()
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class OptimizerDaemon:
+    """
+    요청 처리기: 시스템을 바꾸는 작업은 큐에 넣어 작업 스레드 1개가 순서대로 실행
+    status/metrics/ping 은 연결 스레드에서 바로 응답 (작업 실행 중에도 지연 없음)
+    """
+
+    def __init__(self, settings=None, handlers=None):
+        settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+        self._owners_lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=settings["max_queue"])
+        self.started = time.time()
+        self.current = None
+        self.completed = 0
+        self.last = {}
+        self.handlers = handlers or {
+            "optimize": self._optimize,
+            "backup": self._backup,
+            "restore": self._restore,
+            "install_defaults": self._install_defaults,
+        }
+        self.immediate = {
+            "ping": lambda params, send, caller: "pong",
+            "status": lambda params, send, caller: self.status(),
+            "metrics": lambda params, send, caller: metrics.exposition(),
+        }
+        self._worker = threading.Thread(target=self._run_worker, name="daemon-worker", daemon=True)
+        self._worker.start()
+
+    # ── 작업 ──
+
+    # ── 백업 소유자 ──
+
+    def _load_owners(self):
+        try:
+            with open(OWNERS_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _record_owner(self, name, uid):
+        with self._owners_lock:
+            owners = self._load_owners()
+            owners[name] = uid
+            OWNERS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp = OWNERS_PATH.with_name(f".{OWNERS_PATH.name}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(owners, f)
+            os.replace(tmp, OWNERS_PATH)
+
+    def owner_of(self, name):
+        """백업을 요청한 uid (데몬 밖에서 root 가 만든 백업은 0)"""
+        return self._load_owners().get(name, 0)
+
+    # ── 작업 ──
+
+    def _optimize(self, params, send, caller):
+        emitter = ConnectionEmitter(send) if params.get("events", True) else None
+        return optimize_system(emitter=emitter)
+
+    def _backup(self, params, send, caller):
+        path = params.get("path")
+        # 상대 경로는 호출자가 아니라 데몬의 작업 디렉토리 기준으로 해석되므로 받지 않음
+        if not path or not os.path.isabs(path):
+            raise RpcError(INVALID_PARAMS, f"백업할 경로는 절대 경로여야 함: {path}")
+        if not os.path.exists(path):
+            raise RpcError(INVALID_PARAMS, f"백업할 경로가 없음: {path}")
+        path = os.path.realpath(path)
+        is_dir = os.path.isdir(path)
+        if caller.uid == 0:
+            message = backup_directory(path) if is_dir else backup_file(path)
+        else:
+            # 원본은 호출자 권한의 자식 프로세스만 읽고 데몬은 받은 스트림을 일반 tar.gz/파일 백업으로 저장
+            stream = ChildStream(caller, write_tar_stream if is_dir else write_file_stream, path)
+            try:
+                message = (backup_directory_stream if is_dir else backup_file_stream)(stream, path)
+            finally:
+                stream.close()
+            if stream.error is not None:
+                raise RpcError(PERMISSION_DENIED, f"uid {caller.uid} 권한으로 읽기 실패: {stream.error}")
+        ok = message.startswith("✅")
+        if ok:
+            # 결과 문자열 끝의 백업 경로 ("✅ ... 완료: custom_backups/<이름>")
+            self._record_owner(Path(message.rsplit(": ", 1)[1]).name, caller.uid)
+        return {"ok": ok, "message": message}
+
+    def _restore(self, params, send, caller):
+        name, dest = params.get("backup"), params.get("dest")
+        # 백업 디렉토리 밖의 파일을 지정하지 못하도록 이름만 허용
+        if not name or Path(name).name != name or not dest:
+            raise RpcError(INVALID_PARAMS, "backup(이름), dest 가 필요함")
+        if not os.path.isabs(dest):
+            raise RpcError(INVALID_PARAMS, f"복원 위치는 절대 경로여야 함: {dest}")
+        backup_path = CUSTOM_BACKUP_DIR / name
+        members = params.get("members")
+        if caller.uid == 0:
+            return _restore_backup(backup_path, dest, members)
+        if self.owner_of(name) != caller.uid:
+            raise RpcError(PERMISSION_DENIED, f"uid {caller.uid} 가 만든 백업이 아님: {name}")
+        # 복원 위치 쓰기 권한, 심볼릭 링크, setuid 등은 호출자 권한으로 실행해 커널이 검사
+        return run_as(caller, _restore_backup, backup_path, dest, members)
+
+    def _install_defaults(self, params, send, caller):
+        # 순환 import 방지 + 설정 생성은 드물게 쓰므로 필요할 때만 로드
+        from config import config_builder
+        config_builder.main()
+        return {"ok": True}
+
+    def _run_worker(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            self.current = job
+            start = time.monotonic()
+            try:
+                job.result = self.handlers[job.method](job.params, job.send, job.caller)
+                status = "ok"
+            except RpcError as e:
+                job.error = e
+                status = "error"
+            except Exception as e:
+                logger.exception(f"[FAIL] 데몬 작업 {job.method} | 오류: {e}")
+                job.error = RpcError(INTERNAL_ERROR, str(e))
+                status = "error"
+            finally:
+                self.current = None
+                self.completed += 1
+                self.last[job.method] = {"finished": time.time(), "status": status,
+                                         "duration": round(time.monotonic() - start, 3)}
+                job.done.set()
+
+    def stop(self):
+        # 대기 중인 작업이 끝난 뒤 종료
+        self.queue.put(None)
+        self._worker.join()
+
+    # ── 요청 처리 ──
+
+    def status(self):
+        current = self.current
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 3),
+            "running": current.method if current else None,
+            "queued": self.queue.qsize(),
+            "completed": self.completed,
+            "last": self.last,
+        }
+
+    def submit(self, method, params, send, caller):
+        if method in self.immediate:
+            return self.immediate[method](params, send, caller)
+        if method not in self.handlers:
+            raise RpcError(METHOD_NOT_FOUND, f"알 수 없는 메서드: {method}")
+        if caller.uid is None or (method in ROOT_ONLY and caller.uid != 0):
+            logger.warning(f"[FAIL] 데몬 요청 거부 | {method} (uid={caller.uid}, pid={caller.pid})")
+            raise RpcError(PERMISSION_DENIED, f"{method} 는 root 만 실행 가능")
+        job = Job(method, params, send, caller)
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            raise RpcError(QUEUE_FULL, "작업 대기열이 가득 참")
+        if self.current is not None or self.queue.qsize() > 1:
+            send({"jsonrpc": "2.0", "method": "event",
+                  "params": {"ts": round(time.time(), 3), "type": "queued", "position": self.queue.qsize()}})
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def dispatch(self, line, send, caller):
+        """요청 1줄 처리 -> 응답 dict (id 없는 알림 요청이면 None), caller 는 접속한 프로세스의 Caller"""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return _error(None, PARSE_ERROR, "JSON 파싱 실패")
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" \
+                or not isinstance(request.get("method"), str):
+            return _error(request.get("id") if isinstance(request, dict) else None, INVALID_REQUEST,
+                          "잘못된 요청")
+        request_id = request.get("id")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return _error(request_id, INVALID_PARAMS, "params 는 객체여야 함")
+        try:
+            result = self.submit(request["method"], params, send, caller)
+        except RpcError as e:
+            response = _error(request_id, e.code, e.message)
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return response if "id" in request else None
+
+
+def _restore_backup(backup_path, dest, members=None):
+    if members:
+        restored = restore_custom_backup_members(backup_path, members, dest)
+        return {"ok": bool(restored), "restored": restored}
+    return {"ok": restore_custom_backup(backup_path, dest)}
+
+
+def peer_credentials(sock):
+    try:
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        return Caller(*struct.unpack("3i", creds))
+    except (OSError, AttributeError):
+        return Caller(None, None, None)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """연결 1개 = 줄 단위 JSON-RPC 요청 여러 개 (응답과 이벤트 알림은 같은 연결로 전송)"""
+
+    def handle(self):
+        lock = threading.Lock()
+        closed = []
+
+        def send(message):
+            if closed:
+                return
+            data = (json.dumps(message, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+            with lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    # 클라이언트가 먼저 끊어도 작업은 끝까지 실행
+                    closed.append(True)
+
+        caller = peer_credentials(self.request)
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            logger.debug(f"데몬 요청 (uid={caller.uid}): {line[:200]!r}")
+            response = self.server.optimizer.dispatch(line, send, caller)
+            if response is not None:
+                send(response)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _remove_stale_socket(path):
+    """이전 데몬이 남긴 소켓 파일 정리 (다른 데몬이 살아 있으면 예외)"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"데몬이 이미 실행 중: {path}")
+    finally:
+        probe.close()
+
+
+def create_server(settings, optimizer=None):
+    path = settings["socket_path"]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _remove_stale_socket(path)
+    server = _Server(path, _RequestHandler)
+    server.optimizer = optimizer or OptimizerDaemon(settings)
+    # root 와 socket_group 만 접속 가능
+    os.chmod(path, 0o660)
+    if settings.get("socket_group"):
+        import grp
+        os.chown(path, -1, grp.getgrnam(settings["socket_group"]).gr_gid)
+    return server
+
+
+def serve(config_path=DEFAULT_CONFIG_PATH):
+    """상주 실행: SIGTERM/SIGINT 를 받으면 대기 중인 작업을 마치고 소켓 파일 삭제 후 종료"""
+    settings = load_settings(config_path)
+    server = create_server(settings)
+    path = settings["socket_path"]
+    metrics.set_job("daemon")
+    set_process("daemon")
+    stop_metrics = metrics.start_periodic()
+
+    def shutdown(signum, frame):
+        logger.info(f"데몬 종료 신호 수신 ({signal.Signals(signum).name})")
+        # serve_forever 와 같은 스레드에서 shutdown() 을 부르면 멈추므로 별도 스레드
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    logger.info(f"[PASS] 데몬 시작 | 소켓: {path} (대기열 {settings['max_queue']})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        server.optimizer.stop()
+        stop_metrics()
+        logger.info("데몬 종료")
@@ -7,9 +7,13 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 from src.gui.sections.optimize_tab import create_optimize_tab
 from src.gui.sections.restore_tab import create_restore_tab
 from src.gui.sections.settings_tab import create_settings_tab
+from src.utils import metrics
+from src.utils.logger import set_process
 
 
 def main():
+    metrics.set_job("gui")
+    set_process("gui")
     root = tk.Tk()
     root.title("Linux Optimizer & Restore")
     root.geometry("900x600")
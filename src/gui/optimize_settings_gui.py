@@ -1,15 +1,24 @@
 import json
+import queue
+import sys
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
 from pathlib import Path
+sys.path.append('.')
+from src.utils.config import config_store
 
 CONFIG_PATH = Path("config/optimizer_settings.json")
+REFRESH_MS = 2000
 
 class SettingEditor:
     def __init__(self, master):
         self.master = master
         self.master.title("Setting Editor")
+        self.store = config_store(CONFIG_PATH)
         self.config = self.load_config()
+        self.dirty = False
+        # 구독 알림은 get() 을 부른 아무 스레드에서나 오므로 큐에 넣고 refresh(메인 스레드)에서 반영
+        self.changes = queue.Queue()
 
         self.tab_control = ttk.Notebook(master)
         self.tab_control.pack(fill=tk.BOTH, expand=True)
@@ -35,10 +44,38 @@ class SettingEditor:
         tk.Button(btn_frame, text="Update Selected", command=self.update_selected).pack(side=tk.LEFT, padx=10)
         tk.Button(btn_frame, text="Save Config", command=self.save_config).pack(side=tk.LEFT)
 
+        # 다른 곳에서 설정 파일을 바꾸면 (저장하지 않은 수정이 없을 때) 화면 갱신
+        unsubscribe = self.store.subscribe(self.changes.put)
+        # 메인 GUI 의 새 창(Toplevel)으로 열린 경우 창을 닫으면 구독 해제
+        self.master.bind("<Destroy>", lambda e: unsubscribe() if e.widget is self.master else None)
+        self.master.after(REFRESH_MS, self.refresh)
+
+    def refresh(self):
+        if not self.master.winfo_exists():
+            return
+        try:
+            self.store.get()
+        except (OSError, ValueError):
+            pass
+        latest = None
+        while not self.changes.empty():
+            latest = self.changes.get_nowait()
+        if latest is not None:
+            self.on_config_change(latest)
+        self.master.after(REFRESH_MS, self.refresh)
+
+    def on_config_change(self, config):
+        if self.dirty or config == self.config:
+            return
+        self.config = self.store.snapshot()
+        for section, tree in self.treeviews.items():
+            tree.delete(*tree.get_children())
+            self.build_tree(tree, self.config.get(section, {}))
+
     def load_config(self):
         try:
-            with open(CONFIG_PATH) as f:
-                return json.load(f)
+            # 공용 캐시의 사본을 수정 (저장 전까지 다른 사용자에게 영향 없음)
+            return self.store.snapshot()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load config: {e}")
             self.master.destroy()
@@ -92,12 +129,13 @@ class SettingEditor:
         ref[key_path[-1]] = parsed_value
 
         tree.item(selected, values=(parsed_value,))
+        self.dirty = True
         messagebox.showinfo("Pending Save", "Value updated. Click 'Save Config' to apply changes.")
 
     def save_config(self):
         try:
-            with open(CONFIG_PATH, "w") as f:
-                json.dump(self.config, f, indent=4)
+            self.store.save(self.config)
+            self.dirty = False
             messagebox.showinfo("Success", "Configuration successfully saved.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save config: {e}")
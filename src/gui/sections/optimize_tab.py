@@ -1,73 +1,155 @@
 import tkinter as tk
-from tkinter import Label
+from tkinter import Label, ttk
+import queue
 import subprocess
 import threading
+from collections import deque
 from src.utils.logger import get_logger  # ✅ logger 가져오기
+from src.utils.events import parse_event
+from src.utils.daemon_client import DaemonClient, DaemonUnavailable
 
 logger = get_logger(__name__)  # ✅ 로거 인스턴스화
 
 # 최적화 항목 리스트
 OPTIMIZATION_CATEGORIES = ["CPU", "I/O", "Memory", "Services", "Security", "Disk"]
+# 이벤트 큐를 비우는 주기 (Tk 위젯은 메인 스레드에서만 갱신)
+DRAIN_MS = 100
+# 최적화 프로세스가 비정상 종료했을 때 보여줄 stderr 마지막 줄 수
+STDERR_TAIL_LINES = 20
+OPTIMIZER_COMMAND = ["sudo", "PYTHONPATH=.", "python3", "src/optimizer.py", "--events"]
+
+STATUS_TEXT = {
+    "PASS": ("✅ 성공", "green"),
+    "SKIP": ("⚠️ 생략됨", "orange"),
+    "FAIL": ("❌ 실패", "red"),
+}
 
 # 각 항목별 상태 표시 라벨 저장
 status_labels = {}
+progress_bars = {}
+step_labels = {}
+
+def run_optimizer_process(put, command=OPTIMIZER_COMMAND):
+    """
+    최적화 프로세스를 실행하고 stdout 이벤트를 put 으로 전달
+    run_end 없이 0 이 아닌 코드로 끝나면 (sudo 인증 실패, import 오류 등) stderr 끝부분을 error 이벤트로 전달
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    # stderr 를 따로 읽지 않으면 파이프 버퍼가 차서 자식 프로세스가 멈출 수 있음
+    stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+    reader = threading.Thread(target=lambda: stderr_tail.extend(process.stderr), daemon=True)
+    reader.start()
+    finished = False
+    for line in process.stdout:
+        event = parse_event(line)
+        if event is not None:
+            finished = finished or event["type"] == "run_end"
+            put(event)
+    returncode = process.wait()
+    reader.join()
+    if returncode != 0 and not finished:
+        stderr = "".join(stderr_tail).strip()
+        logger.error(f"[FAIL] 최적화 프로세스 종료 코드 {returncode} | {stderr or 'stderr 없음'}")
+        put({"type": "error", "returncode": returncode, "message": stderr})
+    put({"type": "exit", "returncode": returncode})
+
 
 def create_optimize_tab(notebook):
     frame = tk.Frame(notebook, padx=10, pady=10)
+    events = queue.Queue()
 
-    # 라벨 UI 생성
+    # 라벨 UI 생성 (항목별 상태 + 진행률 + 현재 단계)
     for idx, category in enumerate(OPTIMIZATION_CATEGORIES):
-        label = Label(frame, text=f"{category}: ⏳ 대기 중...", anchor="w", width=40, font=("Arial", 11))
+        label = Label(frame, text=f"{category}: ⏳ 대기 중...", anchor="w", width=32, font=("Arial", 11))
         label.grid(row=idx, column=0, sticky="w", padx=10, pady=5)
         status_labels[category] = label
 
+        bar = ttk.Progressbar(frame, length=160, mode="determinate", maximum=1)
+        bar.grid(row=idx, column=1, padx=5)
+        progress_bars[category] = bar
+
+        step = Label(frame, text="", anchor="w", width=30, fg="gray")
+        step.grid(row=idx, column=2, sticky="w")
+        step_labels[category] = step
+
     # 최종 결과 라벨
     result_label = Label(frame, text="", font=("Arial", 11, "bold"))
-    result_label.grid(row=len(OPTIMIZATION_CATEGORIES), column=0, pady=10)
+    result_label.grid(row=len(OPTIMIZATION_CATEGORIES), column=0, columnspan=3, pady=10)
+
+    def handle_event(event):
+        category = event.get("section")
+        kind = event["type"]
+        if kind == "section_start" and category in status_labels:
+            status_labels[category].config(text=f"{category}: 🔄 실행 중...", fg="black")
+            progress_bars[category].config(mode="indeterminate")
+            progress_bars[category].start(15)
+        elif kind == "progress" and category in progress_bars:
+            bar = progress_bars[category]
+            bar.stop()
+            bar.config(mode="determinate", maximum=max(event["total"], 1), value=event["done"])
+            step_labels[category].config(text=f"{event['step']} ({event['done']}/{event['total']})")
+        elif kind == "log" and category in step_labels and event["level"] in ("ERROR", "CRITICAL"):
+            step_labels[category].config(text=event["message"][:60], fg="red")
+        elif kind == "section_end" and category in status_labels:
+            text, color = STATUS_TEXT.get(event["status"], (event["status"], "black"))
+            status_labels[category].config(text=f"{category}: {text} ({event['duration']:.1f}s)", fg=color)
+            bar = progress_bars[category]
+            bar.stop()
+            bar.config(mode="determinate", maximum=1, value=1)
+            if event.get("reason"):
+                step_labels[category].config(text=event["reason"][:60])
+        elif kind == "run_end":
+            failed = [name for name, status in event["results"].items() if status == "FAIL"]
+            if failed:
+                result_label.config(text=f"❌ 일부 최적화 실패: {', '.join(failed)}", fg="red")
+                logger.warning("❌ 일부 최적화 실패")
+            else:
+                result_label.config(text=f"✅ 모든 최적화가 성공적으로 완료되었습니다. ({event['duration']:.1f}s)",
+                                    fg="green")
+                logger.info("✅ 모든 최적화 완료")
+        elif kind == "error":
+            last_line = event["message"].splitlines()[-1] if event["message"] else f"종료 코드 {event['returncode']}"
+            result_label.config(text=f"❌ 최적화 실행 실패: {last_line[:80]}", fg="red")
+        elif kind == "exit" and event["returncode"] != 0 and not result_label.cget("text"):
+            result_label.config(text="❌ 최적화 도중 오류 발생", fg="red")
+
+    def drain():
+        try:
+            while True:
+                handle_event(events.get_nowait())
+        except queue.Empty:
+            pass
+        frame.after(DRAIN_MS, drain)
+
+    frame.after(DRAIN_MS, drain)
 
     # 최적화 실행 함수
     def run_optimization():
         logger.info("▶ 최적화 실행 버튼 클릭됨")  # ✅ 로그 기록 시작
+        result_label.config(text="")
+        for category in OPTIMIZATION_CATEGORIES:
+            status_labels[category].config(text=f"{category}: ⏳ 대기 중...", fg="black")
+            progress_bars[category].config(value=0)
+            step_labels[category].config(text="", fg="gray")
 
+        # 작업 스레드는 이벤트를 큐에 넣기만 함
         def monitor():
+            # 상주 데몬이 있으면 소켓으로 요청 (인터프리터/psutil 재시작 없이 바로 실행)
             try:
-                process = subprocess.Popen(
-                    ["sudo", "PYTHONPATH=.", "python3", "src/optimizer.py"],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True
-                )
-
-                success = True
-                while True:
-                    line = process.stdout.readline()
-                    if not line:
-                        break
-
-                    clean_line = line.strip()
-                    logger.debug(f"[실시간 로그] {clean_line}")  # ✅ 로그 저장
-
-                    for category in OPTIMIZATION_CATEGORIES:
-                        if f"[PASS] {category}" in clean_line:
-                            status_labels[category].config(text=f"{category}: ✅ 성공", fg="green")
-                        elif f"[SKIP] {category}" in clean_line:
-                            status_labels[category].config(text=f"{category}: ⚠️ 생략됨", fg="orange")
-                        elif f"[FAIL] {category}" in clean_line:
-                            status_labels[category].config(text=f"{category}: ❌ 실패", fg="red")
-                            success = False
-
-                process.wait()
-
-                if success and process.returncode == 0:
-                    result_label.config(text="✅ 모든 최적화가 성공적으로 완료되었습니다.", fg="green")
-                    logger.info("✅ 모든 최적화 완료")
-                else:
-                    result_label.config(text="❌ 일부 최적화 실패", fg="red")
-                    logger.warning("❌ 일부 최적화 실패")
-
+                DaemonClient().call("optimize", {"events": True}, on_event=events.put)
+                events.put({"type": "exit", "returncode": 0})
+                return
+            except DaemonUnavailable:
+                logger.info("데몬 없음, sudo 로 최적화 프로세스 실행")
+            except Exception as e:
+                logger.exception(f"데몬 최적화 요청 실패: {e}")
+                events.put({"type": "exit", "returncode": -1})
+                return
+            try:
+                run_optimizer_process(events.put)
             except Exception as e:
                 logger.exception(f"최적화 실행 중 오류 발생: {e}")
-                result_label.config(text="❌ 최적화 도중 오류 발생", fg="red")
+                events.put({"type": "exit", "returncode": -1})
 
         threading.Thread(target=monitor, daemon=True).start()
 
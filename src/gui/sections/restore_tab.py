@@ -1,12 +1,14 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, simpledialog
 from pathlib import Path
 from src.utils.logger import get_logger
+from src.utils.daemon_client import DaemonClient, DaemonUnavailable
 from src.restore import (
-    custom_backup,
-    custom_directory_backup,
-    list_custom_backups,
+    backup_file,
+    backup_directory,
+    query_backups,
     restore_custom_backup,
+    restore_custom_backup_members,
     delete_custom_backup,
     create_timeshift_snapshot,
     list_timeshift_snapshots,
@@ -16,6 +18,22 @@ from src.restore import (
 
 logger = get_logger(__name__)
 CUSTOM_BACKUP_DIR = Path("custom_backups")
+PAGE_SIZE = 200
+
+
+def run_job(method, params, local):
+    """상주 데몬(root)이 있으면 데몬에서, 없으면 현재 프로세스에서 local() 실행"""
+    try:
+        return DaemonClient().call(method, params)
+    except DaemonUnavailable:
+        return local()
+
+
+def run_backup(path):
+    path = str(Path(path).absolute())
+    return run_job("backup", {"path": path},
+                   lambda: {"message": backup_directory(path) if Path(path).is_dir() else backup_file(path)})["message"]
+
 
 def create_restore_tab(notebook):
     frame = tk.Frame(notebook)
@@ -41,22 +59,51 @@ def create_restore_tab(notebook):
     result_label = tk.Label(frame, text="", fg="blue")
     result_label.grid(row=5, column=0, columnspan=3, pady=10)
 
+    # 목록 필터/페이지 상태 (카탈로그에서 현재 페이지만 조회)
+    list_state = {"page": 0, "name_filter": None, "contains": None}
+    search_var = tk.StringVar()
+    search_frame = tk.Frame(frame)
+    page_label = tk.Label(search_frame, text="")
+
     # 백업 리스트 새로고침
     def refresh_list():
+        rows, total = query_backups(offset=list_state["page"] * PAGE_SIZE, limit=PAGE_SIZE,
+                                    name_filter=list_state["name_filter"], contains=list_state["contains"])
+        pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+        if list_state["page"] >= pages:
+            list_state["page"] = pages - 1
+            return refresh_list()
         backup_listbox.delete(0, tk.END)
-        backups = list_custom_backups()
-        for file in backups:
-            backup_listbox.insert(tk.END, file.name)
-        logger.info(f"백업 목록 갱신됨 ({len(backups)}개)")
+        for row in rows:
+            backup_listbox.insert(tk.END, row["name"])
+        page_label.config(text=f"{list_state['page'] + 1}/{pages} 페이지 (총 {total}개)")
+        logger.info(f"백업 목록 갱신됨 ({len(rows)}/{total}개)")
+
+    def handle_search(contains=False):
+        text = search_var.get().strip() or None
+        list_state.update(page=0, name_filter=None if contains else text, contains=text if contains else None)
+        refresh_list()
+
+    def change_page(step):
+        if list_state["page"] + step >= 0:
+            list_state["page"] += step
+            refresh_list()
 
     def handle_custom_backup():
-        result = custom_backup()
+        file_path = filedialog.askopenfilename(title="백업할 파일 선택")
+        result = run_backup(file_path) if file_path else "❌ 파일 선택이 취소됨."
         result_label.config(text=result)
         logger.info(result)
         refresh_list()
 
     def handle_custom_directory_backup():
-        result = custom_directory_backup()
+        dir_path = simpledialog.askstring("디렉토리 경로 입력", "백업할 디렉토리 절대경로 입력 (예: /home/user/folder):")
+        if not dir_path:
+            result = "❌ 입력 취소됨."
+        elif not Path(dir_path).is_dir():
+            result = f"❌ 유효하지 않은 디렉토리 경로: {dir_path}"
+        else:
+            result = run_backup(dir_path)
         result_label.config(text=result)
         logger.info(result)
         refresh_list()
@@ -76,12 +123,43 @@ def create_restore_tab(notebook):
             messagebox.showwarning("경고", "복원할 경로를 올바르게 지정하세요.")
             logger.warning("복원 경로가 유효하지 않음")
             return
+        # 데몬은 다른 작업 디렉토리에서 실행되므로 절대 경로로 전달
+        dest = str(Path(dest).absolute())
 
-        success = restore_custom_backup(file_path, dest)
+        success = run_job("restore", {"backup": file_name, "dest": dest},
+                          lambda: {"ok": restore_custom_backup(file_path, dest)})["ok"]
         msg = "✅ 복원 성공" if success else "❌복원 실패"
         result_label.config(text=msg)
         logger.info(f"{msg}: {file_name} -> {dest}")
 
+    def handle_partial_restore():
+        selection = backup_listbox.curselection()
+        if not selection:
+            messagebox.showwarning("경고", "복원할 백업을 선택하세요.")
+            logger.warning("부분 복원할 백업이 선택되지 않음")
+            return
+
+        file_name = backup_listbox.get(selection[0])
+        dest = restore_dir_var.get()
+        if not dest or not Path(dest).exists():
+            messagebox.showwarning("경고", "복원할 경로를 올바르게 지정하세요.")
+            logger.warning("복원 경로가 유효하지 않음")
+            return
+        # 데몬은 다른 작업 디렉토리에서 실행되므로 절대 경로로 전달
+        dest = str(Path(dest).absolute())
+
+        patterns = simpledialog.askstring("선택 복원", "복원할 경로 또는 패턴 (쉼표 구분, 예: etc/ssh/sshd_config, *.conf):")
+        if not patterns:
+            return
+
+        members = patterns.split(",")
+        restored = run_job("restore", {"backup": file_name, "dest": dest, "members": members},
+                           lambda: {"restored": restore_custom_backup_members(CUSTOM_BACKUP_DIR / file_name,
+                                                                              members, dest)})["restored"]
+        msg = f"✅ {len(restored)}개 항목 복원" if restored else "❌ 일치하는 항목 없음 또는 복원 실패"
+        result_label.config(text=msg)
+        logger.info(f"{msg}: {file_name} ({patterns}) -> {dest}")
+
     def handle_delete():
         selection = backup_listbox.curselection()
         if not selection:
@@ -127,6 +205,16 @@ def create_restore_tab(notebook):
     tk.Button(frame, text="디렉토리 백업", command=handle_custom_directory_backup).grid(row=2, column=1, pady=5, sticky="w")
     tk.Button(frame, text="복원", command=handle_restore).grid(row=3, column=0, pady=5, sticky="w", padx=10)
     tk.Button(frame, text="삭제", command=handle_delete).grid(row=3, column=1, pady=5, sticky="w")
+    tk.Button(frame, text="선택 복원", command=handle_partial_restore).grid(row=3, column=2, pady=5, sticky="w")
+
+    # ── 검색/페이지 영역 ──
+    search_frame.grid(row=4, column=0, columnspan=3, sticky="w", padx=10, pady=5)
+    tk.Entry(search_frame, textvariable=search_var, width=30).pack(side="left")
+    tk.Button(search_frame, text="이름 검색", command=handle_search).pack(side="left", padx=2)
+    tk.Button(search_frame, text="포함 파일 검색", command=lambda: handle_search(contains=True)).pack(side="left", padx=2)
+    tk.Button(search_frame, text="◀", command=lambda: change_page(-1)).pack(side="left", padx=(10, 2))
+    tk.Button(search_frame, text="▶", command=lambda: change_page(1)).pack(side="left", padx=2)
+    page_label.pack(side="left", padx=5)
 
     # ── 스냅샷 영역 ──
     tk.Label(frame, text="Timeshift 스냅샷 기능", font=("Arial", 10, "bold")).grid(row=6, column=0, columnspan=2, sticky="w", padx=10, pady=(15, 5))
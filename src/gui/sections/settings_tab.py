@@ -1,28 +1,23 @@
+import queue
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import json
 from pathlib import Path
-import subprocess
+from src.utils.config import config_store
+from src.utils.daemon_client import DaemonClient, DaemonUnavailable
 
 CONFIG_PATH = Path("config/optimizer_settings.json")
+# 다른 프로세스(설정 편집기 등)가 파일을 바꿨는지 확인하는 주기
+REFRESH_MS = 2000
 
 def load_restore_config():
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, "r") as f:
-            config = json.load(f)
-        return config.get("restore_settings", {})
-    return {}
+    try:
+        return config_store(CONFIG_PATH).section("restore_settings")
+    except FileNotFoundError:
+        return {}
 
 def save_restore_config(restore_settings):
     try:
-        if CONFIG_PATH.exists():
-            with open(CONFIG_PATH, "r") as f:
-                config = json.load(f)
-        else:
-            config = {}
-        config["restore_settings"] = restore_settings
-        with open(CONFIG_PATH, "w") as f:
-            json.dump(config, f, indent=4)
+        config_store(CONFIG_PATH).update_section("restore_settings", restore_settings)
         return True
     except Exception as e:
         messagebox.showerror("저장 실패", f"설정 저장 중 오류 발생: {e}")
@@ -54,18 +49,42 @@ def create_settings_tab(notebook):
     backup_interval_var = tk.StringVar(value=str(restore_settings.get("backup_interval_hours", 24)))
     tk.Entry(frame, textvariable=backup_interval_var, width=10).pack(anchor="w")
 
+    # 설정 파일이 바뀌면 화면 값 갱신 (Tk 는 메인 스레드에서만 다뤄야 하므로 after 로 확인)
+    # 알림은 get() 을 부른 스레드(작업 스레드의 DaemonClient 등)에서 오므로 큐에 넣기만 하고 refresh 에서 반영
+    changes = queue.Queue()
+
+    def apply_config_change(config):
+        settings = config.get("restore_settings", {})
+        auto_backup_var.set(settings.get("auto_backup", True))
+        backup_path_var.set(settings.get("backup_location", str(Path.home() / "backups")))
+        backup_interval_var.set(str(settings.get("backup_interval_hours", 24)))
+
+    unsubscribe = config_store(CONFIG_PATH).subscribe(changes.put)
+
+    def refresh():
+        try:
+            config_store(CONFIG_PATH).get()
+        except (OSError, ValueError):
+            pass
+        latest = None
+        while not changes.empty():
+            latest = changes.get_nowait()
+        if latest is not None:
+            apply_config_change(latest)
+        frame.after(REFRESH_MS, refresh)
+
+    frame.after(REFRESH_MS, refresh)
+    frame.bind("<Destroy>", lambda e: unsubscribe() if e.widget is frame else None)
+
     # 설정 저장 함수
     def save_settings():
-        new_settings = {
+        # 화면에 없는 항목(압축/증분/보존 정책 등)은 기존 값을 그대로 유지
+        new_settings = dict(load_restore_config())
+        new_settings.update({
             "auto_backup": auto_backup_var.get(),
             "backup_location": backup_path_var.get(),
             "backup_interval_hours": int(backup_interval_var.get()),
-            "backup_format": restore_settings.get("backup_format", "zip"),
-            "restore_cycle_days": restore_settings.get("restore_cycle_days", 7),
-            "restore_points": restore_settings.get("restore_points", 5),
-            "restore_targets": restore_settings.get("restore_targets", {}),
-            "custom_backup": restore_settings.get("custom_backup", {})
-        }
+        })
 
         if save_restore_config(new_settings):
             messagebox.showinfo("성공", "설정이 저장되었습니다.")
@@ -75,20 +94,26 @@ def create_settings_tab(notebook):
 
     # 기본 설정 설치 버튼
     def install_defaults():
+        # 데몬(root)이 있으면 데몬에서, 없으면 별도 프로세스 없이 현재 프로세스에서 생성
         try:
-            subprocess.run(["python3", "config/config_builder.py"], check=True)
+            try:
+                DaemonClient().call("install_defaults")
+            except DaemonUnavailable:
+                from config import config_builder
+                config_builder.main()
             messagebox.showinfo("성공", "기본 설정이 생성되었습니다.")
-        except subprocess.CalledProcessError as e:
+        except Exception as e:
             messagebox.showerror("실패", f"기본 설정 생성 실패:\n{e}")
 
     tk.Button(frame, text="기본 설정 재설치", command=install_defaults).pack(anchor="w", pady=5)
     
-    # 설정 변경 버튼 → optimize_settings_gui.py 실행
+    # 설정 변경 버튼 → 설정 편집기를 새 창(Toplevel)으로 열기 (새 파이썬 프로세스 없이)
     def launch_optimize_settings():
         try:
-            subprocess.Popen(["python3", "src/gui/optimize_settings_gui.py"])
+            from src.gui.optimize_settings_gui import SettingEditor
+            SettingEditor(tk.Toplevel(frame))
         except Exception as e:
-           messagebox.showerror("오류", f"설정 GUI 실행 실패: {e}")
+            messagebox.showerror("오류", f"설정 GUI 실행 실패: {e}")
 
     tk.Button(frame, text="설정 변경", command=launch_optimize_settings).pack(anchor="w", pady=5)
 
@@ -1,31 +1,257 @@
 import argparse
+import json
+import os
+from datetime import datetime
 from src.optimizer import optimize_system
-from src.restore import restore_system
-from src.utils.logger import get_logger
+from src.restore import (CUSTOM_BACKUP_DIR, backup_directory, backup_file, query_backups, restore_custom_backup,
+                         restore_custom_backup_members)
+from src.scheduler import create_scheduler, run_scheduler
+from src.memory_monitor import run_memory_monitor
+from src.planner import DOMAINS, apply_plan, build_plan, format_plan, load_config
+from src import bench, perf_suite
+from src.daemon import serve
+from src.utils.synthetic_root import SCALES
+from src.utils.config import ConfigLoader
+from src.utils.daemon_client import DaemonClient, DaemonUnavailable, RpcError
+from src.utils.logger import get_logger, set_process
+from src.utils import metrics, trace
 
 logger = get_logger()
 
+def print_backups(args):
+    rows, total = query_backups(offset=(args.page - 1) * args.page_size, limit=args.page_size,
+                                name_filter=args.filter, contains=args.contains)
+    for row in rows:
+        created = datetime.fromtimestamp(row["created"]).strftime("%Y-%m-%d %H:%M:%S")
+        kind = f"{row['format']}/{row['kind']}" if row["kind"] else row["format"]
+        print(f"{created}  {kind:<24} {row['size']:>14}  {row['file_count']:>7}  {row['name']}  ({row['source'] or '-'})")
+    pages = max(1, (total + args.page_size - 1) // args.page_size)
+    print(f"-- {args.page}/{pages} 페이지, 총 {total}개")
+
+def print_scheduler_plan():
+    config_loader = ConfigLoader("config/optimizer_settings.json")
+    config_loader.load_config()
+    scheduler = create_scheduler(config_loader.get_config())
+    plan = scheduler.plan()
+    for job in scheduler.jobs:
+        last = scheduler.state.get(job.name, {})
+        print(f"{job.name:<24} {job.job_class:<12} {str(job.trigger):<36} "
+              f"다음: {plan[job.name]:%Y-%m-%d %H:%M:%S}  마지막: {last.get('last_run', '-')} {last.get('status', '')}")
+
+def run_plan(args, apply=False):
+    changes = build_plan(load_config(), args.domain or DOMAINS)
+    for line in format_plan(changes):
+        print(line)
+    if apply and changes:
+        result = apply_plan(changes)
+        print(f"-- 적용 {result['applied']}건, 실패 {result['failed']}건"
+              + (f", 후속 작업: {', '.join(result['post_actions'])}" if result["post_actions"] else ""))
+        if result["failed"]:
+            raise SystemExit(1)
+
+def run_perf(args):
+    report = perf_suite.run_suite(args.scale, repeat=args.repeat, root=args.root)
+    rows = perf_suite.compare(report, perf_suite.load_baseline(args.baseline), args.tolerance)
+    for line in perf_suite.format_comparison(rows):
+        print(line)
+    if args.update_baseline:
+        perf_suite.save_baseline(report, args.baseline)
+        print(f"-- 기준선 갱신: {args.baseline} ({args.scale})")
+    elif any(row["status"] in ("regression", "error") for row in rows):
+        raise SystemExit(1)
+
+def run_bench(args):
+    config = load_config()
+    domains = args.domain or ["kernel"]
+    apply = None
+    if not args.no_apply:
+        changes = build_plan(config, domains)
+        for line in format_plan(changes):
+            print(line)
+        apply = lambda: apply_plan(changes)
+    result = bench.run_bench(config, apply, samples=args.samples, work_dir=args.work_dir,
+                             label=",".join(domains) if apply else "no-apply")
+    for line in bench.format_deltas(result["deltas"]):
+        print(line)
+    print(f"-- 결과 저장: {result['path']}")
+
+def call_daemon(args, method, params, on_event=None):
+    """데몬이 떠 있으면 요청을 보내고 결과 반환, --local 이거나 데몬이 없으면 None (현재 프로세스에서 실행)"""
+    if args.local or getattr(args, "profile", None):
+        return None
+    try:
+        return DaemonClient().call(method, params, on_event=on_event)
+    except DaemonUnavailable as e:
+        logger.info(f"데몬 없음, 현재 프로세스에서 실행 ({e})")
+        return None
+    except RpcError as e:
+        logger.error(f"데몬 요청 실패: {e.message}")
+        raise SystemExit(1)
+
+def print_event(event):
+    print(json.dumps(event, ensure_ascii=False, default=str), flush=True)
+
+def run_optimize(args):
+    logger.info("Starting optimization...")
+    results = call_daemon(args, "optimize", {"events": args.events}, on_event=print_event if args.events else None)
+    if results is None:
+        with trace.profile(args.profile):
+            results = optimize_system(emit_events=args.events)
+    if "FAIL" in results.values():
+        logger.warning(f"Optimization finished with failures: {results}")
+    else:
+        logger.info("Optimization finished successfully.")
+
+def run_restore(args):
+    logger.info("Starting restore...")
+    # 데몬은 다른 작업 디렉토리에서 실행되므로 상대 경로는 여기서 절대 경로로 바꿔 전달
+    args.dest = os.path.abspath(args.dest)
+    response = call_daemon(args, "restore", {"backup": args.backup, "dest": args.dest, "members": args.member})
+    if response is not None:
+        ok = response["ok"]
+    else:
+        backup_path = CUSTOM_BACKUP_DIR / args.backup
+        with trace.profile(args.profile):
+            if args.member:
+                ok = bool(restore_custom_backup_members(backup_path, args.member, args.dest))
+            else:
+                ok = restore_custom_backup(backup_path, args.dest)
+    if ok:
+        logger.info("Restore finished successfully.")
+    else:
+        logger.error("Restore failed.")
+        raise SystemExit(1)
+
+def run_backup(args):
+    path = os.path.abspath(args.path)
+    response = call_daemon(args, "backup", {"path": path})
+    message = response["message"] if response is not None else \
+        (backup_directory(path) if os.path.isdir(path) else backup_file(path))
+    print(message)
+    if not message.startswith("✅"):
+        raise SystemExit(1)
+
+def print_daemon_status():
+    try:
+        status = DaemonClient().call("status")
+    except DaemonUnavailable as e:
+        print(f"❌ 데몬이 실행 중이 아님 ({e})")
+        raise SystemExit(1)
+    print(f"pid {status['pid']}, 가동 {status['uptime']:.0f}s, 실행 중: {status['running'] or '-'}, "
+          f"대기 {status['queued']}개, 완료 {status['completed']}개")
+    for method, last in sorted(status["last"].items()):
+        finished = datetime.fromtimestamp(last["finished"]).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"  {method:<18} {finished}  {last['status']:<6} {last['duration']:.2f}s")
+
 def main():
     parser = argparse.ArgumentParser(description="System Optimization and Restore Tool")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # 최적화 서브 커맨드
-    subparsers.add_parser("optimize", help="Run system optimization")
+    optimize_parser = subparsers.add_parser("optimize", help="Run system optimization")
+    optimize_parser.add_argument("--events", action="store_true", help="Write JSON-lines progress events to stdout")
+    optimize_parser.add_argument("--profile", metavar="TRACE_JSON",
+                                 help="Write a Chrome trace of sections/commands and print a timing summary")
+    optimize_parser.add_argument("--local", action="store_true", help="Run in this process even if the daemon is up")
 
     # 복원 서브 커맨드
-    subparsers.add_parser("restore", help="Run system restore")
+    restore_parser = subparsers.add_parser("restore", help="Restore a custom backup")
+    restore_parser.add_argument("backup", help="Backup name in custom_backups")
+    restore_parser.add_argument("dest", help="Restore destination directory")
+    restore_parser.add_argument("--member", action="append", help="Restore only matching paths/patterns (tar.gz)")
+    restore_parser.add_argument("--profile", metavar="TRACE_JSON",
+                                help="Write a Chrome trace of extract phases and print a timing summary")
+    restore_parser.add_argument("--local", action="store_true", help="Run in this process even if the daemon is up")
+
+    # 파일/디렉토리 백업 서브 커맨드
+    backup_parser = subparsers.add_parser("backup", help="Back up a file or directory into custom_backups")
+    backup_parser.add_argument("path")
+    backup_parser.add_argument("--local", action="store_true", help="Run in this process even if the daemon is up")
+
+    # 백업 카탈로그 조회 서브 커맨드
+    backups_parser = subparsers.add_parser("backups", help="List backups from the catalog")
+    backups_parser.add_argument("--filter", help="Substring of backup name or source path")
+    backups_parser.add_argument("--contains", help="Only backups containing this absolute path")
+    backups_parser.add_argument("--page", type=int, default=1)
+    backups_parser.add_argument("--page-size", type=int, default=50)
+
+    # 예약 작업 스케줄러 서브 커맨드
+    scheduler_parser = subparsers.add_parser("scheduler", help="Run the resident job scheduler")
+    scheduler_parser.add_argument("--list", action="store_true", help="Show jobs and next run times, then exit")
+
+    # 현재 상태와 설정의 차이(변경 계획) 조회/적용 서브 커맨드
+    for name, help_text in (("plan", "Show changes needed to match the config"),
+                            ("apply", "Apply only the changes shown by plan")):
+        plan_parser = subparsers.add_parser(name, help=help_text)
+        plan_parser.add_argument("--domain", action="append", choices=DOMAINS,
+                                 help="Limit to kernel/services/firewall/sshd (repeatable)")
+
+    # 합성 /proc, /sys, /etc 루트에서 섹션/정리/백업 성능 측정 서브 커맨드
+    perf_parser = subparsers.add_parser("perf", help="Benchmark every section against a synthetic root")
+    perf_parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    perf_parser.add_argument("--repeat", type=int, default=3)
+    perf_parser.add_argument("--root", help="Directory for the synthetic root (default: temporary)")
+    perf_parser.add_argument("--baseline", default=perf_suite.BASELINE_PATH)
+    perf_parser.add_argument("--tolerance", type=float, default=perf_suite.DEFAULT_TOLERANCE,
+                             help="Allowed slowdown ratio before flagging a regression")
+    perf_parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+
+    # 프로필 적용 전/후 작업 부하 측정 서브 커맨드
+    bench_parser = subparsers.add_parser("bench", help="Measure micro-workloads before and after applying a profile")
+    bench_parser.add_argument("--domain", action="append", choices=DOMAINS,
+                              help="Domains to apply between runs (default: kernel, repeatable)")
+    bench_parser.add_argument("--samples", type=int, default=5)
+    bench_parser.add_argument("--work-dir", default=bench.DEFAULT_WORK_DIR, help="Directory for file I/O workloads")
+    bench_parser.add_argument("--no-apply", action="store_true", help="Measure twice without applying (noise check)")
+
+    # 메모리 압력(PSI) 모니터 서브 커맨드
+    subparsers.add_parser("memory-monitor", help="Run the PSI-driven memory pressure monitor")
+
+    # 상주 root 데몬 (Unix 소켓 JSON-RPC) 과 상태 조회 서브 커맨드
+    subparsers.add_parser("daemon", help="Run the privileged daemon serving optimize/backup/restore over a Unix socket")
+    subparsers.add_parser("status", help="Show daemon queue and last job results")
 
     args = parser.parse_args()
+    if args.command:
+        # 명령별로 별도 .prom 파일 (process 라벨) 과 로그 파일에 기록
+        metrics.set_job(args.command.replace("-", "_"))
+        set_process(args.command.replace("-", "_"))
 
     if args.command == "optimize":
-        logger.info("Starting optimization...")
-        optimize_system()  # 인자 없이 호출
-        logger.info("Optimization finished successfully.")
+        run_optimize(args)
 
     elif args.command == "restore":
-        logger.info("Starting restore...")
-        restore_system()  # 이 함수도 같은 방식이라면 인자 제거
-        logger.info("Restore finished successfully.")
+        run_restore(args)
+
+    elif args.command == "backup":
+        run_backup(args)
+
+    elif args.command == "backups":
+        print_backups(args)
+
+    elif args.command == "scheduler":
+        if args.list:
+            print_scheduler_plan()
+        else:
+            run_scheduler()
+
+    elif args.command in ("plan", "apply"):
+        run_plan(args, apply=args.command == "apply")
+
+    elif args.command == "perf":
+        run_perf(args)
+
+    elif args.command == "bench":
+        run_bench(args)
+
+    elif args.command == "memory-monitor":
+        run_memory_monitor()
+
+    elif args.command == "daemon":
+        serve()
+
+    elif args.command == "status":
+        print_daemon_status()
 
     else:
         parser.print_help()
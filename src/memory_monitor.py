@@ -0,0 +1,213 @@
+import select
+import signal
+import threading
+import time
+import psutil
+from src.utils.logger import get_logger, set_process
+from src.utils.config import ConfigLoader
+from src.utils.psi import PsiTrigger, psi_available, read_pressure
+from src.utils.tunables import write_tunables, log_tunable_results
+from src.utils import metrics
+
+logger = get_logger(__name__)
+
+# 단계별 개입 (뒤로 갈수록 영향 범위가 넓음)
+STEPS = [
+    ("compact", {"vm.compact_memory": 1}),
+    ("drop_pagecache", {"vm.drop_caches": 1}),
+    ("drop_all_caches", {"vm.drop_caches": 3}),
+]
+
+DEFAULTS = {
+    "interval_seconds": 5,
+    "use_triggers": True,
+    "trigger_stall_ms": 150,
+    "trigger_window_ms": 2000,
+    "high_some_avg10": 10.0,       # 이 이상이면 메모리 정체로 판단
+    "high_full_avg10": 5.0,
+    "low_some_avg10": 2.0,         # 이 이하로 내려가야 단계 초기화 (히스테리시스)
+    "cooldown_seconds": 60,        # 개입 후 다음 개입까지 최소 간격
+    "settle_seconds": 10,          # 개입 후 효과 측정까지 대기
+    "io_full_avg10_limit": 20.0,   # I/O 정체가 이 이상이면 캐시 삭제 대신 compaction 만 수행
+    "max_step": len(STEPS),
+}
+
+
+PRESSURE = metrics.gauge("pressure_avg10", "PSI avg10 at the last evaluation", ("resource", "kind"))
+INTERVENTIONS = metrics.counter("memory_interventions_total", "Memory reclaim steps taken by the PSI monitor",
+                                ("step",))
+
+
+def _avg10(snapshot, resource, kind):
+    return (snapshot.get(resource) or {}).get(kind, {}).get("avg10", 0.0)
+
+
+def format_pressure(snapshot):
+    return (f"memory some {_avg10(snapshot, 'memory', 'some'):.2f} / full {_avg10(snapshot, 'memory', 'full'):.2f}, "
+            f"io some {_avg10(snapshot, 'io', 'some'):.2f} / full {_avg10(snapshot, 'io', 'full'):.2f}")
+
+
+class MemoryPressureMonitor:
+    """
+    PSI(/proc/pressure) 기반 메모리 회수
+    - 실제 정체(stall)가 임계치를 넘을 때만 개입하고, 개입마다 한 단계씩 강화
+    - 정체가 low_some_avg10 이하로 내려가면 단계 초기화, 개입 사이에는 cooldown 유지
+    - 개입 전후 압력을 함께 기록
+    """
+
+    def __init__(self, config=None, read=read_pressure, apply=write_tunables, clock=time.monotonic, sleep=time.sleep):
+        self.cfg = dict(DEFAULTS, **(config or {}))
+        self.level = 0
+        self.last_action = None
+        self._read = read
+        self._apply = apply
+        self._clock = clock
+        self._sleep = sleep
+
+    def snapshot(self):
+        snapshot = {}
+        for resource in ("memory", "io"):
+            try:
+                snapshot[resource] = self._read(resource)
+            except OSError:
+                snapshot[resource] = None
+        return snapshot
+
+    def _stalled(self, snapshot):
+        return (_avg10(snapshot, "memory", "some") >= self.cfg["high_some_avg10"]
+                or _avg10(snapshot, "memory", "full") >= self.cfg["high_full_avg10"])
+
+    def evaluate(self):
+        """현재 압력을 확인하고 필요하면 다음 단계 개입 (개입 내용 또는 None 반환)"""
+        before = self.snapshot()
+        for resource in ("memory", "io"):
+            for kind in ("some", "full"):
+                PRESSURE.set(_avg10(before, resource, kind), resource=resource, kind=kind)
+        if _avg10(before, "memory", "some") <= self.cfg["low_some_avg10"]:
+            if self.level:
+                logger.info(f"[PSI] 메모리 압력 해소 ({format_pressure(before)}) | 단계 초기화")
+                self.level = 0
+            return None
+        if not self._stalled(before):
+            return None
+        now = self._clock()
+        if self.last_action is not None and now - self.last_action < self.cfg["cooldown_seconds"]:
+            return None
+
+        level = min(self.level + 1, self.cfg["max_step"], len(STEPS))
+        name, values = STEPS[level - 1]
+        if "vm.drop_caches" in values and _avg10(before, "io", "full") >= self.cfg["io_full_avg10_limit"]:
+            # I/O 정체 중 캐시를 비우면 다시 읽어들이느라 정체가 심해지므로 compaction 만 수행
+            logger.warning(f"[SKIP] {name} | I/O 정체 중 ({format_pressure(before)}), compaction 으로 대체")
+            level = self.level
+            name, values = STEPS[0]
+
+        results = self._apply(values)
+        INTERVENTIONS.inc(step=name)
+        self.level = level
+        self.last_action = now
+        self._sleep(self.cfg["settle_seconds"])
+        after = self.snapshot()
+        logger.info(f"[PSI] {name} (단계 {level}) | 이전: {format_pressure(before)} -> 이후: {format_pressure(after)}")
+        log_tunable_results(logger, results)
+        return {"step": name, "level": level, "before": before, "after": after, "results": results}
+
+    def _open_triggers(self):
+        triggers = []
+        for resource in ("memory",):
+            try:
+                triggers.append(PsiTrigger(resource, "some", self.cfg["trigger_stall_ms"] * 1000,
+                                           self.cfg["trigger_window_ms"] * 1000))
+            except OSError as e:
+                logger.warning(f"[PSI] {resource} 트리거 등록 실패, 주기 읽기로 대체 | 오류: {e}")
+        return triggers
+
+    def run(self, stop_event):
+        """stop_event 가 설정될 때까지 실행 (트리거 이벤트 또는 interval 마다 평가)"""
+        interval = self.cfg["interval_seconds"]
+        triggers = self._open_triggers() if self.cfg["use_triggers"] else []
+        poller = select.poll()
+        for trigger in triggers:
+            poller.register(trigger, select.POLLPRI)
+        logger.info(f"[PSI] 메모리 압력 모니터 시작 (트리거 {len(triggers)}개, 주기 {interval}s)")
+        try:
+            while not stop_event.is_set():
+                if triggers:
+                    events = poller.poll(interval * 1000)
+                    if any(mask & select.POLLERR for _, mask in events):
+                        logger.warning("[PSI] 트리거 오류, 주기 읽기로 대체")
+                        for trigger in triggers:
+                            poller.unregister(trigger)
+                            trigger.close()
+                        triggers = []
+                else:
+                    stop_event.wait(interval)
+                if stop_event.is_set():
+                    break
+                try:
+                    self.evaluate()
+                except Exception as e:
+                    logger.error(f"[PSI] 평가 실패 | 오류: {e}")
+        finally:
+            for trigger in triggers:
+                trigger.close()
+        logger.info("[PSI] 메모리 압력 모니터 종료")
+
+
+def reclaim_if_needed(mem_config, monitor=None, label="Memory"):
+    """
+    단발 실행(최적화, 예약 작업)용 회수: 정체가 있을 때만 개입하고 무조건 캐시를 비우지 않음
+    PSI 가 있으면 MemoryPressureMonitor.evaluate() (monitor 를 넘기면 단계/cooldown 을 이어서 사용)
+    PSI 미지원 커널이면 사용 가능 메모리 비율이 low_memory_threshold_percent 미만일 때만 페이지 캐시 회수
+    반환: 개입 결과 dict 또는 None
+    """
+    monitor_cfg = mem_config.get("pressure_monitor", {})
+    if psi_available():
+        if not monitor_cfg.get("enable", True):
+            return None
+        monitor = monitor or MemoryPressureMonitor(monitor_cfg)
+        action = monitor.evaluate()
+        if action is None:
+            logger.info(f"{label} | 개입 불필요 ({format_pressure(monitor.snapshot())})")
+        return action
+    if "low_memory_threshold_percent" not in mem_config:
+        return None
+    memory = psutil.virtual_memory()
+    available_percent = memory.available / memory.total * 100
+    threshold = mem_config["low_memory_threshold_percent"]
+    logger.info(f"💾 현재 사용 가능한 메모리: {available_percent:.2f}% (임계치: {threshold}%)")
+    if available_percent >= threshold:
+        return None
+    results = write_tunables({"vm.drop_caches": 1})
+    log_tunable_results(logger, results)
+    return {"step": "drop_pagecache", "level": None, "results": results}
+
+
+def run_memory_monitor(config_path="config/optimizer_settings.json"):
+    """SIGTERM/SIGINT 를 받을 때까지 실행"""
+    config_loader = ConfigLoader(config_path)
+    config_loader.load_config()
+    config = config_loader.get_config().get("memory_optimization", {}).get("pressure_monitor", {})
+    stop_event = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop_event.set())
+    monitor = MemoryPressureMonitor(config)
+
+    # 임계치 등은 설정 파일 변경 시 바로 반영 (트리거 fd 설정은 재시작 시 반영)
+    def on_config_change(document):
+        monitor.cfg = dict(DEFAULTS, **document.get("memory_optimization", {}).get("pressure_monitor", {}))
+        logger.info("[PSI] 설정 변경 반영")
+
+    config_loader.store.subscribe(on_config_change)
+    config_loader.store.watch()
+    metrics.set_job("memory_monitor")
+    set_process("memory_monitor")
+    stop_metrics = metrics.start_periodic()
+    try:
+        monitor.run(stop_event)
+    finally:
+        stop_metrics()
+
+
+if __name__ == "__main__":
+    run_memory_monitor()
@@ -1,20 +1,79 @@
+import argparse
+import logging
 import os
 import subprocess
+import sys
 import time
-import re
 import psutil
-from src.utils.logger import get_logger
+from src.utils.logger import get_logger, set_process
 from src.utils.config import ConfigLoader
-from src.utils.system import is_virtual_machine
+from src.utils.system import governor_paths, is_virtual_machine
+from src.utils.fsroot import hermetic
+from src.utils.executor import Section, current_token, run_sections
+from src.utils import events, metrics, trace
+from src.utils.tunables import write_tunables, log_tunable_results
+from src.utils.cleanup import run_cleanup
+from src.utils.block_devices import apply_io_profiles
+from src.memory_monitor import reclaim_if_needed
+from src.utils.proc_index import POLICIES, ProcessIndex, set_nice, set_scheduler
+from src.planner import apply_plan, plan_firewall, plan_services, plan_sshd
 
 logger = get_logger(__name__)
 
+# 섹션 간 선행 관계 (I/O 스케줄러 설정 후 조각 모음/정리 수행)
+SECTION_DEPENDENCIES = {
+    "Disk": ["I/O"],
+}
+DEFAULT_SECTION_TIMEOUT = 600
+
+SECTION_RUNS = metrics.counter("section_runs_total", "Optimizer section runs by result", ("section", "status"))
+SECTION_DURATION = metrics.histogram("section_duration_seconds", "Optimizer section wall time", ("section",))
+LAST_RUN = metrics.gauge("optimize_last_run_timestamp_seconds", "Unix time of the last optimize run")
+ZOMBIES = metrics.gauge("zombie_processes", "Zombie processes seen at the last check")
+
 def run_command(command):
+    token = current_token()
+    if token is not None and token.cancelled:
+        logger.warning(f"[취소] {command}")
+        return False
+    if hermetic():
+        # 합성 루트(벤치마크)에서는 실제 시스템에 영향을 주는 외부 명령을 실행하지 않음
+        logger.debug(f"[SKIP] {command} | 합성 루트 사용 중")
+        return True
     try:
-        subprocess.run(command, shell=True, check=True)
+        # 취소 시 자식 프로세스까지 종료할 수 있도록 별도 세션으로 실행
+        with trace.span("run_command", cat="subprocess", command=command), \
+                subprocess.Popen(command, shell=True, start_new_session=True) as proc:
+            trace.add(subprocesses=1)
+            if token is not None:
+                token.track(proc)
+            try:
+                returncode = proc.wait()
+            finally:
+                if token is not None:
+                    token.untrack(proc)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
         logger.info(f"[PASS] {command}")
+        return True
     except subprocess.CalledProcessError as e:
         logger.error(f"[FAIL] {command} | 오류: {e}")
+        return False
+
+# 이름이 일치하는 프로세스 전체 스레드에 우선순위/정책 적용 후 결과 기록
+def _apply_to_processes(index, name, match_full, label, apply, *args):
+    pids, tids = index.match_tids(name, match_full)
+    if not pids:
+        logger.warning(f"[SKIP] {label} | 일치하는 프로세스 없음: {name}")
+        return True
+    result = apply(tids, *args)
+    summary = (f"{label} -> {name}: 프로세스 {len(pids)}개, 스레드 {len(tids)}개 "
+               f"(변경 {result['changed']}, 유지 {result['unchanged']}, 종료됨 {result['gone']})")
+    if result["failed"]:
+        logger.error(f"[FAIL] {summary} | 실패 {result['failed']}개: {', '.join(result['errors'][:5])}")
+        return False
+    logger.info(f"[PASS] {summary}")
+    return True
 
 # 1. CPU 최적화
 def optimize_cpu(cpu_config):
@@ -24,119 +83,115 @@ def optimize_cpu(cpu_config):
             logger.warning(f"[SKIP] {section} | 가상 환경에서는 governor 설정 생략")
         else:
             if cpu_config.get("governor"):
-                run_command(f"cpupower frequency-set -g {cpu_config['governor']}")
+                paths = governor_paths()
+                if paths:
+                    results = write_tunables({path: cpu_config["governor"] for path in paths})
+                    log_tunable_results(logger, results)
+                else:
+                    logger.warning(f"{section} | cpufreq 미지원 시스템: governor 설정 생략")
 
-        for proc in cpu_config.get("priority_processes", []):
-            run_command(f"renice -n -5 -p $(pgrep {proc} | head -n 1)")
+        # /proc 은 1회만 스캔하고, 일치하는 모든 프로세스의 모든 스레드에 시스템 콜로 직접 적용
+        index = None
+        match_full = cpu_config.get("match_cmdline", False)
+        priority_procs = cpu_config.get("priority_processes", [])
+        if priority_procs:
+            index = ProcessIndex.scan()
+            nice = cpu_config.get("priority_nice", -5)
+            for i, proc in enumerate(priority_procs, 1):
+                _apply_to_processes(index, proc, match_full, f"nice {nice}", set_nice, nice)
+                events.progress(f"nice {proc}", i, len(priority_procs))
 
         if cpu_config.get("enable_scheduler_tuning"):
             scheduler_policy = cpu_config.get("scheduler_policy", "SCHED_OTHER")
-            policy_map = {
-                "SCHED_FIFO": "-f", "SCHED_RR": "-r", "SCHED_BATCH": "-b",
-                "SCHED_IDLE": "-i", "SCHED_OTHER": ""
-            }
-            option = policy_map.get(scheduler_policy.upper(), None)
+            policy = POLICIES.get(scheduler_policy.upper())
 
-            if option is None:
+            if policy is None:
                 logger.warning(f"[SKIP] {section} | 알 수 없는 scheduler_policy: {scheduler_policy}")
-                return
+                return "SKIP"
 
-            for proc in cpu_config.get("target_processes", []):
-                run_command(f"chrt {option} -p 50 $(pgrep {proc} | head -n 1)")
-        logger.info(f"[PASS] {section}")
+            index = index or ProcessIndex.scan()
+            priority = cpu_config.get("scheduler_priority", 50)
+            target_procs = cpu_config.get("target_processes", [])
+            for i, proc in enumerate(target_procs, 1):
+                _apply_to_processes(index, proc, match_full, f"{scheduler_policy.upper()} {priority}",
+                                    set_scheduler, policy, priority)
+                events.progress(f"{scheduler_policy.upper()} {proc}", i, len(target_procs))
+        return "PASS"
     except Exception as e:
         logger.error(f"[FAIL] {section} | 오류: {e}")
+        return "FAIL"
 
 # 2. IO 최적화
 def optimize_io(io_config):
     section = "I/O"
     try:
-        if is_virtual_machine():
-            logger.warning(f"[SKIP] {section} | 가상환경에서 건너뜀")
-            return
-
         if io_config.get("enable"):
-            run_command(f"echo {io_config.get('scheduler', 'deadline')} | tee /sys/block/sda/queue/scheduler")
-            run_command(f"blockdev --setra {io_config.get('read_ahead_kb', 128)} /dev/sda")
-        logger.info(f"[PASS] {section}")
+            # /sys/block 의 모든 디스크를 종류별(rotational/ssd/nvme/stacked/virtual) 프로필로 병렬 적용
+            devices = apply_io_profiles(io_config)
+            for i, device in enumerate(devices, 1):
+                kind = device["class"] + (f" → {device['backing']}" if device.get("backing") else "")
+                logger.info(f"{section} | {device['device']} ({kind})")
+                for reason in device["skipped"]:
+                    logger.warning(f"[SKIP] {device['device']} | {reason}")
+                log_tunable_results(logger, device["results"])
+                events.progress(device["device"], i, len(devices))
+        return "PASS"
     except Exception as e:
         logger.error(f"[FAIL] {section} | 오류: {e}")
+        return "FAIL"
 
 # 3. 메모리 최적화
 def optimize_memory(mem_config):
     section = "Memory"
     try:
-        run_command(f"sysctl vm.swappiness={mem_config['swappiness']}")
-
-        if mem_config.get("drop_caches_on_schedule"):
-            run_command(f"sync; echo {mem_config['drop_cache_mode']} > /proc/sys/vm/drop_caches")
-
-        if "low_memory_threshold_percent" in mem_config:
-            with open('/proc/meminfo') as f:
-                meminfo = f.read()
-            mem_total = int(re.search(r'MemTotal:\s+(\d+)', meminfo).group(1))
-            mem_available = int(re.search(r'MemAvailable:\s+(\d+)', meminfo).group(1))
-            available_percent = (mem_available / mem_total) * 100
-            threshold = mem_config["low_memory_threshold_percent"]
-            logger.info(f"💾 현재 사용 가능한 메모리: {available_percent:.2f}% (임계치: {threshold}%)")
-
-            if available_percent < threshold:
-                run_command("sync; echo 3 > /proc/sys/vm/drop_caches")
-        logger.info(f"[PASS] {section}")
+        log_tunable_results(logger, write_tunables({"vm.swappiness": mem_config["swappiness"]}))
+
+        # 고정 MemAvailable 임계치/무조건 drop_caches 대신 실제 메모리 정체(PSI)가 있을 때만 단계적으로 회수
+        reclaim_if_needed(mem_config, label=section)
+        return "PASS"
     except Exception as e:
         logger.error(f"[FAIL] {section} | 오류: {e}")
+        return "FAIL"
 
 # 4. 서비스 최적화
 def optimize_services(service_config):
     section = "Services"
     try:
-        for svc in service_config.get("disable_services", []):
-            run_command(f"systemctl disable --now {svc}")
+        # 이미 비활성화/중지된 서비스는 건너뜀
+        apply_plan(plan_services(service_config))
 
         zombie_cfg = service_config.get("zombie_cleanup", {})
         if zombie_cfg.get("enable"):
-            zombie_found = False
+            zombies = 0
             for proc in psutil.process_iter(['pid', 'ppid', 'name', 'status']):
                 if proc.info['status'] == psutil.STATUS_ZOMBIE:
-                    zombie_found = True
+                    zombies += 1
                     logger.warning(f"⚠️ 좀비 프로세스: {proc.info}")
-            if not zombie_found:
+            ZOMBIES.set(zombies)
+            if not zombies:
                 logger.info("✅ 좀비 없음")
-        logger.info(f"[PASS] {section}")
+        return "PASS"
     except Exception as e:
         logger.error(f"[FAIL] {section} | 오류: {e}")
+        return "FAIL"
 
 # 5. 보안 설정 강화
 def harden_security(security_config):
     section = "Security"
     try:
-        fw = security_config.get("firewall", {})
-        if fw.get("enable"):
-            if fw.get("deny_all_by_default", False):
-                run_command("ufw default deny incoming")
-            else:
-                run_command("ufw default allow incoming")
-            run_command("ufw default allow outgoing")
-            for port in fw.get("blocked_ports", []):
-                run_command(f"ufw deny in {port}")
-                run_command(f"ufw deny out {port}")
-            run_command("ufw enable")
-
-        ssh = security_config.get("ssh", {})
-        sshd_config = "/etc/ssh/sshd_config"
-        for key, val in {
-            "PermitRootLogin": ssh.get("permit_root_login"),
-            "PasswordAuthentication": ssh.get("password_authentication"),
-            "Protocol": ssh.get("protocol"),
-            "MaxAuthTries": ssh.get("max_auth_tries")
-        }.items():
-            if val is not None:
-                run_command(f"sed -i -E 's|^[#\\s]*{key}\\s+.*|{key} {val}|' {sshd_config}")
-        run_command("systemctl restart sshd")
-
-        logger.info(f"[PASS] {section}")
+        # 현재 ufw/sshd 상태와 비교해 달라진 항목만 적용 (sshd 는 변경이 있을 때만 reload)
+        changes = plan_firewall(security_config.get("firewall", {})) + plan_sshd(security_config.get("ssh", {}))
+        if not changes:
+            logger.info(f"{section} | 변경 사항 없음")
+        result = apply_plan(changes)
+        if result["failed"]:
+            logger.error(f"[FAIL] {section} | 실패 {result['failed']}건")
+            return "FAIL"
+
+        return "PASS"
     except Exception as e:
         logger.error(f"[FAIL] {section} | 오류: {e}")
+        return "FAIL"
 
 # 6. 디스크 최적화
 def optimize_disk(disk_config):
@@ -144,64 +199,101 @@ def optimize_disk(disk_config):
     try:
         if is_virtual_machine():
             logger.warning(f"[SKIP] {section} | 가상환경에서 생략")
-            return
+            return "SKIP"
 
         # 디스크 조각 모음
         if disk_config.get("enable_defrag"):
-            for path in disk_config.get("defrag_paths", []):
+            defrag_paths = disk_config.get("defrag_paths", [])
+            for i, path in enumerate(defrag_paths, 1):
                 run_command(f"e4defrag {path}")
+                events.progress(f"e4defrag {path}", i, len(defrag_paths))
 
         # 통합 정리 수행
         cleanup_cfg = disk_config.get("unified_cleanup", {})
         if cleanup_cfg.get("enable"):
-            log_file = cleanup_cfg.get("log_file_path", "logs/unified_cleanup.log")
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            now = time.time()
-
-            for root_path in cleanup_cfg.get("target_paths", []):
-                for root, dirs, files in os.walk(root_path, topdown=False):
-                    for f in files:
-                        file_path = os.path.join(root, f)
-                        try:
-                            age_minutes = (now - os.path.getmtime(file_path)) / 60
-                            if os.path.getsize(file_path) == 0 and age_minutes >= cleanup_cfg.get("min_file_age_minutes", 30):
-                                os.remove(file_path)
-                                with open(log_file, "a") as log:
-                                    log.write(f"{time.ctime()} - Deleted empty file: {file_path}\n")
-                        except Exception:
-                            continue
-
-                    if cleanup_cfg.get("remove_empty_dirs", True):
-                        for d in dirs:
-                            dir_path = os.path.join(root, d)
-                            try:
-                                if not os.listdir(dir_path):
-                                    os.rmdir(dir_path)
-                                    with open(log_file, "a") as log:
-                                        log.write(f"{time.ctime()} - Deleted empty directory: {dir_path}\n")
-                            except Exception:
-                                continue
-
-        logger.info(f"[PASS] {section}")
+            events.progress("unified_cleanup", 0, 1)
+            stats = run_cleanup(cleanup_cfg, token=current_token())
+            events.progress("unified_cleanup", 1, 1)
+            logger.info(
+                f"🧹 통합 정리: {stats['entries']}개 항목 검사 ({stats['entries_per_sec']:.0f}개/s, "
+                f"{stats['elapsed_seconds']:.2f}s), 파일 {stats['files_deleted']}개 / "
+                f"디렉토리 {stats['dirs_deleted']}개 삭제, {stats['bytes_reclaimed']} bytes 회수, "
+                f"오류 {stats['errors']}건"
+            )
+
+        return "PASS"
     except Exception as e:
         logger.error(f"[FAIL] {section} | 오류: {e}")
+        return "FAIL"
 
 
 # 메인 최적화 실행
-def optimize_system():
+def optimize_system(emit_events=False, emitter=None):
+    """
+    emit_events 면 섹션 시작/종료, 세부 진행률, 경고/오류를 stdout 에 JSON Lines 로 출력 (GUI 용)
+    emitter 를 주면 stdout 대신 그 emitter 로 전달 (데몬이 요청한 클라이언트 연결로 보낼 때)
+    """
     config_loader = ConfigLoader("config/optimizer_settings.json")
     config_loader.load_config()
     config = config_loader.get_config()
 
-    logger.info("시스템 최적화 시작")
-    optimize_cpu(config["performance_optimization"]["cpu"])
-    optimize_io(config["performance_optimization"]["io"])
-    optimize_memory(config["memory_optimization"])
-    optimize_services(config["service_management"])
-    harden_security(config["security_hardening"])
-    optimize_disk(config["disk_optimization"])
-    logger.info("시스템 최적화 완료")
+    exec_cfg = config.get("execution", {})
+    dependencies = exec_cfg.get("dependencies", SECTION_DEPENDENCIES)
+    timeouts = exec_cfg.get("section_timeouts", {})
+    default_timeout = exec_cfg.get("default_timeout_seconds", DEFAULT_SECTION_TIMEOUT)
 
-if __name__ == "__main__":
-    optimize_system()
+    def section(name, func, section_config):
+        return Section(name, func, (section_config,),
+                       depends_on=dependencies.get(name, []),
+                       timeout=timeouts.get(name, default_timeout))
+
+    sections = [
+        section("CPU", optimize_cpu, config["performance_optimization"]["cpu"]),
+        section("I/O", optimize_io, config["performance_optimization"]["io"]),
+        section("Memory", optimize_memory, config["memory_optimization"]),
+        section("Services", optimize_services, config["service_management"]),
+        section("Security", harden_security, config["security_hardening"]),
+        section("Disk", optimize_disk, config["disk_optimization"]),
+    ]
+
+    def on_event(event_type, **fields):
+        if event_type == "section_end":
+            SECTION_RUNS.inc(section=fields["section"], status=fields["status"])
+            SECTION_DURATION.observe(fields["duration"], section=fields["section"])
+        events.emit(event_type, **fields)
 
+    log_handler = None
+    if emitter is None and emit_events:
+        emitter = events.EventEmitter(sys.stdout)
+    if emitter is not None:
+        events.set_emitter(emitter)
+        log_handler = events.EventLogHandler()
+        logging.getLogger().addHandler(log_handler)
+    try:
+        logger.info("시스템 최적화 시작")
+        events.emit("run_start", sections=[s.name for s in sections])
+        start = time.monotonic()
+        with trace.span("optimize_system", cat="run"):
+            results = run_sections(sections, max_workers=exec_cfg.get("max_workers", 4), logger=logger,
+                                   on_event=on_event)
+        duration = time.monotonic() - start
+        logger.info(f"시스템 최적화 완료 ({duration:.2f}s)")
+        events.emit("run_end", results=results, duration=round(duration, 3))
+        LAST_RUN.set_to_current_time()
+        metrics.write_after_run()
+        return results
+    finally:
+        if log_handler is not None:
+            logging.getLogger().removeHandler(log_handler)
+            events.set_emitter(None)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run system optimization")
+    parser.add_argument("--events", action="store_true", help="Write JSON-lines progress events to stdout")
+    parser.add_argument("--profile", metavar="TRACE_JSON",
+                        help="Write a Chrome trace of sections/commands and print a timing summary")
+    args = parser.parse_args()
+    metrics.set_job("optimize")
+    set_process("optimize")
+    with trace.profile(args.profile):
+        optimize_system(emit_events=args.events)
@@ -0,0 +1,206 @@
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from src.optimizer import (optimize_cpu, optimize_disk, optimize_io, optimize_memory, optimize_services,
+                           harden_security)
+from src.planner import build_plan
+from src.utils.cleanup import run_cleanup
+from src.utils.chunk_store import ChunkStore
+from src.utils.fsroot import use_root
+from src.utils.incremental_backup import create_backup
+from src.utils.logger import get_logger
+from src.utils.proc_index import ProcessIndex
+from src.utils import synthetic_root
+
+logger = get_logger(__name__)
+
+BASELINE_PATH = "benchmarks/baseline.json"
+# 기준선 대비 중앙값이 이 비율 이상 느려지면 회귀로 판단
+DEFAULT_TOLERANCE = 0.25
+# 아주 짧은 측정의 흔들림을 회귀로 오판하지 않도록 절대 증가량 하한 (초)
+MIN_DELTA_SECONDS = 0.005
+
+
+def bench_config(layout, work_dir):
+    """
+    합성 루트용 고정 설정 (사용자 설정과 무관하게 매번 같은 작업량을 측정)
+    실제 시스템 전체에 영향을 주는 작업(sync, 조각 모음, 좀비 검사)은 끔
+    """
+    sizes = layout["sizes"]
+    cleanup = {
+        "enable": True,
+        "target_paths": [layout["tmp_dir"]],
+        "min_file_age_minutes": 60,
+        "remove_empty_dirs": True,
+        "workers": 4,
+        "log_file_path": os.path.join(work_dir, "unified_cleanup.log"),
+    }
+    return {
+        "performance_optimization": {
+            "cpu": {"governor": "performance", "priority_processes": layout["process_names"][:4],
+                    "enable_scheduler_tuning": True, "scheduler_policy": "SCHED_BATCH",
+                    "target_processes": layout["process_names"][4:8]},
+            "io": {"enable": True, "exclude": ["loop*"]},
+        },
+        "memory_optimization": {"swappiness": 10, "drop_caches_on_schedule": False,
+                                "pressure_monitor": {"enable": True}},
+        "service_management": {"disable_services": ["cups", "bluetooth", "avahi-daemon"],
+                               "zombie_cleanup": {"enable": False}},
+        "security_hardening": {
+            "firewall": {"enable": True, "deny_all_by_default": True,
+                         "blocked_ports": [str(1024 + i) for i in range(sizes["blocked_ports"])]},
+            "ssh": {"permit_root_login": "no", "password_authentication": "no", "max_auth_tries": 3},
+        },
+        "disk_optimization": {"enable_defrag": False, "unified_cleanup": cleanup},
+    }
+
+
+def _reset_state(layout):
+    # 섹션이 바꾼 /proc/sys, /sys, /etc 값을 초기 상태로 되돌려 매 반복 같은 변경량을 측정
+    root, sizes = layout["root"], layout["sizes"]
+    synthetic_root.reset_proc_sys(root)
+    synthetic_root.build_sys(root, **sizes)
+    synthetic_root.build_etc(root, **sizes)
+
+
+def _reset_temp_tree(layout):
+    shutil.rmtree(layout["tmp_dir"], ignore_errors=True)
+    synthetic_root.build_temp_tree(layout["root"], **layout["sizes"])
+
+
+def _reset_dir(path):
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def _backup_dedup(source, store_dir):
+    store = ChunkStore(store_dir)
+    try:
+        return store.backup(source, os.path.join(store_dir, "manifest.json"))
+    finally:
+        store.close()
+
+
+def build_cases(layout, work_dir):
+    """이름 -> (setup, run): setup 은 측정 시간에 포함하지 않음"""
+    config = bench_config(layout, work_dir)
+    perf = config["performance_optimization"]
+    disk = config["disk_optimization"]
+    reset = lambda: _reset_state(layout)
+    tar_dir = os.path.join(work_dir, "tar")
+    chunk_dir = os.path.join(work_dir, "chunks")
+    return {
+        "section:CPU": (reset, lambda: optimize_cpu(perf["cpu"])),
+        "section:I/O": (reset, lambda: optimize_io(perf["io"])),
+        "section:Memory": (reset, lambda: optimize_memory(config["memory_optimization"])),
+        "section:Services": (reset, lambda: optimize_services(config["service_management"])),
+        "section:Security": (reset, lambda: harden_security(config["security_hardening"])),
+        "section:Disk": (lambda: _reset_temp_tree(layout), lambda: optimize_disk(disk)),
+        "routine:proc_scan": (None, lambda: ProcessIndex.scan().match("nginx")),
+        "routine:plan": (reset, lambda: build_plan(config)),
+        "routine:cleanup": (lambda: _reset_temp_tree(layout), lambda: run_cleanup(disk["unified_cleanup"])),
+        "routine:backup_tar": (lambda: _reset_dir(tar_dir),
+                               lambda: create_backup(layout["backup_source"], os.path.join(tar_dir, "data.tar.gz"))),
+        "routine:backup_dedup": (lambda: _reset_dir(chunk_dir),
+                                 lambda: _backup_dedup(layout["backup_source"], chunk_dir)),
+    }
+
+
+def time_case(setup, run, repeat):
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = run()
+        durations.append(time.perf_counter() - start)
+        if result == "FAIL":
+            raise RuntimeError("섹션 실행 실패")
+    return durations
+
+
+def run_suite(scale="small", repeat=3, root=None, only=None, **overrides):
+    """
+    합성 루트를 만들고(root 미지정 시 임시 디렉토리) 모든 섹션/루틴을 repeat 회 측정
+    overrides 로 규모 항목(pids, temp_files 등)을 덮어쓸 수 있음
+    반환: {"scale", "repeat", "created", "results": {이름: {"median", "min", "runs"}}}
+    """
+    with tempfile.TemporaryDirectory(prefix="optimizer-perf-") as tmp:
+        root = os.path.abspath(root or os.path.join(tmp, "root"))
+        work_dir = os.path.join(tmp, "work")
+        os.makedirs(work_dir)
+        logger.info(f"합성 루트 생성: {root} ({scale})")
+        layout = synthetic_root.build_synthetic_root(root, scale, **overrides)
+        results = {}
+        with use_root(root):
+            for name, (setup, run) in build_cases(layout, work_dir).items():
+                if only and name not in only:
+                    continue
+                try:
+                    durations = time_case(setup, run, repeat)
+                except Exception as e:
+                    logger.error(f"[FAIL] {name} | 오류: {e}")
+                    results[name] = {"error": str(e)}
+                    continue
+                results[name] = {"median": statistics.median(durations), "min": min(durations),
+                                 "runs": [round(d, 6) for d in durations]}
+                logger.info(f"[PASS] {name} | 중앙값 {results[name]['median']:.4f}s")
+    return {"scale": scale, "sizes": layout["sizes"], "repeat": repeat,
+            "created": datetime.now().isoformat(timespec="seconds"), "results": results}
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(report, path=BASELINE_PATH):
+    """규모별로 기준선 저장 (다른 규모의 기준선은 유지)"""
+    baseline = load_baseline(path)
+    baseline[str(report["scale"])] = {name: result["median"] for name, result in report["results"].items()
+                                      if "median" in result}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=4, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    기준선과 비교한 행 목록: {"name", "baseline", "median", "ratio", "status"}
+    status: ok / regression / new / error
+    """
+    reference = baseline.get(str(report["scale"]), {})
+    rows = []
+    for name, result in report["results"].items():
+        row = {"name": name, "baseline": reference.get(name), "median": result.get("median"), "ratio": None}
+        if "error" in result:
+            row["status"] = "error"
+        elif row["baseline"] is None:
+            row["status"] = "new"
+        else:
+            row["ratio"] = row["median"] / row["baseline"] if row["baseline"] > 0 else float("inf")
+            slower = row["median"] - row["baseline"]
+            row["status"] = ("regression" if row["ratio"] > 1 + tolerance and slower > MIN_DELTA_SECONDS
+                             else "ok")
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows):
+    lines = []
+    for row in rows:
+        base = f"{row['baseline']:.4f}s" if row["baseline"] is not None else "-"
+        median = f"{row['median']:.4f}s" if row["median"] is not None else "-"
+        ratio = f"x{row['ratio']:.2f}" if row["ratio"] is not None else ""
+        mark = {"ok": "✅", "regression": "❌", "new": "🆕", "error": "❌"}[row["status"]]
+        lines.append(f"{mark} {row['name']:<22} {median:>10}  기준 {base:>10} {ratio:>7}  {row['status']}")
+    return lines
@@ -0,0 +1,231 @@
+import subprocess
+from src.utils.logger import get_logger
+from src.utils.config import ConfigLoader
+from src.utils.system import governor_paths, is_virtual_machine
+from src.utils.fsroot import hermetic, host_path
+from src.utils.tunables import write_tunables, log_tunable_results
+from src.utils.block_devices import apply_io_profiles
+from src.utils import events, ufw_rules
+from src.utils.sshd_config import SSHD_CONFIG, SshdConfig, validate_sshd
+
+logger = get_logger(__name__)
+
+UFW_CONF = ufw_rules.UFW_CONF
+UFW_DEFAULTS = ufw_rules.UFW_DEFAULTS
+UFW_USER_RULES = ufw_rules.UFW_USER_RULES
+
+DOMAINS = ("kernel", "services", "firewall", "sshd")
+
+# 설정 키 -> sshd_config 지시어
+SSHD_OPTIONS = {
+    "permit_root_login": "PermitRootLogin",
+    "password_authentication": "PasswordAuthentication",
+    "protocol": "Protocol",
+    "max_auth_tries": "MaxAuthTries",
+}
+
+
+def _change(domain, target, current, desired, apply, post=None):
+    """
+    변경 1건: apply 는 인자 없는 함수(성공 여부 반환)
+    post 는 같은 함수를 가진 변경이 하나라도 적용되면 마지막에 1회 실행할 후속 작업 (파일 기록 + reload 등)
+    """
+    return {"domain": domain, "target": target, "current": current, "desired": desired,
+            "apply": apply, "post": post}
+
+
+def _run(command):
+    # 순환 import 방지 (optimizer 가 planner 를 사용)
+    from src.optimizer import run_command
+    return run_command(command)
+
+
+# ── 커널 (sysctl / sysfs) ──
+
+def _tunable_changes(results, domain="kernel"):
+    """write_tunables(dry_run=True) 결과 중 실제로 바뀌어야 하는 항목만 변경으로 변환"""
+    changes = []
+    for r in results:
+        if r["status"] == "planned":
+            changes.append(_change(domain, r["key"], r["old"], r["new"],
+                                   lambda r=r: log_tunable_results(logger, write_tunables([(r["path"], r["new"])]))))
+        elif r["status"] == "failed":
+            logger.warning(f"[SKIP] {r['key']} | 현재 값 확인 불가: {r['error']}")
+    return changes
+
+
+def plan_kernel(config):
+    values = {}
+    mem_config = config.get("memory_optimization", {})
+    if "swappiness" in mem_config:
+        values["vm.swappiness"] = mem_config["swappiness"]
+    cpu_config = config.get("performance_optimization", {}).get("cpu", {})
+    if cpu_config.get("governor") and not is_virtual_machine():
+        for path in governor_paths():
+            values[path] = cpu_config["governor"]
+    changes = _tunable_changes(write_tunables(values, dry_run=True))
+
+    io_config = config.get("performance_optimization", {}).get("io", {})
+    if io_config.get("enable"):
+        for device in apply_io_profiles(io_config, dry_run=True):
+            results = device["results"]
+            # 스케줄러를 바꾸면 nr_requests 가 기본값으로 초기화되므로 현재 값이 같아도 다시 기록
+            if any(r["status"] == "planned" and r["path"].endswith("/scheduler") for r in results):
+                results = [dict(r, status="planned") if r["path"].endswith("/nr_requests") and r["status"] == "unchanged"
+                           else r for r in results]
+            changes += _tunable_changes(results)
+    return changes
+
+
+# ── 서비스 ──
+
+def systemd_unit_states(units):
+    """systemctl show 1회 호출로 {unit: {"UnitFileState", "ActiveState", "LoadState"}} 조회"""
+    if not units or hermetic():
+        return {}
+    try:
+        result = subprocess.run(["systemctl", "show", "-p", "Id,LoadState,UnitFileState,ActiveState", "--", *units],
+                                capture_output=True, text=True)
+    except OSError as e:
+        logger.warning(f"[SKIP] 서비스 | systemctl 실행 불가: {e}")
+        return {}
+    if result.returncode != 0 and not result.stdout.strip():
+        logger.warning(f"[SKIP] 서비스 | 상태 조회 실패: {result.stderr.strip()}")
+        return {}
+    states = {}
+    for unit, block in zip(units, result.stdout.strip().split("\n\n")):
+        states[unit] = dict(line.split("=", 1) for line in block.splitlines() if "=" in line)
+    return states
+
+
+def plan_services(service_config):
+    units = service_config.get("disable_services", [])
+    changes = []
+    for unit, state in systemd_unit_states(units).items():
+        if state.get("LoadState") == "not-found":
+            continue
+        enabled = state.get("UnitFileState") == "enabled"
+        active = state.get("ActiveState") in ("active", "activating", "reloading")
+        if enabled or active:
+            current = f"{state.get('UnitFileState')}/{state.get('ActiveState')}"
+            changes.append(_change("services", unit, current, "disabled/inactive",
+                                   lambda unit=unit: _run(f"systemctl disable --now {unit}")))
+    return changes
+
+
+# ── 방화벽 (ufw) ──
+
+def plan_firewall(fw_config, state=None):
+    """
+    규칙/기본 정책/활성화 차이를 항목별로 보여주되, 적용은 user rules 파일 교체 + reload 1회로 묶어서 수행
+    (각 항목의 apply 는 확인만 하고 실제 반영은 공통 post 인 트랜잭션 commit 에서 처리)
+    """
+    if not fw_config.get("enable"):
+        return []
+    if state is None:
+        state = ufw_rules.load_state(host_path(UFW_CONF), host_path(UFW_DEFAULTS),
+                                     [host_path(path) for path in UFW_USER_RULES])
+    if state is None:
+        logger.warning("[SKIP] 방화벽 | ufw 설정 파일 없음 (미설치)")
+        return []
+
+    incoming = "deny" if fw_config.get("deny_all_by_default", False) else "allow"
+    plan = ufw_rules.plan_ufw(state, ufw_rules.compile_rules(fw_config.get("blocked_ports", [])),
+                              {"incoming": incoming, "outgoing": "allow"})
+
+    def commit_firewall():
+        return ufw_rules.commit(state, plan, _run)
+
+    staged = lambda: True
+    changes = [_change("firewall", f"default {direction}", current, desired, staged, commit_firewall)
+               for direction, current, desired in plan["policies"]]
+    changes += [_change("firewall", " ".join(rule), None, "추가", staged, commit_firewall) for rule in plan["add"]]
+    changes += [_change("firewall", " ".join(rule), "관리 규칙", "삭제", staged, commit_firewall)
+                for rule in plan["remove"]]
+    if plan["enable"]:
+        changes.append(_change("firewall", "ufw", "inactive", "active", staged, commit_firewall))
+    return changes
+
+
+# ── sshd ──
+
+def plan_sshd(ssh_config, path=SSHD_CONFIG, validate=validate_sshd):
+    """
+    sshd_config(Include 포함)를 한 번 읽어 달라진 지시어만 계획
+    적용 시 메모리에서 모두 수정 -> 원자적 기록 -> sshd -t 검사 -> 실제로 바뀐 경우에만 reload 1회
+    """
+    desired = {SSHD_OPTIONS[k]: str(v) for k, v in ssh_config.items() if k in SSHD_OPTIONS and v is not None}
+    if not desired:
+        return []
+    try:
+        config = SshdConfig(host_path(path))
+    except OSError as e:
+        logger.warning(f"[SKIP] sshd | 설정 파일을 읽을 수 없음: {e}")
+        return []
+    pending = {key: value for key, value in desired.items()
+               if (config.get(key) or "").lower() != value.lower()}
+
+    def commit_sshd():
+        for key, value in pending.items():
+            config.set(key, value)
+        try:
+            written = config.write(validate)
+        except (OSError, ValueError) as e:
+            logger.error(f"[FAIL] sshd_config 기록 실패, 원래 내용 유지 | 오류: {e}")
+            return False
+        for changed_path in written:
+            logger.info(f"[PASS] {changed_path} 갱신")
+        # restart 대신 reload: 기존 SSH 세션을 유지
+        return _run("systemctl reload sshd") if written else True
+
+    return [_change("sshd", key, config.get(key), value, lambda: True, commit_sshd)
+            for key, value in pending.items()]
+
+
+# ── 계획/적용 ──
+
+def build_plan(config, domains=DOMAINS):
+    security = config.get("security_hardening", {})
+    planners = {
+        "kernel": lambda: plan_kernel(config),
+        "services": lambda: plan_services(config.get("service_management", {})),
+        "firewall": lambda: plan_firewall(security.get("firewall", {})),
+        "sshd": lambda: plan_sshd(security.get("ssh", {})),
+    }
+    changes = []
+    for domain in domains:
+        try:
+            changes += planners[domain]()
+        except Exception as e:
+            logger.error(f"[FAIL] {domain} 상태 확인 실패 | 오류: {e}")
+    return changes
+
+
+def format_plan(changes):
+    if not changes:
+        return ["변경 사항 없음 (현재 상태가 설정과 일치)"]
+    return [f"[{c['domain']}] {c['target']}: {c['current'] if c['current'] is not None else '-'} -> {c['desired']}"
+            for c in changes]
+
+
+def apply_plan(changes):
+    """계획된 변경만 적용하고 후속 작업(sshd reload 등)은 필요한 경우 1회만 실행"""
+    applied, failed, posts = 0, 0, []
+    for i, change in enumerate(changes, 1):
+        events.progress(f"{change['domain']} {change['target']}", i, len(changes))
+        if change["apply"]():
+            applied += 1
+            if change["post"] and change["post"] not in posts:
+                posts.append(change["post"])
+        else:
+            failed += 1
+    for post in posts:
+        if not post():
+            failed += 1
+    return {"applied": applied, "failed": failed, "post_actions": [post.__name__ for post in posts]}
+
+
+def load_config(config_path="config/optimizer_settings.json"):
+    config_loader = ConfigLoader(config_path)
+    config_loader.load_config()
+    return config_loader.get_config()
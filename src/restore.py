@@ -1,41 +1,147 @@
+import functools
 import os
 import shutil
 import subprocess
 import gzip
-import json
+import hashlib
+import tarfile
+import time
 from datetime import datetime
 from pathlib import Path
 from src.utils.logger import get_logger
+from src.utils.config import config_store
+from src.utils.chunk_store import ChunkStore, MANIFEST_SUFFIX, find_previous_manifest, load_manifest
+from src.utils import incremental_backup
+from src.utils.incremental_backup import SIDECAR_SUFFIX
+from src.utils.pgzip import compress_stream
+from src.utils import archive_index
+from src.utils.archive_index import INDEX_SUFFIX, open_indexed_tar_gz
+from src.utils.catalog import BackupCatalog
+from src.utils.retention import plan_retention
+from src.utils import metrics, trace
+
+# 백업 목록에 표시하지 않는 보조 파일
+SIDECAR_SUFFIXES = (SIDECAR_SUFFIX, INDEX_SUFFIX)
 
 logger = get_logger(__name__)
 
+BACKUPS = metrics.counter("backups_total", "Custom backups by kind and result", ("kind", "status"))
+BACKUP_DURATION = metrics.histogram("backup_duration_seconds", "Custom backup wall time", ("kind",))
+BACKUP_BYTES = metrics.counter("backup_bytes_total", "Size of registered backups (dedup: logical size)", ("format",))
+RETENTION_DELETED = metrics.counter("retention_deleted_total", "Backups removed by the retention policy")
+RETENTION_BYTES = metrics.counter("retention_bytes_reclaimed_total", "Bytes freed by the retention policy")
+RESTORES = metrics.counter("restores_total", "Custom backup restores by result", ("status",))
+
 CONFIG_PATH = Path("config/optimizer_settings.json")
 CUSTOM_BACKUP_DIR = Path("custom_backups")
+STORE_DIR = CUSTOM_BACKUP_DIR / ".store"
+CATALOG_DIR_NAME = ".catalog"
 BACKUP_ROOT = Path("backups")
 TIMESHIFT_CMD = "timeshift"
 
+# 복원 설정 로드
+def load_restore_settings():
+    try:
+        # 공용 설정 캐시 사용 (파일이 바뀐 경우에만 다시 읽음)
+        return config_store(CONFIG_PATH).section("restore_settings")
+    except Exception as e:
+        logger.error(f"[설정 로드 실패] 복원 설정 로딩 실패: {e}")
+        return {}
+
 # 사용자 정의 백업 대상 로드
 def load_custom_paths():
+    return load_restore_settings().get("custom_backup", {}).get("paths", [])
+
+# 중복 제거 저장소 (backup_format 이 "dedup" 일 때 사용)
+def use_dedup(settings=None):
+    settings = settings if settings is not None else load_restore_settings()
+    return settings.get("backup_format") == "dedup"
+
+def open_chunk_store(settings=None):
+    settings = settings if settings is not None else load_restore_settings()
+    return ChunkStore(
+        STORE_DIR,
+        compression_level=settings.get("compression_level", 6),
+        workers=settings.get("compression_workers", os.cpu_count() or 1),
+    )
+
+def _dedup_backup(source, dest_name, settings):
+    manifest_path = CUSTOM_BACKUP_DIR / f"{dest_name}{MANIFEST_SUFFIX}"
+    counter = 1
+    while manifest_path.exists():
+        # 같은 초에 생성된 백업이 manifest 를 덮어쓰면 참조 횟수가 어긋나므로 이름을 구분
+        manifest_path = CUSTOM_BACKUP_DIR / f"{dest_name}_{counter}{MANIFEST_SUFFIX}"
+        counter += 1
+    store = open_chunk_store(settings)
     try:
-        with open(CONFIG_PATH) as f:
-            config = json.load(f)
-            return config.get("restore_settings", {}).get("custom_backup", {}).get("paths", [])
-    except Exception as e:
-        logger.error(f"[설정 로드 실패] 사용자 정의 경로 로딩 실패: {e}")
-        return []
+        stats = store.backup(source, manifest_path, find_previous_manifest(CUSTOM_BACKUP_DIR, source))
+    finally:
+        store.close()
+    logger.info(f"[중복 제거 백업] {source} -> {manifest_path} | 파일 {stats['files']}개 "
+                f"(재사용 {stats['reused_files']}개), 신규 {stats['new_bytes']} / 전체 {stats['bytes']} bytes")
+    return manifest_path
 
-# 파일 압축
+# 압축 설정 (레벨, 병렬 압축 스레드 수)
+def compression_options(settings=None):
+    settings = settings if settings is not None else load_restore_settings()
+    return {
+        "level": settings.get("compression_level", 6),
+        "workers": settings.get("compression_workers", os.cpu_count() or 1),
+    }
+
+# 파일 압축 (블록 단위 병렬 gzip)
 def compress_file(src_path, dest_path):
-    with open(src_path, 'rb') as f_in, gzip.open(dest_path.with_suffix(dest_path.suffix + ".gz"), 'wb') as f_out:
-        shutil.copyfileobj(f_in, f_out)
+    with open(src_path, 'rb') as f_in:
+        return compress_stream(f_in, dest_path.with_suffix(dest_path.suffix + ".gz"), **compression_options())
 
-# 사용자 정의 백업 생성 - 파일 선택
-def custom_backup():
-    from tkinter import filedialog
-    file_path = filedialog.askopenfilename(title="백업할 파일 선택")
-    if not file_path:
-        return "❌ 파일 선택이 취소됨."
+# 디렉토리 아카이브 생성 (tar 스트림을 병렬 gzip 으로 바로 압축, 멤버 위치 인덱스 포함)
+def write_directory_archive(dir_path, archive_path, settings=None):
+    dir_path = Path(dir_path)
+    with open_indexed_tar_gz(archive_path, source=dir_path.resolve(), **compression_options(settings)) as tar:
+        for name in sorted(os.listdir(dir_path)):
+            tar.add(str(dir_path / name), arcname=name)
+
+# 권한을 낮춘 프로세스가 원본을 읽어 파이프로 넘길 때 사용하는 스트림 (압축/저장은 받는 쪽에서 수행)
+def write_tar_stream(dir_path, out):
+    dir_path = Path(dir_path)
+    with tarfile.open(fileobj=out, mode="w|") as tar:
+        for name in sorted(os.listdir(dir_path)):
+            tar.add(str(dir_path / name), arcname=name)
+
+def write_file_stream(file_path, out):
+    with open(file_path, "rb") as f:
+        shutil.copyfileobj(f, out)
+
+def _is_safe_member(member):
+    # 다른 프로세스가 만든 스트림이므로 백업 밖을 가리키는 이름과 장치 파일은 받지 않음
+    parts = Path(member.name).parts
+    return not (os.path.isabs(member.name) or ".." in parts or member.ischr() or member.isblk())
+
+def _remove_partial_archive(archive_path):
+    # 아카이브는 성공 시에만 제자리에 생기지만, 증분 백업은 사이드카 기록 전에 실패할 수 있으므로 함께 정리
+    for path in (archive_path, archive_index.index_path(archive_path), incremental_backup.sidecar_path(archive_path)):
+        path.unlink(missing_ok=True)
+
+def _backup_metrics(kind):
+    """결과 문자열(✅/❌)과 소요 시간을 메트릭으로 기록하고 단발 실행이면 .prom 파일 갱신"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.monotonic()
+            result = func(*args, **kwargs)
+            BACKUP_DURATION.observe(time.monotonic() - start, kind=kind)
+            BACKUPS.inc(kind=kind, status="FAIL" if result.startswith("❌") else "PASS")
+            metrics.write_after_run()
+            return result
+        return wrapper
+    return decorator
+
+# 사용자 정의 백업 생성 - 파일
+@_backup_metrics("file")
+@trace.traced("backup_file", cat="backup")
+def backup_file(file_path):
     CUSTOM_BACKUP_DIR.mkdir(exist_ok=True)
+    settings = load_restore_settings()
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     file_name = Path(file_path).name
@@ -43,41 +149,258 @@ def custom_backup():
     dest = CUSTOM_BACKUP_DIR / dest_name
 
     try:
-        shutil.copy(file_path, dest)
+        if use_dedup(settings):
+            dest = _dedup_backup(Path(file_path), dest_name, settings)
+        else:
+            # 복사 도중 실패해도 잘린 파일이 백업 목록에 남지 않도록 임시 이름으로 복사 후 이동
+            tmp = dest.with_name(f".{dest.name}.tmp")
+            try:
+                shutil.copy(file_path, tmp)
+                os.replace(tmp, dest)
+            finally:
+                tmp.unlink(missing_ok=True)
+        catalog_register(dest, source=Path(file_path).resolve())
+        _retention_after_backup(settings)
         return f"✅ 파일 백업 완료: {dest}"
     except Exception as e:
         return f"❌ 백업 실패: {e}"
-        
-def custom_directory_backup():
-    from tkinter import simpledialog
-    dir_path = simpledialog.askstring("디렉토리 경로 입력", "백업할 디렉토리 절대경로 입력 (예: /home/user/folder):")
-    if not dir_path:
-        return "❌ 입력 취소됨."
+
+# 사용자 정의 백업 생성 - 디렉토리
+@_backup_metrics("directory")
+@trace.traced("backup_directory", cat="backup")
+def backup_directory(dir_path):
     dir_path = Path(dir_path)
     if not dir_path.is_dir():
         return f"❌ 유효하지 않은 디렉토리 경로: {dir_path}"
 
     CUSTOM_BACKUP_DIR.mkdir(exist_ok=True)
+    settings = load_restore_settings()
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     archive_name = f"{timestamp}_{dir_path.name}.tar.gz"
     archive_path = CUSTOM_BACKUP_DIR / archive_name
     try:
-        shutil.make_archive(str(archive_path).replace(".tar.gz", ""), 'gztar', root_dir=dir_path)
+        if use_dedup(settings):
+            manifest_path = _dedup_backup(dir_path, f"{timestamp}_{dir_path.name}", settings)
+            catalog_register(manifest_path)
+            _retention_after_backup(settings)
+            return f"✅ 디렉토리 백업 완료: {manifest_path}"
+        if settings.get("incremental", False):
+            meta = incremental_backup.create_backup(
+                dir_path, archive_path,
+                previous=incremental_backup.find_previous(CUSTOM_BACKUP_DIR, dir_path),
+                synthetic_full_every=settings.get("synthetic_full_every", 7),
+                compression_level=settings.get("compression_level", 6),
+                workers=settings.get("compression_workers", os.cpu_count() or 1),
+            )
+            logger.info(f"[증분 백업] {archive_path} | 종류: {meta['kind']}, 변경 {meta['changed']}개, "
+                        f"삭제 {len(meta['deleted'])}개")
+            catalog_register(archive_path)
+            _retention_after_backup(settings)
+            return f"✅ 디렉토리 백업 완료 ({meta['kind']}): {archive_path}"
+        write_directory_archive(dir_path, archive_path, settings)
+        catalog_register(archive_path)
+        _retention_after_backup(settings)
         return f"✅ 디렉토리 백업 완료: {archive_path}"
     except Exception as e:
+        _remove_partial_archive(archive_path)
         return f"❌ 백업 실패: {e}"
 
+# 사용자 정의 백업 생성 - 다른 프로세스가 읽어 보낸 스트림 (원본 경로는 이름/카탈로그 기록에만 사용하고 열지 않음)
+@_backup_metrics("directory")
+@trace.traced("backup_directory_stream", cat="backup")
+def backup_directory_stream(stream, dir_path):
+    CUSTOM_BACKUP_DIR.mkdir(exist_ok=True)
+    settings = load_restore_settings()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    archive_path = CUSTOM_BACKUP_DIR / f"{timestamp}_{Path(dir_path).name}.tar.gz"
+    try:
+        with tarfile.open(fileobj=stream, mode="r|") as source, \
+                open_indexed_tar_gz(archive_path, source=dir_path, **compression_options(settings)) as tar:
+            for member in source:
+                if not _is_safe_member(member):
+                    raise ValueError(f"허용되지 않는 항목: {member.name}")
+                tar.addfile(member, source.extractfile(member) if member.isfile() else None)
+        catalog_register(archive_path)
+        _retention_after_backup(settings)
+        return f"✅ 디렉토리 백업 완료: {archive_path}"
+    except Exception as e:
+        _remove_partial_archive(archive_path)
+        return f"❌ 백업 실패: {e}"
 
-# 사용자 정의 백업 목록 확인
-def list_custom_backups():
+@_backup_metrics("file")
+@trace.traced("backup_file_stream", cat="backup")
+def backup_file_stream(stream, file_path):
+    CUSTOM_BACKUP_DIR.mkdir(exist_ok=True)
+    settings = load_restore_settings()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    dest = CUSTOM_BACKUP_DIR / f"{timestamp}_{Path(file_path).name}"
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(stream, f)
+        os.replace(tmp, dest)
+        catalog_register(dest, source=Path(file_path))
+        _retention_after_backup(settings)
+        return f"✅ 파일 백업 완료: {dest}"
+    except Exception as e:
+        tmp.unlink(missing_ok=True)
+        return f"❌ 백업 실패: {e}"
+
+# 사용자 정의 백업 생성 - 파일 선택
+def custom_backup():
+    from tkinter import filedialog
+    file_path = filedialog.askopenfilename(title="백업할 파일 선택")
+    if not file_path:
+        return "❌ 파일 선택이 취소됨."
+    return backup_file(file_path)
+
+def custom_directory_backup():
+    from tkinter import simpledialog
+    dir_path = simpledialog.askstring("디렉토리 경로 입력", "백업할 디렉토리 절대경로 입력 (예: /home/user/folder):")
+    if not dir_path:
+        return "❌ 입력 취소됨."
+    return backup_directory(dir_path)
+
+
+# 백업 카탈로그 (custom_backups/.catalog/catalog.sqlite)
+# 카탈로그 DB 의 저널 파일이 백업 디렉토리 mtime 을 바꾸지 않도록 하위 디렉토리에 둠
+def open_catalog():
+    catalog_dir = CUSTOM_BACKUP_DIR / CATALOG_DIR_NAME
+    catalog_dir.mkdir(parents=True, exist_ok=True)
+    return BackupCatalog(catalog_dir / "catalog.sqlite")
+
+def _is_backup_name(name):
+    # 숨김 항목(.store 등 내부 저장소)과 보조 파일은 목록에서 제외
+    return not name.startswith(".") and not name.endswith(SIDECAR_SUFFIXES)
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _join_member(source, rel):
+    return f"{source.rstrip('/')}/{rel[2:] if rel.startswith('./') else rel}" if source else rel
+
+def describe_backup(path: Path, source=None):
+    """카탈로그 행과 멤버 경로 목록 생성 (인덱스/사이드카/manifest 가 있으면 아카이브는 열지 않음)"""
+    path = Path(path)
+    st = path.stat()
+    record = {"name": path.name, "source": str(source) if source else None, "size": st.st_size,
+              "created": st.st_mtime, "kind": None, "checksum": None}
+
+    if path.name.endswith(MANIFEST_SUFFIX):
+        manifest = load_manifest(path)
+        record.update(format="dedup", kind=manifest["type"], source=manifest["source"],
+                      size=sum(e["size"] for e in manifest["files"]), checksum=_file_sha256(path))
+        if manifest["type"] == "file":
+            members = [manifest["source"]]
+        else:
+            members = [_join_member(manifest["source"], e["path"])
+                       for e in manifest["files"] + manifest["symlinks"]]
+
+    elif path.name.endswith(".tar.gz"):
+        meta = incremental_backup.load_sidecar(path)
+        index = archive_index.load_index(path)
+        record["checksum"] = index.get("checksum") if index else None
+        if meta is not None:
+            record.update(format="incremental", kind=meta["kind"], source=meta["source"],
+                          requires=sorted(incremental_backup.required_archives(meta) - {path.name}))
+            members = [_join_member(meta["source"], rel)
+                       for rel, entry in meta["entries"].items() if entry["type"] != "dir"]
+        else:
+            record["format"] = "tar.gz"
+            if index is not None:
+                record["source"] = index.get("source") or record["source"]
+                names = [name for name, _ in index["members"]]
+            else:
+                # 인덱스 없는 기존 아카이브: 등록 시 1회만 스캔
+                with tarfile.open(path, "r:gz") as tar:
+                    names = [m.name for m in tar if not m.isdir()]
+            members = [_join_member(record["source"], name) for name in names]
+        if record["checksum"] is None:
+            record["checksum"] = _file_sha256(path)
+
+    else:
+        record.update(format="gz" if path.suffix == ".gz" else "file", checksum=_file_sha256(path))
+        members = [record["source"]] if record["source"] else []
+
+    record["file_count"] = len(members)
+    return record, members
+
+def catalog_register(path: Path, source=None):
+    """새 백업을 카탈로그에 등록 (실패해도 백업 자체는 유지, 다음 목록 조회 때 동기화됨)"""
+    try:
+        record, members = describe_backup(path, source)
+        catalog = open_catalog()
+        try:
+            catalog.add(record, members)
+        finally:
+            catalog.close()
+        BACKUP_BYTES.inc(record["size"], format=record["format"])
+    except Exception as e:
+        logger.error(f"[카탈로그 등록 실패] {path} | 오류: {e}")
+
+def query_backups(offset=0, limit=None, name_filter=None, contains=None):
+    """
+    카탈로그 조회 -> (행 목록, 전체 개수)
+    백업 디렉토리가 바뀐 경우에만 디렉토리와 동기화 (외부에서 복사/삭제된 백업 반영)
+    """
     if not CUSTOM_BACKUP_DIR.exists():
-        return []
-    return sorted(CUSTOM_BACKUP_DIR.iterdir(), key=os.path.getmtime, reverse=True)
+        return [], 0
+    if contains:
+        contains = os.path.normpath(contains)
+    catalog = open_catalog()
+    try:
+        catalog.sync(str(CUSTOM_BACKUP_DIR), describe_backup, _is_backup_name)
+        rows = catalog.list(offset=offset, limit=limit, name_filter=name_filter, contains=contains)
+        total = catalog.count(name_filter=name_filter, contains=contains)
+    finally:
+        catalog.close()
+    return rows, total
+
+# 사용자 정의 백업 목록 확인 (최신순, 페이지/필터 지원)
+def list_custom_backups(offset=0, limit=None, name_filter=None, contains=None):
+    try:
+        rows, _ = query_backups(offset, limit, name_filter, contains)
+        return [CUSTOM_BACKUP_DIR / row["name"] for row in rows]
+    except Exception as e:
+        logger.error(f"[카탈로그 조회 실패] 디렉토리 스캔으로 대체 | 오류: {e}")
+        if not CUSTOM_BACKUP_DIR.exists():
+            return []
+        backups = [p for p in CUSTOM_BACKUP_DIR.iterdir() if _is_backup_name(p.name)]
+        if name_filter:
+            backups = [p for p in backups if name_filter in p.name]
+        backups = sorted(backups, key=os.path.getmtime, reverse=True)
+        return backups[offset:offset + limit if limit is not None else None]
+
+# 특정 경로가 들어 있는 백업 목록
+def find_backups_containing(path):
+    return list_custom_backups(contains=path)
 
 # 사용자 정의 복원
+def _record_restore(status):
+    RESTORES.inc(status=status)
+    metrics.write_after_run()
+
+@trace.traced("restore_custom_backup", cat="restore")
 def restore_custom_backup(file_path: Path, restore_dest: str) -> bool:
     try:
-        if file_path.suffix == ".gz" and not file_path.name.endswith(".tar.gz"):
+        if file_path.name.endswith(MANIFEST_SUFFIX):
+            # 중복 제거 백업 복원: 다른 형식과 같이 날짜포함 이름 유지
+            base_name = file_path.name[:-len(MANIFEST_SUFFIX)]
+            store = open_chunk_store()
+            try:
+                manifest_type = load_manifest(file_path)["type"]
+                if manifest_type == "directory":
+                    store.restore(file_path, os.path.join(restore_dest, base_name))
+                else:
+                    store.restore(file_path, restore_dest, file_name=base_name)
+            finally:
+                store.close()
+
+        elif file_path.suffix == ".gz" and not file_path.name.endswith(".tar.gz"):
             # .gz 파일 복원: 압축 해제 후 날짜포함 이름 유지
             restored_name = file_path.name.replace(".gz", "")
             restored_path = os.path.join(restore_dest, restored_name)
@@ -89,27 +412,161 @@ def restore_custom_backup(file_path: Path, restore_dest: str) -> bool:
             base_name = file_path.name.replace(".tar.gz", "")
             full_restore_path = os.path.join(restore_dest, base_name)
             os.makedirs(full_restore_path, exist_ok=True)
-            shutil.unpack_archive(str(file_path), extract_dir=full_restore_path, format='gztar')
+            meta = incremental_backup.load_sidecar(file_path)
+            if meta is not None:
+                # 증분 백업: 해당 시점에 필요한 아카이브만 겹쳐서 복원
+                incremental_backup.restore_backup(file_path, full_restore_path, meta)
+            else:
+                shutil.unpack_archive(str(file_path), extract_dir=full_restore_path, format='gztar')
 
         else:
             # 일반 파일 복원
             shutil.copy(str(file_path), os.path.join(restore_dest, file_path.name))
 
+        _record_restore("PASS")
         return True
     except Exception as e:
         logger.error(f"[복원 실패] {file_path} -> {restore_dest} | 오류: {e}")
+        _record_restore("FAIL")
         return False
 
 
+# 사용자 정의 부분 복원 - 아카이브에서 지정한 경로/패턴의 멤버만 추출
+def restore_custom_backup_members(file_path: Path, patterns, restore_dest: str):
+    try:
+        if not file_path.name.endswith(".tar.gz"):
+            logger.error(f"[부분 복원 실패] tar.gz 백업만 지원: {file_path}")
+            return []
+        base_name = file_path.name.replace(".tar.gz", "")
+        full_restore_path = os.path.join(restore_dest, base_name)
+
+        meta = incremental_backup.load_sidecar(file_path)
+        if meta is None:
+            restored = archive_index.extract_members(file_path, patterns, full_restore_path)
+        else:
+            # 증분 백업: 멤버별로 실제 데이터가 담긴 아카이브에서 추출
+            names = [rel for rel, entry in meta["entries"].items() if entry["type"] != "dir"]
+            by_archive = {}
+            for rel in archive_index.match_members(names, patterns):
+                by_archive.setdefault(meta["entries"][rel]["archive"], []).append(rel)
+            restored = []
+            for origin, members in by_archive.items():
+                restored += archive_index.extract_members(file_path.parent / origin, members, full_restore_path)
+
+        logger.info(f"[부분 복원] {file_path} -> {full_restore_path} | {len(restored)}개 항목")
+        return restored
+    except Exception as e:
+        logger.error(f"[부분 복원 실패] {file_path} -> {restore_dest} | 오류: {e}")
+        return []
+
+# 증분 백업 체인에서 이 아카이브를 필요로 하는 다른 백업 목록
+def _archive_dependents(file_path: Path):
+    dependents = []
+    for meta_path in file_path.parent.glob(f"*{SIDECAR_SUFFIX}"):
+        archive = meta_path.with_name(meta_path.name[:-len(SIDECAR_SUFFIX)])
+        if archive == file_path:
+            continue
+        meta = incremental_backup.load_sidecar(archive)
+        if meta and file_path.name in incremental_backup.required_archives(meta):
+            dependents.append(archive.name)
+    return dependents
+
 # 사용자 정의 삭제
 def delete_custom_backup(file_path: Path) -> bool:
     try:
-        file_path.unlink()
+        if file_path.name.endswith(MANIFEST_SUFFIX):
+            # 참조가 없어진 청크까지 함께 정리
+            store = open_chunk_store()
+            try:
+                result = store.delete(file_path)
+            finally:
+                store.close()
+            logger.info(f"[삭제] {file_path} | 청크 {result['chunks_removed']}개, {result['bytes_freed']} bytes 회수")
+        else:
+            dependents = _archive_dependents(file_path)
+            if dependents:
+                logger.error(f"[삭제 실패] {file_path} | 다른 증분 백업이 참조 중: {', '.join(dependents)}")
+                return False
+            file_path.unlink()
+            incremental_backup.sidecar_path(file_path).unlink(missing_ok=True)
+            archive_index.index_path(file_path).unlink(missing_ok=True)
+        catalog = open_catalog()
+        try:
+            catalog.remove([file_path.name])
+        finally:
+            catalog.close()
         return True
     except Exception as e:
         logger.error(f"[삭제 실패] {file_path} | 오류: {e}")
         return False
 
+# 여러 백업 일괄 삭제 (중복 제거 청크 정리 1회, 카탈로그 갱신 1회)
+def delete_backups(names):
+    deleted, freed = [], 0
+    manifests = [CUSTOM_BACKUP_DIR / n for n in names
+                 if n.endswith(MANIFEST_SUFFIX) and (CUSTOM_BACKUP_DIR / n).exists()]
+    if manifests:
+        store = open_chunk_store()
+        try:
+            result = store.delete_many(manifests)
+        finally:
+            store.close()
+        freed += result["bytes_freed"]
+        deleted += [p.name for p in manifests]
+
+    for name in names:
+        if name.endswith(MANIFEST_SUFFIX):
+            continue
+        file_path = CUSTOM_BACKUP_DIR / name
+        try:
+            for path in (file_path, incremental_backup.sidecar_path(file_path), archive_index.index_path(file_path)):
+                try:
+                    freed += path.stat().st_size
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            deleted.append(name)
+        except OSError as e:
+            logger.error(f"[삭제 실패] {file_path} | 오류: {e}")
+
+    catalog = open_catalog()
+    try:
+        catalog.remove(deleted)
+    finally:
+        catalog.close()
+    return {"deleted": deleted, "bytes_reclaimed": freed}
+
+# 보존 정책 적용 (restore_cycle_days, restore_points, gfs_retention)
+def apply_retention(settings=None, now=None):
+    settings = settings if settings is not None else load_restore_settings()
+    max_age_days = settings.get("restore_cycle_days") or None
+    keep_last = settings.get("restore_points") or None
+    gfs = settings.get("gfs_retention") or {}
+    if max_age_days is None and keep_last is None and not any(gfs.values()):
+        return {"deleted": [], "pinned": [], "bytes_reclaimed": 0}
+
+    rows, _ = query_backups()
+    catalog = open_catalog()
+    try:
+        dependencies = catalog.dependencies()
+    finally:
+        catalog.close()
+    plan = plan_retention(rows, now if now is not None else time.time(), max_age_days, keep_last, gfs, dependencies)
+
+    result = delete_backups([row["name"] for row in plan["delete"]])
+    result["pinned"] = sorted(plan["pinned"])
+    RETENTION_DELETED.inc(len(result["deleted"]))
+    RETENTION_BYTES.inc(result["bytes_reclaimed"])
+    logger.info(f"[보존 정책] 삭제 {len(result['deleted'])}개, 의존성 보존 {len(result['pinned'])}개, "
+                f"{result['bytes_reclaimed']} bytes 회수")
+    return result
+
+def _retention_after_backup(settings):
+    try:
+        apply_retention(settings)
+    except Exception as e:
+        logger.error(f"[보존 정책 실패] 오류: {e}")
+
 # Timeshift 스냅샷 생성
 def create_timeshift_snapshot():
     try:
@@ -0,0 +1,341 @@
+import ast
+import asyncio
+import functools
+import json
+import os
+import random
+import signal
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+import psutil
+from src.utils.logger import get_logger, set_process
+from src.utils.config import ConfigLoader
+from src.utils.cron import IntervalTrigger, make_trigger
+from src.utils.cleanup import run_cleanup
+from src.memory_monitor import DEFAULTS as PRESSURE_DEFAULTS, MemoryPressureMonitor, reclaim_if_needed
+from src.utils import metrics
+
+logger = get_logger(__name__)
+
+DEFAULT_STATE_PATH = "cache/scheduler_state.json"
+# 작업 종류별 동시 실행 개수 (지정하지 않은 종류는 1)
+DEFAULT_CLASS_LIMITS = {"backup": 1, "maintenance": 2, "cleanup": 1}
+DEFAULT_JITTER_SECONDS = 30
+
+JOB_RUNS = metrics.counter("scheduler_job_runs_total", "Scheduled job runs by result", ("task", "status"))
+JOB_DURATION = metrics.histogram("scheduler_job_duration_seconds", "Scheduled job wall time", ("task",))
+ZOMBIES = metrics.gauge("zombie_processes", "Zombie processes seen at the last check")
+# 시계 변경/절전 복귀를 반영하기 위해 최대 이 간격마다 다음 실행 시각을 다시 계산
+MAX_SLEEP_SECONDS = 300
+
+
+class Job:
+    def __init__(self, name, trigger, func, job_class="maintenance", jitter=0, catch_up=True):
+        self.name = name
+        self.trigger = trigger
+        self.func = func
+        self.job_class = job_class
+        self.jitter = jitter
+        self.catch_up = catch_up
+
+    def __repr__(self):
+        return f"Job({self.name!r}, {self.trigger!r}, class={self.job_class!r})"
+
+
+class Scheduler:
+    """
+    상주형 asyncio 작업 스케줄러
+    - 타이머 1개로 가장 가까운 실행 시각까지 대기 (작업마다 프로세스를 띄우지 않음)
+    - 작업 함수는 스레드에서 실행, 작업 종류별 세마포어로 동시 실행 수 제한
+    - 놓친 실행은 여러 번 대신 1회로 합쳐 실행, 이전 실행이 끝나지 않았으면 이번 실행은 건너뜀
+    - 작업별 마지막 실행 시각/결과를 state 파일에 저장해 재시작 후에도 유지
+    """
+
+    def __init__(self, jobs, state_path=DEFAULT_STATE_PATH, class_limits=None, clock=datetime.now):
+        self.jobs = list(jobs)
+        self.state_path = Path(state_path)
+        self.class_limits = dict(DEFAULT_CLASS_LIMITS, **(class_limits or {}))
+        self._clock = clock
+        self.state = self._load_state()
+        self.next_due = {}
+        self._running = {}
+        self._semaphores = {}
+        self._stop = None
+        self._wakeup = None
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(f".{self.state_path.name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def _schedule(self, job, after):
+        due = job.trigger.next_after(after)
+        if job.jitter:
+            due += timedelta(seconds=random.uniform(0, job.jitter))
+        return due
+
+    def _initial_due(self, job, now):
+        last_run = self.state.get(job.name, {}).get("last_run")
+        if last_run is None:
+            return self._schedule(job, now)
+        missed = job.trigger.next_after(datetime.fromisoformat(last_run))
+        if missed > now:
+            return missed
+        if job.catch_up:
+            logger.info(f"[스케줄러] {job.name} | 중지 중 놓친 실행을 1회로 합쳐 실행")
+            return now
+        return self._schedule(job, now)
+
+    def plan(self):
+        """작업별 다음 실행 시각 (state 기준)"""
+        now = self._clock()
+        return {job.name: self._initial_due(job, now) for job in self.jobs}
+
+    async def _run_job(self, job):
+        limit = self.class_limits.get(job.job_class, 1)
+        semaphore = self._semaphores.setdefault(job.job_class, asyncio.Semaphore(limit))
+        async with semaphore:
+            started = self._clock()
+            start = time.monotonic()
+            try:
+                status = await asyncio.to_thread(job.func) or "PASS"
+            except Exception as e:
+                logger.error(f"[FAIL] 예약 작업 {job.name} | 오류: {e}")
+                status = "FAIL"
+            duration = time.monotonic() - start
+            JOB_RUNS.inc(task=job.name, status=status)
+            JOB_DURATION.observe(duration, task=job.name)
+            self.state[job.name] = {"last_run": started.isoformat(timespec="seconds"),
+                                    "status": status, "duration_seconds": round(duration, 3)}
+            self._save_state()
+            logger.info(f"[{status}] 예약 작업 {job.name} ({duration:.2f}s)")
+
+    def _launch_due(self):
+        now = self._clock()
+        for job in self.jobs:
+            if self.next_due[job.name] > now:
+                continue
+            # 다음 실행은 현재 시각 기준으로 계산 (밀린 실행은 쌓지 않음)
+            self.next_due[job.name] = self._schedule(job, now)
+            if job.name in self._running:
+                logger.warning(f"[SKIP] 예약 작업 {job.name} | 이전 실행이 아직 진행 중")
+                continue
+            task = asyncio.create_task(self._run_job(job), name=f"job-{job.name}")
+            self._running[job.name] = task
+            task.add_done_callback(lambda _, name=job.name: self._running.pop(name, None))
+
+    async def run(self):
+        self._stop = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self.next_due = self.plan()
+        logger.info(f"[스케줄러] 시작 | 작업 {len(self.jobs)}개")
+        while not self._stop.is_set():
+            self._launch_due()
+            if not self.next_due:
+                delay = MAX_SLEEP_SECONDS
+            else:
+                delay = (min(self.next_due.values()) - self._clock()).total_seconds()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(max(delay, 0), MAX_SLEEP_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+        logger.info("[스케줄러] 종료")
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._wakeup.set()
+
+    def replace_jobs(self, jobs):
+        """설정 변경 시 작업 목록 교체 (일정이 같은 작업은 다음 실행 시각 유지, 실행 중인 작업은 그대로 완료)"""
+        old = {job.name: job for job in self.jobs}
+        self.jobs = list(jobs)
+        now = self._clock()
+        next_due = {}
+        for job in self.jobs:
+            previous = old.get(job.name)
+            if previous is not None and str(previous.trigger) == str(job.trigger) and job.name in self.next_due:
+                next_due[job.name] = self.next_due[job.name]
+            else:
+                next_due[job.name] = self._initial_due(job, now)
+        self.next_due = next_due
+        logger.info(f"[스케줄러] 설정 변경 반영 | 작업 {len(self.jobs)}개")
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+
+# ── 기본 제공 작업 ──
+
+def backup_job(config):
+    """restore_settings.custom_backup.paths 의 파일/디렉토리 백업 (백업 후 보존 정책 자동 적용)"""
+    from src.restore import backup_directory, backup_file
+    failed = False
+    for path in config.get("restore_settings", {}).get("custom_backup", {}).get("paths", []):
+        if os.path.isdir(path):
+            result = backup_directory(path)
+        elif os.path.isfile(path):
+            result = backup_file(path)
+        else:
+            logger.warning(f"[SKIP] 자동 백업 | 경로 없음: {path}")
+            continue
+        logger.info(f"자동 백업 | {result}")
+        failed = failed or result.startswith("❌")
+    return "FAIL" if failed else "PASS"
+
+
+def zombie_check_job(config):
+    """좀비 프로세스를 기록하고 부모에게 SIGCHLD 를 보내 회수를 유도 (부모를 강제 종료하지 않음)"""
+    parents = set()
+    zombies = 0
+    for proc in psutil.process_iter(["pid", "ppid", "name", "status"]):
+        if proc.info["status"] == psutil.STATUS_ZOMBIE:
+            logger.warning(f"⚠️ 좀비 프로세스: {proc.info}")
+            parents.add(proc.info["ppid"])
+            zombies += 1
+    ZOMBIES.set(zombies)
+    for ppid in parents - {0, 1}:
+        try:
+            os.kill(ppid, signal.SIGCHLD)
+        except OSError as e:
+            logger.error(f"[FAIL] SIGCHLD -> {ppid} | 오류: {e}")
+    return "PASS"
+
+
+# 스케줄러 프로세스 안에서 회수 단계/cooldown 을 이어가도록 하나만 사용
+_pressure_monitor = None
+
+
+def drop_caches_job(config):
+    """예약 회수: 주기마다 무조건 캐시를 비우지 않고 메모리 정체가 있을 때만 단계적으로 개입"""
+    global _pressure_monitor
+    mem_config = config.get("memory_optimization", {})
+    if not mem_config.get("drop_caches_on_schedule"):
+        return "SKIP"
+    monitor_cfg = mem_config.get("pressure_monitor", {})
+    if _pressure_monitor is None:
+        _pressure_monitor = MemoryPressureMonitor(monitor_cfg)
+    _pressure_monitor.cfg = dict(PRESSURE_DEFAULTS, **monitor_cfg)
+    action = reclaim_if_needed(mem_config, monitor=_pressure_monitor, label="예약 메모리 회수")
+    if action is None:
+        return "PASS"
+    return "PASS" if all(r["status"] in ("changed", "unchanged") for r in action["results"]) else "FAIL"
+
+
+def cleanup_job(config):
+    cleanup_cfg = config.get("disk_optimization", {}).get("unified_cleanup", {})
+    if not cleanup_cfg.get("enable"):
+        return "SKIP"
+    stats = run_cleanup(cleanup_cfg)
+    logger.info(f"예약 정리 | 파일 {stats['files_deleted']}개, 디렉토리 {stats['dirs_deleted']}개 삭제, "
+                f"{stats['bytes_reclaimed']} bytes 회수")
+    return "FAIL" if stats["errors"] else "PASS"
+
+
+def command_job(command):
+    from src.optimizer import run_command
+    return "PASS" if run_command(command) else "FAIL"
+
+
+# 작업 이름 -> (함수, 종류). 목록에 없는 이름은 command 를 셸로 실행
+BUILTIN_JOBS = {
+    "backup": (backup_job, "backup"),
+    "zombie_checker": (zombie_check_job, "maintenance"),
+    "memory_cache_cleaner": (drop_caches_job, "maintenance"),
+    "unified_cleanup": (cleanup_job, "cleanup"),
+}
+
+
+def _task_dict(task):
+    # 설정 GUI 가 저장한 문자열 형태 작업도 허용
+    return ast.literal_eval(task) if isinstance(task, str) else task
+
+
+def build_jobs(config):
+    automation = config.get("automation", {})
+    sched_cfg = automation.get("scheduler", {})
+    default_jitter = sched_cfg.get("jitter_seconds", DEFAULT_JITTER_SECONDS)
+    default_catch_up = sched_cfg.get("catch_up_missed", True)
+
+    jobs = {}
+    restore_settings = config.get("restore_settings", {})
+    if restore_settings.get("auto_backup"):
+        hours = restore_settings.get("backup_interval_hours", 24)
+        jobs["backup"] = Job("backup", IntervalTrigger(hours * 3600), functools.partial(backup_job, config),
+                             job_class="backup", jitter=default_jitter, catch_up=default_catch_up)
+
+    for raw in automation.get("scheduled_tasks", []):
+        task = _task_dict(raw)
+        name = task["name"]
+        func, job_class = BUILTIN_JOBS.get(task.get("job", name), (None, "command"))
+        if func is not None:
+            func = functools.partial(func, config)
+        elif task.get("command"):
+            func = functools.partial(command_job, task["command"])
+        else:
+            logger.error(f"[스케줄러] {name} | 알 수 없는 작업이며 command 도 없음")
+            continue
+        jobs[name] = Job(name, make_trigger(task["schedule"]), func,
+                         job_class=task.get("class", job_class),
+                         jitter=task.get("jitter_seconds", default_jitter),
+                         catch_up=task.get("catch_up", default_catch_up))
+    return list(jobs.values())
+
+
+def create_scheduler(config):
+    sched_cfg = config.get("automation", {}).get("scheduler", {})
+    return Scheduler(build_jobs(config),
+                     state_path=sched_cfg.get("state_path", DEFAULT_STATE_PATH),
+                     class_limits=sched_cfg.get("class_limits"))
+
+
+def run_scheduler(config_path="config/optimizer_settings.json"):
+    """SIGTERM/SIGINT 를 받을 때까지 실행 (설정 파일이 바뀌면 재시작 없이 작업 목록 갱신)"""
+    config_loader = ConfigLoader(config_path)
+    config_loader.load_config()
+    scheduler = create_scheduler(config_loader.get_config())
+    metrics.set_job("scheduler")
+    set_process("scheduler")
+    stop_metrics = metrics.start_periodic()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, scheduler.stop)
+
+        def on_config_change(config):
+            # watch 스레드에서 호출되므로 이벤트 루프 스레드로 넘겨서 교체
+            try:
+                jobs = build_jobs(config)
+            except Exception as e:
+                logger.error(f"[스케줄러] 변경된 설정 적용 실패, 기존 작업 유지 | 오류: {e}")
+                return
+            loop.call_soon_threadsafe(scheduler.replace_jobs, jobs)
+
+        unsubscribe = config_loader.store.subscribe(on_config_change)
+        config_loader.store.watch()
+        try:
+            await scheduler.run()
+        finally:
+            unsubscribe()
+
+    try:
+        asyncio.run(main())
+    finally:
+        stop_metrics()
+
+
+if __name__ == "__main__":
+    run_scheduler()
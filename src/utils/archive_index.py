@@ -0,0 +1,188 @@
+import bisect
+import fnmatch
+import json
+import os
+import tarfile
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from src.utils.pgzip import ParallelGzipWriter
+from src.utils import trace
+
+INDEX_SUFFIX = ".idx.json"
+READ_CHUNK = 64 * 1024
+
+# tarfile 추출 필터 (지원되는 버전에서만 사용)
+_EXTRACT_KWARGS = {"filter": "tar"} if hasattr(tarfile, "tar_filter") else {}
+
+
+def index_path(archive_path):
+    archive_path = Path(archive_path)
+    return archive_path.with_name(archive_path.name + INDEX_SUFFIX)
+
+
+def load_index(archive_path):
+    path = index_path(archive_path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class _IndexingTarFile(tarfile.TarFile):
+    """멤버마다 헤더 시작 위치(비압축 스트림 기준)를 기록하는 TarFile"""
+
+    def __init__(self, *args, **kwargs):
+        self.member_offsets = []
+        super().__init__(*args, **kwargs)
+
+    def addfile(self, tarinfo, fileobj=None):
+        offset = self.offset
+        super().addfile(tarinfo, fileobj)
+        self.member_offsets.append([tarinfo.name, offset])
+
+
+@contextmanager
+def open_indexed_tar_gz(path, level=6, workers=None, source=None):
+    """
+    병렬 gzip tar 아카이브를 기록하고 닫을 때 멤버 위치 인덱스(<archive>.idx.json)를 함께 저장
+    인덱스에는 원본 경로와 아카이브 sha256 도 기록 (백업 카탈로그 등록용)
+    숨김 임시 파일에 기록한 뒤 성공했을 때만 제자리로 옮김 (도중에 실패하면 잘린 아카이브가 백업 목록에 남지 않음)
+    """
+    path = Path(path)
+    partial = path.with_name(f".{path.name}.tmp")
+    try:
+        with trace.span("compress", cat="compress", path=str(path)), \
+                ParallelGzipWriter(partial, level=level, workers=workers) as gz:
+            with _IndexingTarFile(fileobj=gz, mode="w") as tar:
+                yield tar
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    index = {"version": 1, "source": str(source) if source is not None else None, "checksum": gz.checksum,
+             "blocks": gz.blocks, "members": tar.member_offsets}
+    target = index_path(path)
+    tmp = target.with_name(f".{target.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp, target)
+
+
+class SeekableGzipReader:
+    """
+    독립 gzip 멤버(블록) 시작점 목록을 이용해 원하는 위치부터 바로 해제하는 읽기 전용 파일 객체
+    seek 는 해당 블록 시작점으로 이동한 뒤 블록 내부 오프셋만큼만 해제
+    """
+
+    def __init__(self, path, blocks):
+        self._file = open(path, "rb")
+        self._uoffsets = [b[0] for b in blocks]
+        self._coffsets = [b[1] for b in blocks]
+        self._pos = 0
+        self._reset(0)
+
+    def _reset(self, block):
+        self._file.seek(self._coffsets[block] if self._coffsets else 0)
+        self._decomp = zlib.decompressobj(31)
+        self._pending = b""   # 해제 대기 중인 압축 데이터
+        self._out = b""       # 해제됐지만 아직 읽지 않은 데이터
+        self._pos = self._uoffsets[block] if self._uoffsets else 0
+
+    def _fill(self, size):
+        while len(self._out) < size:
+            if self._decomp.eof:
+                # 다음 gzip 멤버로 이어서 해제
+                self._pending = self._decomp.unused_data + self._pending
+                self._decomp = zlib.decompressobj(31)
+            if not self._pending:
+                self._pending = self._file.read(READ_CHUNK)
+                if not self._pending:
+                    break
+            want = max(size - len(self._out), READ_CHUNK)
+            self._out += self._decomp.decompress(self._pending, want)
+            self._pending = self._decomp.unconsumed_tail
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunks = []
+            while True:
+                chunk = self.read(1024 * 1024)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+        self._fill(size)
+        data, self._out = self._out[:size], self._out[size:]
+        self._pos += len(data)
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence != os.SEEK_SET:
+            raise OSError("SEEK_END 는 지원하지 않음")
+        block = max(0, bisect.bisect_right(self._uoffsets, offset) - 1)
+        block_start = self._uoffsets[block] if self._uoffsets else 0
+        # 같은 블록 안에서 앞으로 이동할 때만 이어서 읽고, 그 외에는 블록 시작점부터 해제
+        if not block_start <= self._pos <= offset:
+            self._reset(block)
+        while self._pos < offset:
+            if not self.read(min(offset - self._pos, 1024 * 1024)):
+                break
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        self._file.close()
+
+
+def match_members(names, patterns):
+    """경로 그대로/하위 경로/글롭 패턴으로 멤버 이름 필터링"""
+    cleaned = [p.strip().lstrip("/").rstrip("/") for p in patterns if p.strip()]
+    selected = []
+    for name in names:
+        plain = name[2:] if name.startswith("./") else name
+        for pattern in cleaned:
+            if plain == pattern or plain.startswith(pattern + "/") or fnmatch.fnmatchcase(plain, pattern):
+                selected.append(name)
+                break
+    return selected
+
+
+def extract_members(archive_path, patterns, dest):
+    """
+    인덱스로 필요한 멤버 위치에 바로 이동해 해당 멤버만 추출
+    인덱스가 없는 기존 아카이브는 순차 스캔으로 대체
+    """
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    index = load_index(archive_path)
+    extracted = []
+
+    if index is None:
+        with tarfile.open(archive_path, "r:gz") as tar:
+            for member in tar:
+                if match_members([member.name], patterns):
+                    tar.extract(member, path=dest, **_EXTRACT_KWARGS)
+                    extracted.append(member.name)
+        return extracted
+
+    offsets = dict((name, offset) for name, offset in index["members"])
+    wanted = match_members([name for name, _ in index["members"]], patterns)
+    reader = SeekableGzipReader(archive_path, index["blocks"])
+    try:
+        tar = tarfile.TarFile(fileobj=reader, mode="r")
+        tar.firstmember = None
+        for name in sorted(wanted, key=offsets.get):
+            reader.seek(offsets[name])
+            tar.offset = offsets[name]
+            member = tar.next()
+            if member is None:
+                continue
+            tar.extract(member, path=dest, **_EXTRACT_KWARGS)
+            extracted.append(member.name)
+    finally:
+        reader.close()
+    return extracted
@@ -0,0 +1,204 @@
+import fnmatch
+import os
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.tunables import parse_choices, write_tunables
+from src.utils.fsroot import host_path
+
+SYS_BLOCK = "/sys/block"
+SYS_DEV_BLOCK = "/sys/dev/block"
+
+# 장치 종류별 기본 프로필 (적용 순서 = 키 순서, 스케줄러 변경 시 nr_requests 가 초기화되므로 스케줄러 먼저)
+DEFAULT_PROFILES = {
+    "rotational": {"scheduler": "mq-deadline", "read_ahead_kb": 1024, "nr_requests": 256,
+                   "rq_affinity": 1, "nomerges": 0},
+    "ssd": {"scheduler": "mq-deadline", "read_ahead_kb": 128, "rq_affinity": 1, "nomerges": 0},
+    "nvme": {"scheduler": "none", "read_ahead_kb": 128, "rq_affinity": 2, "nomerges": 0},
+    # dm/md: 스케줄링은 하위 장치가 담당, read_ahead_kb 는 하위 장치 종류의 프로필 값을 사용
+    "stacked": {"scheduler": "none"},
+    # loop/ram/zram: 메모리나 파일 위의 장치라 스케줄러만 끔
+    "virtual": {"scheduler": "none"},
+}
+QUEUE_ATTRS = ("scheduler", "read_ahead_kb", "nr_requests", "rq_affinity", "nomerges")
+
+# 구버전(single-queue) 이름과 blk-mq 이름 호환
+SCHEDULER_ALIASES = {
+    "deadline": ["mq-deadline"],
+    "mq-deadline": ["deadline"],
+    "noop": ["none"],
+    "none": ["noop"],
+    "cfq": ["bfq"],
+}
+
+VIRTUAL_PREFIXES = ("loop", "ram", "zram")
+STACKED_PREFIXES = ("dm-", "md")
+# 하위 장치 종류가 섞인 dm/md 는 가장 느린 장치 기준 (rotational 의 큰 read-ahead 가 유리)
+BACKING_PRIORITY = ("rotational", "ssd", "nvme")
+
+
+def _read(path, default=None):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def slave_disks(name, sys_block=SYS_BLOCK):
+    """dm/md 장치의 하위 디스크 이름 목록 (파티션은 상위 디스크로)"""
+    slaves = os.path.join(host_path(sys_block), name, "slaves")
+    disks = []
+    for slave in sorted(os.listdir(slaves)) if os.path.isdir(slaves) else []:
+        node = os.path.realpath(os.path.join(slaves, slave))
+        if os.path.exists(os.path.join(node, "partition")):
+            node = os.path.dirname(node)
+        disks.append(os.path.basename(node))
+    return disks
+
+
+def is_stacked(name, sys_block=SYS_BLOCK):
+    return name.startswith(STACKED_PREFIXES) or bool(slave_disks(name, sys_block))
+
+
+def backing_class(name, sys_block=SYS_BLOCK, _seen=None):
+    """dm/md 를 따라 내려가 실제 디스크 종류를 반환 (찾지 못하면 None)"""
+    seen = _seen if _seen is not None else set()
+    classes = set()
+    for disk in slave_disks(name, sys_block):
+        if disk in seen:
+            continue
+        seen.add(disk)
+        if is_stacked(disk, sys_block):
+            classes.add(backing_class(disk, sys_block, seen))
+        else:
+            classes.add(classify(disk, sys_block))
+    return next((c for c in BACKING_PRIORITY if c in classes), None)
+
+
+def classify(name, sys_block=SYS_BLOCK):
+    base = os.path.join(host_path(sys_block), name)
+    if name.startswith(VIRTUAL_PREFIXES):
+        return "virtual"
+    if is_stacked(name, sys_block):
+        return "stacked"
+    if not os.path.exists(os.path.join(base, "device")):
+        return "virtual"
+    if name.startswith("nvme"):
+        return "nvme"
+    if _read(os.path.join(base, "queue", "rotational")) == "1":
+        return "rotational"
+    return "ssd"
+
+
+def discover_devices(sys_block=SYS_BLOCK):
+    """/sys/block 의 전체 디스크 목록 (크기 0 인 빈 loop/광학 드라이브 제외)"""
+    devices = []
+    sys_block = host_path(sys_block)
+    for name in sorted(os.listdir(sys_block)):
+        base = os.path.join(sys_block, name)
+        if _read(os.path.join(base, "size"), "0") == "0":
+            continue
+        device = {"name": name, "class": classify(name, sys_block), "queue": os.path.join(base, "queue")}
+        if device["class"] == "stacked":
+            device["backing"] = backing_class(name, sys_block)
+        devices.append(device)
+    return devices
+
+
+def devices_for_path(path, sys_dev_block=SYS_DEV_BLOCK):
+    """경로가 위치한 디스크 이름 집합 (파티션은 상위 디스크로, dm/md 는 하위 장치까지 포함)"""
+    st_dev = os.stat(path).st_dev
+    start = os.path.realpath(os.path.join(host_path(sys_dev_block), f"{os.major(st_dev)}:{os.minor(st_dev)}"))
+    names, stack = set(), [start]
+    while stack:
+        node = stack.pop()
+        if not os.path.isdir(node):
+            continue
+        if os.path.exists(os.path.join(node, "partition")):
+            node = os.path.dirname(node)
+        names.add(os.path.basename(node))
+        slaves = os.path.join(node, "slaves")
+        if os.path.isdir(slaves):
+            stack += [os.path.realpath(os.path.join(slaves, s)) for s in os.listdir(slaves)]
+    return names
+
+
+def resolve_scheduler(wanted, choices):
+    """커널이 제공하는 스케줄러 중 wanted 또는 호환 이름을 반환 (없으면 None)"""
+    for candidate in [wanted] + SCHEDULER_ALIASES.get(wanted, []):
+        if candidate in choices:
+            return candidate
+    return None
+
+
+def build_device_settings(device, io_config, path_devices=None):
+    """
+    종류별 프로필 < 전역 scheduler/read_ahead_kb < devices(글롭, 정확한 이름 순) < paths 순으로 병합
+    dm/md(stacked) 는 하위 장치 종류 프로필의 read_ahead_kb 를 물려받고 전역 scheduler 는 적용하지 않음
+    """
+    profiles = dict(DEFAULT_PROFILES, **io_config.get("profiles", {}))
+    settings = dict(profiles.get(device["class"], {}))
+    if device["class"] == "stacked" and "read_ahead_kb" in profiles.get(device.get("backing"), {}):
+        settings["read_ahead_kb"] = profiles[device["backing"]]["read_ahead_kb"]
+    for key in ("scheduler", "read_ahead_kb"):
+        if key not in io_config or device["class"] == "virtual":
+            continue
+        if key == "scheduler" and device["class"] == "stacked":
+            continue
+        settings[key] = io_config[key]
+
+    overrides = io_config.get("devices", {})
+    for pattern, override in overrides.items():
+        if pattern != device["name"] and fnmatch.fnmatchcase(device["name"], pattern):
+            settings.update(override)
+    settings.update(overrides.get(device["name"], {}))
+    for path, override in io_config.get("paths", {}).items():
+        if device["name"] in (path_devices or {}).get(path, ()):
+            settings.update(override)
+    return settings
+
+
+def device_tunables(device, settings):
+    """장치 설정을 write_tunables 입력으로 변환 (장치가 지원하지 않는 항목은 제외, 사유 목록 반환)"""
+    values, skipped = [], []
+    for attr in QUEUE_ATTRS:
+        if settings.get(attr) is None:
+            continue
+        path = os.path.join(device["queue"], attr)
+        if not os.path.exists(path):
+            skipped.append(f"{attr}: 미지원")
+            continue
+        value = settings[attr]
+        if attr == "scheduler":
+            choices = parse_choices(_read(path, ""))
+            value = resolve_scheduler(str(value), choices)
+            if value is None:
+                skipped.append(f"scheduler {settings[attr]}: 사용 불가 ({' '.join(choices)})")
+                continue
+        values.append((path, value))
+    return values, skipped
+
+
+def apply_io_profiles(io_config, dry_run=False, sys_block=SYS_BLOCK):
+    """
+    모든 블록 장치에 프로필을 병렬 적용
+    반환: [{"device", "class", "backing", "results", "skipped"}]
+    """
+    exclude = io_config.get("exclude", [])
+    devices = [d for d in discover_devices(sys_block)
+               if not any(fnmatch.fnmatchcase(d["name"], pattern) for pattern in exclude)]
+    path_devices = {}
+    for path in io_config.get("paths", {}):
+        try:
+            path_devices[path] = devices_for_path(path)
+        except OSError:
+            path_devices[path] = set()
+
+    def apply(device):
+        values, skipped = device_tunables(device, build_device_settings(device, io_config, path_devices))
+        return {"device": device["name"], "class": device["class"], "backing": device.get("backing"),
+                "results": write_tunables(values, dry_run=dry_run), "skipped": skipped}
+
+    if not devices:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(devices), 16), thread_name_prefix="blkdev") as pool:
+        return list(pool.map(apply, devices))
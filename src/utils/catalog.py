@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+# restore 모듈(get_logger 사용)이 이 모듈을 불러오므로 표준 logging 으로 기록
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backups (
+    name TEXT PRIMARY KEY,
+    source TEXT,
+    size INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    format TEXT NOT NULL,
+    kind TEXT,
+    checksum TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS backups_created ON backups (created);
+CREATE TABLE IF NOT EXISTS members (
+    backup TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (backup, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS members_path ON members (path);
+CREATE TABLE IF NOT EXISTS dependencies (
+    backup TEXT NOT NULL,
+    requires TEXT NOT NULL,
+    PRIMARY KEY (backup, requires)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+SCHEMA_VERSION = 2
+COLUMNS = ("name", "source", "size", "file_count", "format", "kind", "checksum", "created")
+
+
+class BackupCatalog:
+    """백업 1건당 1행 + 아카이브별 멤버 목록을 담은 카탈로그 (아카이브를 열지 않고 조회)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        if self.get_meta("schema_version") != SCHEMA_VERSION:
+            # 이전 버전 카탈로그는 비우고 다음 조회 때 디렉토리에서 다시 등록
+            with self._lock, self._conn:
+                for table in ("backups", "members", "dependencies", "meta"):
+                    self._conn.execute(f"DELETE FROM {table}")
+            self.set_meta("schema_version", SCHEMA_VERSION)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add(self, record, members=()):
+        """record["requires"] 에는 이 백업을 복원할 때 함께 필요한 다른 백업 이름 목록 (증분 체인)"""
+        row = tuple(record.get(col) for col in COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM members WHERE backup = ?", (record["name"],))
+            self._conn.execute("DELETE FROM dependencies WHERE backup = ?", (record["name"],))
+            self._conn.executemany("INSERT OR IGNORE INTO dependencies (backup, requires) VALUES (?, ?)",
+                                   ((record["name"], req) for req in record.get("requires", ())))
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO backups ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                row)
+            self._conn.executemany("INSERT OR IGNORE INTO members (backup, path) VALUES (?, ?)",
+                                   ((record["name"], path) for path in members))
+
+    def remove(self, names):
+        names = list(names)
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM members WHERE backup = ?", ((n,) for n in names))
+            self._conn.executemany("DELETE FROM dependencies WHERE backup = ?", ((n,) for n in names))
+            self._conn.executemany("DELETE FROM backups WHERE name = ?", ((n,) for n in names))
+
+    def _where(self, name_filter=None, fmt=None, contains=None):
+        clauses, args = [], []
+        if name_filter:
+            clauses.append("(name LIKE ? ESCAPE '\\' OR source LIKE ? ESCAPE '\\')")
+            like = "%" + name_filter.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            args += [like, like]
+        if fmt:
+            clauses.append("format = ?")
+            args.append(fmt)
+        if contains:
+            clauses.append("name IN (SELECT backup FROM members WHERE path = ?)")
+            args.append(contains)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def list(self, offset=0, limit=None, name_filter=None, fmt=None, contains=None):
+        """최신순 백업 목록 (페이지/필터 지원)"""
+        where, args = self._where(name_filter, fmt, contains)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM backups{where} ORDER BY created DESC, name DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            args += [limit, offset]
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def count(self, name_filter=None, fmt=None, contains=None):
+        where, args = self._where(name_filter, fmt, contains)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM backups{where}", args).fetchone()[0]
+
+    def names(self):
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT name FROM backups")}
+
+    def members(self, name):
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT path FROM members WHERE backup = ? ORDER BY path", (name,))]
+
+    def dependencies(self):
+        """{백업 이름: 복원에 필요한 다른 백업 이름 집합}"""
+        deps = {}
+        with self._lock:
+            for backup, requires in self._conn.execute("SELECT backup, requires FROM dependencies"):
+                deps.setdefault(backup, set()).add(requires)
+        return deps
+
+    def dependents(self, name):
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT backup FROM dependencies WHERE requires = ? ORDER BY backup", (name,))]
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def sync(self, backup_dir, describe, is_backup):
+        """
+        백업 디렉토리 mtime 이 바뀐 경우에만 디렉토리 이름 목록과 대조해
+        새 백업은 describe(path) 로 등록하고 사라진 백업은 제거 (describe 가 실패한 백업이 있으면 다음 호출 때 다시 대조)
+        """
+        try:
+            mtime_ns = os.stat(backup_dir).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if self.get_meta("dir_mtime_ns") == mtime_ns:
+            return
+
+        on_disk = {name for name in os.listdir(backup_dir) if is_backup(name)}
+        known = self.names()
+        self.remove(known - on_disk)
+        failed = []
+        for name in sorted(on_disk - known):
+            try:
+                record, members = describe(os.path.join(backup_dir, name))
+            except Exception as e:
+                # 기록 중인 백업 등: 이번에는 건너뛰고 mtime 을 기록하지 않아 다음 조회 때 다시 시도
+                logger.warning(f"[카탈로그] {name} 등록 실패, 다음 조회 때 재시도 | 오류: {e}")
+                failed.append(name)
+                continue
+            self.add(record, members)
+        if not failed:
+            self.set_meta("dir_mtime_ns", mtime_ns)
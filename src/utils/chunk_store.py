@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+import sqlite3
+import stat
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from src.utils import trace
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+MIN_CHUNK = 256 * 1024
+AVG_CHUNK = 1024 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+READ_SIZE = 8 * 1024 * 1024
+
+# 청크 경계 판정: 바이트마다 최근 9바이트 창의 패리티 1비트(기호)를 구하고 고정된 비트 패턴이 나오는 곳에서 자름
+# - 기호 계산은 translate + 큰 정수 shift/xor, 패턴 검색은 bytes.find 로 모두 C 에서 처리 (바이트별 파이썬 루프 없음)
+# - 경계는 주변 몇십 바이트 내용에만 의존하므로 앞부분이 바뀌어도 나머지 경계는 유지됨
+# 값이 바뀌면 청크 경계가 달라져 기존 청크와 중복 제거되지 않으므로 고정
+SYMBOL_TABLE = bytes(sorted(range(256), key=lambda b: hashlib.blake2b(bytes([b]), digest_size=8).digest()))
+LOW_BIT = bytes(v & 1 for v in range(256))
+SYMBOL_SPAN = 9
+_PATTERN_SEED = hashlib.blake2b(b"chunk-boundary", digest_size=32).digest()
+
+
+def boundary_pattern(avg_size):
+    """평균 avg_size 마다 한 번 나오도록 log2(avg_size) 길이의 0/1 패턴"""
+    bits = avg_size.bit_length() - 1
+    return bytes((_PATTERN_SEED[i // 8] >> (i % 8)) & 1 for i in range(bits))
+
+
+def symbols(buf):
+    """
+    buf 의 위치 t 마다 기호 1바이트(0/1) = 변환된 바이트 t..t+8 의 서로 다른 비트 8개의 XOR
+    (뒤쪽 SYMBOL_SPAN - 1 개 위치는 버퍼 밖 데이터가 필요하므로 제외)
+    """
+    count = len(buf) - SYMBOL_SPAN + 1
+    if count <= 0:
+        return b""
+    x = int.from_bytes(buf.translate(SYMBOL_TABLE), "little")
+    # 비트 8t + 9j (j=0..7) 를 비트 8t 로 모음: shift 9/18/36 세 번으로 8개 항 XOR
+    x ^= x >> 9
+    x ^= x >> 18
+    x ^= x >> 36
+    return x.to_bytes(len(buf), "little")[:count].translate(LOW_BIT)
+
+
+def _cut_point(sym, pattern, start, end):
+    """buf[start:end] 에서 청크 경계를 찾아 반환 (패턴이 없으면 end 와 start + MAX_CHUNK 중 작은 값)"""
+    if start + MIN_CHUNK >= end:
+        return end
+    limit = min(end, start + MAX_CHUNK)
+    # 패턴이 기호 위치 m 에서 시작하면 마지막 기호가 보는 바이트 다음 위치가 경계
+    reach = len(pattern) - 1 + SYMBOL_SPAN
+    m = sym.find(pattern, start + MIN_CHUNK - reach, limit - reach + 1)
+    return m + reach if m >= 0 else limit
+
+
+def iter_chunks(f, avg_size=AVG_CHUNK):
+    """내용 기반(content-defined) 청크 분할: 일부가 바뀌어도 나머지 청크 경계는 유지됨"""
+    pattern = boundary_pattern(avg_size)
+    buf = b""
+    sym = b""
+    pos = 0
+    eof = False
+    while True:
+        if not eof and len(buf) - pos < MAX_CHUNK:
+            data = f.read(READ_SIZE)
+            if data:
+                buf = buf[pos:] + data
+                sym = symbols(buf)
+                pos = 0
+                continue
+            eof = True
+        if pos >= len(buf):
+            return
+        cut = _cut_point(sym, pattern, pos, len(buf))
+        yield buf[pos:cut]
+        pos = cut
+
+
+class ChunkStore:
+    """
+    해시 주소 기반 중복 제거 백업 저장소
+    - chunks/<앞 2자리>/<sha256>: zlib 압축된 청크
+    - index.sqlite: 청크별 참조 횟수
+    - 백업 1건 = 청크 목록을 담은 manifest JSON
+    """
+
+    def __init__(self, root, compression_level=6, workers=4, avg_chunk_size=AVG_CHUNK):
+        self.root = Path(root)
+        self.chunk_dir = self.root / "chunks"
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self.workers = max(1, workers)
+        self.avg_chunk_size = avg_chunk_size
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS refs (hash TEXT PRIMARY KEY, refcount INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, stored_size INTEGER NOT NULL)")
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def _chunk_path(self, digest):
+        return self.chunk_dir / digest[:2] / digest
+
+    def _known(self, digest):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM refs WHERE hash = ?", (digest,)).fetchone() is not None
+
+    def _store_chunk(self, digest, data):
+        """청크가 없을 때만 압축 후 원자적으로 기록, 새로 기록한 (원본, 저장) 크기를 반환"""
+        path = self._chunk_path(digest)
+        if path.exists():
+            return 0, path.stat().st_size
+        payload = zlib.compress(data, self.compression_level)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+        return len(data), len(payload)
+
+    def _hash_and_store(self, data):
+        """작업 스레드에서 해시 계산 + 새 청크 저장 (hashlib/zlib 은 GIL 을 놓으므로 병렬 실행)"""
+        digest = hashlib.sha256(data).hexdigest()
+        if self._known(digest):
+            return digest, 0, 0
+        new, stored = self._store_chunk(digest, data)
+        return digest, new, stored
+
+    def _read_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as f:
+            return zlib.decompress(f.read())
+
+    # 백업
+    @trace.traced("backup.dedup", cat="backup")
+    def backup(self, source, manifest_path, previous_manifest=None):
+        source = Path(source)
+        previous = {}
+        if previous_manifest is not None:
+            previous = {e["path"]: e for e in load_manifest(previous_manifest).get("files", [])}
+
+        manifest = {
+            "version": 1,
+            "type": "directory" if source.is_dir() else "file",
+            "source": str(source.resolve()),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "files": [], "dirs": [], "symlinks": [],
+        }
+        stats = {"files": 0, "reused_files": 0, "bytes": 0, "new_bytes": 0, "stored_bytes": 0, "chunks": 0}
+        sizes = {}
+        counted = set()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="chunk") as pool:
+            # (manifest 항목, 청크 크기, future): 제출 순서대로 꺼내므로 항목의 청크 순서가 유지됨
+            inflight = deque()
+
+            def drain(limit):
+                while len(inflight) > limit:
+                    entry, size, future = inflight.popleft()
+                    digest, new, stored = future.result()
+                    entry["chunks"].append(digest)
+                    sizes[digest] = size
+                    # 같은 백업 안의 중복 청크가 동시에 기록돼도 통계는 한 번만
+                    if new and digest not in counted:
+                        counted.add(digest)
+                        stats["new_bytes"] += new
+                        stats["stored_bytes"] += stored
+
+            for rel, st, kind, target in _walk(source):
+                if kind == "dir":
+                    manifest["dirs"].append({"path": rel, "mode": stat.S_IMODE(st.st_mode)})
+                    continue
+                if kind == "symlink":
+                    manifest["symlinks"].append({"path": rel, "target": target})
+                    continue
+
+                entry = {"path": rel, "mode": stat.S_IMODE(st.st_mode), "mtime_ns": st.st_mtime_ns,
+                         "size": st.st_size, "inode": st.st_ino, "chunks": []}
+                prev = previous.get(rel)
+                stats["files"] += 1
+                stats["bytes"] += st.st_size
+                if prev and (prev["size"], prev["mtime_ns"], prev["inode"]) == (st.st_size, st.st_mtime_ns, st.st_ino):
+                    # 변경 없는 파일은 읽지 않고 이전 청크 목록을 재사용
+                    entry["chunks"] = prev["chunks"]
+                    stats["reused_files"] += 1
+                else:
+                    with open(target, "rb") as f:
+                        for data in iter_chunks(f, self.avg_chunk_size):
+                            inflight.append((entry, len(data), pool.submit(self._hash_and_store, data)))
+                            drain(self.workers * 2)
+                manifest["files"].append(entry)
+            drain(0)
+        stats["chunks"] = sum(len(entry["chunks"]) for entry in manifest["files"])
+
+        self._add_refs(manifest, sizes)
+        _write_json_atomic(manifest_path, manifest)
+        trace.add(bytes=stats["bytes"], bytes_written=stats["stored_bytes"])
+        return stats
+
+    def _add_refs(self, manifest, sizes):
+        counts = {}
+        for entry in manifest["files"]:
+            for digest in entry["chunks"]:
+                counts[digest] = counts.get(digest, 0) + 1
+        rows = []
+        for digest, count in counts.items():
+            size = sizes.get(digest, 0)
+            stored = self._chunk_path(digest).stat().st_size if digest in sizes else 0
+            rows.append((digest, count, size, stored, count))
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO refs (hash, refcount, size, stored_size) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET refcount = refcount + ?", rows)
+
+    # 복원
+    @trace.traced("restore.dedup", cat="restore")
+    def restore(self, manifest_path, dest, file_name=None):
+        """manifest 를 dest 아래에 복원 (단일 파일 백업은 file_name 으로 이름 지정 가능)"""
+        manifest = load_manifest(manifest_path)
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        for d in manifest["dirs"]:
+            (dest / d["path"]).mkdir(parents=True, exist_ok=True)
+        for entry in manifest["files"]:
+            if manifest["type"] == "file" and file_name:
+                out_path = dest / file_name
+            else:
+                out_path = dest / entry["path"]
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(out_path, "wb") as out:
+                for digest in entry["chunks"]:
+                    out.write(self._read_chunk(digest))
+            os.chmod(out_path, entry["mode"])
+            os.utime(out_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        for link in manifest["symlinks"]:
+            link_path = dest / link["path"]
+            if not link_path.is_symlink():
+                os.symlink(link["target"], link_path)
+        for d in manifest["dirs"]:
+            os.chmod(dest / d["path"], d["mode"])
+        trace.add(bytes=sum(entry["size"] for entry in manifest["files"]))
+        return dest
+
+    # 삭제 + 가비지 컬렉션
+    def delete(self, manifest_path):
+        return self.delete_many([manifest_path])
+
+    def delete_many(self, manifest_paths):
+        """여러 manifest 를 한 트랜잭션으로 삭제하고 참조가 없어진 청크를 정리"""
+        counts = {}
+        for manifest_path in manifest_paths:
+            for entry in load_manifest(manifest_path).get("files", []):
+                for digest in entry["chunks"]:
+                    counts[digest] = counts.get(digest, 0) + 1
+
+        with self._lock, self._db:
+            self._db.executemany("UPDATE refs SET refcount = refcount - ? WHERE hash = ?",
+                                 [(count, digest) for digest, count in counts.items()])
+            garbage = self._db.execute("SELECT hash, stored_size FROM refs WHERE refcount <= 0").fetchall()
+            self._db.execute("DELETE FROM refs WHERE refcount <= 0")
+
+        freed = 0
+        for digest, stored_size in garbage:
+            try:
+                self._chunk_path(digest).unlink()
+                freed += stored_size
+            except FileNotFoundError:
+                pass
+        for manifest_path in manifest_paths:
+            manifest_path = Path(manifest_path)
+            freed += manifest_path.stat().st_size
+            manifest_path.unlink()
+        return {"chunks_removed": len(garbage), "bytes_freed": freed}
+
+
+def _walk(source):
+    """(상대 경로, lstat, 종류, 대상) 을 생성. 단일 파일이면 파일 이름 하나만 생성"""
+    st = os.lstat(source)
+    if not stat.S_ISDIR(st.st_mode):
+        yield source.name, os.stat(source), "file", str(source)
+        return
+    stack = [(str(source), "")]
+    while stack:
+        abs_dir, rel_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                rel = f"{rel_dir}{entry.name}"
+                st = entry.stat(follow_symlinks=False)
+                if stat.S_ISDIR(st.st_mode):
+                    yield rel, st, "dir", entry.path
+                    stack.append((entry.path, rel + "/"))
+                elif stat.S_ISLNK(st.st_mode):
+                    yield rel, st, "symlink", os.readlink(entry.path)
+                elif stat.S_ISREG(st.st_mode):
+                    yield rel, st, "file", entry.path
+
+
+def load_manifest(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json_atomic(path, data):
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def find_previous_manifest(backup_dir, source):
+    """같은 원본 경로의 가장 최근 manifest (변경 없는 파일의 청크 재사용용)"""
+    source = str(Path(source).resolve())
+    name = Path(source).name
+    candidates = sorted(Path(backup_dir).glob(f"*_{name}{MANIFEST_SUFFIX}"), reverse=True)
+    for path in candidates:
+        try:
+            if load_manifest(path).get("source") == source:
+                return path
+        except (OSError, ValueError):
+            continue
+    return None
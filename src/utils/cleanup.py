@@ -0,0 +1,288 @@
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.scan_cache import ScanCache
+from src.utils import metrics, trace
+
+DIR_FLAGS = os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC
+SUBDIR_FLAGS = DIR_FLAGS | os.O_NOFOLLOW
+
+
+CLEANUP_FILES = metrics.counter("cleanup_files_deleted_total", "Files deleted by unified cleanup")
+CLEANUP_DIRS = metrics.counter("cleanup_dirs_deleted_total", "Empty directories removed by unified cleanup")
+CLEANUP_BYTES = metrics.counter("cleanup_bytes_reclaimed_total", "Bytes reclaimed by unified cleanup")
+CLEANUP_ENTRIES = metrics.counter("cleanup_entries_scanned_total", "Directory entries examined by unified cleanup")
+CLEANUP_ERRORS = metrics.counter("cleanup_errors_total", "Entries unified cleanup failed to remove")
+CLEANUP_DURATION = metrics.histogram("cleanup_duration_seconds", "Unified cleanup wall time")
+
+
+class CleanupCancelled(Exception):
+    pass
+
+
+class DeletionLog:
+    """삭제 기록을 메모리에 모아 두었다가 한 번에 기록하는 버퍼 로그 (스레드 안전)"""
+
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self._lines = []
+        self._lock = threading.Lock()
+        self._file = None
+
+    def record(self, kind, path):
+        line = f"{time.ctime()} - Deleted {kind}: {path}\n"
+        with self._lock:
+            self._lines.append(line)
+            if len(self._lines) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._lines:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", buffering=1024 * 1024)
+        self._file.write("".join(self._lines))
+        self._lines.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _new_stats():
+    return {"entries": 0, "files_deleted": 0, "dirs_deleted": 0, "bytes_reclaimed": 0, "errors": 0,
+            "dirs_scanned": 0, "dirs_skipped": 0}
+
+
+class _Walker:
+    def __init__(self, now, min_age_seconds, remove_empty_dirs, deletion_log, token=None, cached=None):
+        self.now = now
+        self.min_age_seconds = min_age_seconds
+        self.cutoff = now - min_age_seconds
+        self.remove_empty_dirs = remove_empty_dirs
+        self.log = deletion_log
+        self.token = token
+        self.stats = _new_stats()
+
+        # 증분 모드: 이전 실행 캐시와 이번 실행에서 새로 기록할 캐시
+        self.incremental = cached is not None
+        self.cached_dirs, self.cached_pending = cached if cached is not None else ({}, {})
+        self.new_dirs = {}
+        self.new_pending = {}
+
+    def clean_dir(self, dir_fd, dir_path, mtime_ns=None):
+        """dir_fd 하위를 정리하고 남아 있는 항목 수를 반환"""
+        if self.token is not None and self.token.cancelled:
+            raise CleanupCancelled(dir_path)
+
+        cached = self.cached_dirs.get(dir_path)
+        if cached is not None and mtime_ns is not None and cached[0] == mtime_ns:
+            # 디렉토리 mtime 이 그대로면 목록을 다시 읽지 않고 하위 디렉토리와 재검사 대상만 확인
+            self.stats["dirs_skipped"] += 1
+            return self._revisit(dir_fd, dir_path, cached)
+        self.stats["dirs_scanned"] += 1
+        return self._scan(dir_fd, dir_path)
+
+    def _visit_subdir(self, dir_fd, dir_path, name, st):
+        """하위 디렉토리를 정리하고 비었으면 삭제, 삭제했으면 True"""
+        child_fd = os.open(name, SUBDIR_FLAGS, dir_fd=dir_fd)
+        try:
+            child_remaining = self.clean_dir(child_fd, os.path.join(dir_path, name), st.st_mtime_ns)
+        finally:
+            os.close(child_fd)
+        if child_remaining == 0 and self.remove_empty_dirs:
+            os.rmdir(name, dir_fd=dir_fd)
+            self.stats["dirs_deleted"] += 1
+            self.stats["bytes_reclaimed"] += st.st_blocks * 512
+            self.log.record("empty directory", os.path.join(dir_path, name))
+            self.new_dirs.pop(os.path.join(dir_path, name), None)
+            return True
+        return False
+
+    def _delete_file(self, dir_fd, dir_path, name, st):
+        os.unlink(name, dir_fd=dir_fd)
+        self.stats["files_deleted"] += 1
+        self.stats["bytes_reclaimed"] += st.st_blocks * 512
+        self.log.record("empty file", os.path.join(dir_path, name))
+
+    def _remember(self, dir_fd, dir_path, subdirs, pending, remaining):
+        if self.incremental:
+            # 이번 실행의 삭제로 바뀐 mtime 을 기록해 다음 실행에서 불필요한 재스캔을 막음
+            self.new_dirs[dir_path] = (os.fstat(dir_fd).st_mtime_ns, subdirs, remaining)
+            if pending:
+                self.new_pending[dir_path] = pending
+
+    def _scan(self, dir_fd, dir_path):
+        stats = self.stats
+        remaining = 0
+        subdirs = []
+        pending = {}
+        with os.scandir(dir_fd) as it:
+            for entry in it:
+                stats["entries"] += 1
+                name = entry.name
+                try:
+                    # 항목당 lstat 1회만 수행하고 이후 판단은 캐시된 결과로 처리
+                    st = entry.stat(follow_symlinks=False)
+                    mode = st.st_mode
+
+                    if stat.S_ISDIR(mode):
+                        if not self._visit_subdir(dir_fd, dir_path, name, st):
+                            remaining += 1
+                            subdirs.append(name)
+
+                    elif stat.S_ISREG(mode) and st.st_size == 0:
+                        if st.st_mtime <= self.cutoff:
+                            self._delete_file(dir_fd, dir_path, name, st)
+                        else:
+                            remaining += 1
+                            pending[name] = st.st_mtime + self.min_age_seconds
+
+                    else:
+                        remaining += 1
+                except CleanupCancelled:
+                    raise
+                except OSError:
+                    stats["errors"] += 1
+                    remaining += 1
+        self._remember(dir_fd, dir_path, subdirs, pending, remaining)
+        return remaining
+
+    def _revisit(self, dir_fd, dir_path, cached):
+        stats = self.stats
+        _, cached_subdirs, remaining = cached
+        subdirs = []
+        for name in cached_subdirs:
+            stats["entries"] += 1
+            try:
+                st = os.stat(name, dir_fd=dir_fd, follow_symlinks=False)
+                if not stat.S_ISDIR(st.st_mode):
+                    continue
+                if self._visit_subdir(dir_fd, dir_path, name, st):
+                    remaining -= 1
+                else:
+                    subdirs.append(name)
+            except CleanupCancelled:
+                raise
+            except FileNotFoundError:
+                remaining -= 1
+            except OSError:
+                stats["errors"] += 1
+                subdirs.append(name)
+
+        # 나이 기준에 도달한 빈 파일만 다시 확인
+        pending = dict(self.cached_pending.get(dir_path, {}))
+        for name, due in list(pending.items()):
+            if due > self.now:
+                continue
+            stats["entries"] += 1
+            try:
+                st = os.stat(name, dir_fd=dir_fd, follow_symlinks=False)
+                if not stat.S_ISREG(st.st_mode) or st.st_size != 0:
+                    del pending[name]
+                elif st.st_mtime <= self.cutoff:
+                    self._delete_file(dir_fd, dir_path, name, st)
+                    del pending[name]
+                    remaining -= 1
+                else:
+                    pending[name] = st.st_mtime + self.min_age_seconds
+            except FileNotFoundError:
+                del pending[name]
+                remaining -= 1
+            except OSError:
+                stats["errors"] += 1
+
+        self._remember(dir_fd, dir_path, subdirs, pending, remaining)
+        return remaining
+
+
+def _clean_root(root_path, now, min_age_seconds, remove_empty_dirs, deletion_log, token, cache):
+    cached = cache.load(root_path) if cache is not None else None
+    walker = _Walker(now, min_age_seconds, remove_empty_dirs, deletion_log, token, cached)
+    try:
+        # 최상위 경로는 os.walk 와 동일하게 심볼릭 링크를 따라감
+        root_fd = os.open(root_path, DIR_FLAGS)
+    except OSError:
+        return walker.stats
+    with trace.span("cleanup.walk", cat="cleanup", path=root_path) as span:
+        try:
+            walker.clean_dir(root_fd, root_path, os.fstat(root_fd).st_mtime_ns)
+        finally:
+            os.close(root_fd)
+        span.add(bytes=walker.stats["bytes_reclaimed"], entries=walker.stats["entries"])
+    # 작업 스레드별 셀에 누적 (락 없음)
+    stats = walker.stats
+    CLEANUP_FILES.inc(stats["files_deleted"])
+    CLEANUP_DIRS.inc(stats["dirs_deleted"])
+    CLEANUP_BYTES.inc(stats["bytes_reclaimed"])
+    CLEANUP_ENTRIES.inc(stats["entries"])
+    CLEANUP_ERRORS.inc(stats["errors"])
+    if cache is not None:
+        cache.store(root_path, walker.new_dirs, walker.new_pending)
+    return walker.stats
+
+
+def _open_scan_cache(cleanup_cfg, now, min_age_seconds, remove_empty_dirs):
+    if not cleanup_cfg.get("incremental", False):
+        return None
+    cache = ScanCache(cleanup_cfg.get("scan_cache_path", "cache/unified_cleanup.sqlite"))
+
+    # 설정이 바뀌었거나 주기적 전체 스캔 시점이면 캐시를 비우고 전체 스캔
+    # (mtime 이 바뀌지 않는 파일 내용 변경(truncate 등)은 전체 스캔에서만 발견됨)
+    signature = {"min_age_seconds": min_age_seconds, "remove_empty_dirs": remove_empty_dirs}
+    full_rescan_seconds = cleanup_cfg.get("full_rescan_hours", 24) * 3600
+    last_full = cache.get_meta("last_full_scan", 0)
+    if cache.get_meta("signature") != signature or now - last_full >= full_rescan_seconds:
+        cache.clear()
+        cache.set_meta("signature", signature)
+        cache.set_meta("last_full_scan", now)
+    return cache
+
+
+def run_cleanup(cleanup_cfg, token=None):
+    """unified_cleanup 설정에 따라 대상 경로를 병렬 정리하고 처리량 통계를 반환"""
+    log_file = cleanup_cfg.get("log_file_path", "logs/unified_cleanup.log")
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+
+    target_paths = cleanup_cfg.get("target_paths", [])
+    now = time.time()
+    min_age_seconds = cleanup_cfg.get("min_file_age_minutes", 30) * 60
+    remove_empty_dirs = cleanup_cfg.get("remove_empty_dirs", True)
+    workers = max(1, min(len(target_paths), cleanup_cfg.get("workers", 4)))
+    cache = _open_scan_cache(cleanup_cfg, now, min_age_seconds, remove_empty_dirs)
+
+    deletion_log = DeletionLog(log_file, cleanup_cfg.get("log_batch_size", 1000))
+    totals = _new_stats()
+    start = time.monotonic()
+    try:
+        with trace.span("cleanup", cat="cleanup", paths=len(target_paths)) as span, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cleanup") as pool:
+            futures = [pool.submit(_clean_root, path, now, min_age_seconds, remove_empty_dirs,
+                                   deletion_log, token, cache)
+                       for path in target_paths]
+            for future in futures:
+                for key, value in future.result().items():
+                    totals[key] += value
+            span.add(bytes=totals["bytes_reclaimed"], entries=totals["entries"])
+    finally:
+        deletion_log.close()
+        if cache is not None:
+            cache.close()
+
+    elapsed = time.monotonic() - start
+    CLEANUP_DURATION.observe(elapsed)
+    totals["elapsed_seconds"] = elapsed
+    totals["entries_per_sec"] = totals["entries"] / elapsed if elapsed > 0 else 0.0
+    return totals
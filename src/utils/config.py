@@ -1,6 +1,161 @@
+import copy
 import json
 import jsonschema
+import logging
 import os
+import threading
+
+DEFAULT_CONFIG_PATH = "config/optimizer_settings.json"
+
+
+def _file_key(path):
+    """변경 감지용 (inode, mtime_ns, 크기), 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class ConfigStore:
+    """
+    프로세스 공용 설정 저장소
+    - 파싱 결과를 캐시하고 get() 마다 stat 1회로 inode/mtime/크기 변경을 확인해 바뀐 경우에만 다시 읽음
+    - 스키마 검증기는 스키마 파일이 바뀔 때만 다시 생성
+    - 임시 파일 + rename 으로 원자적으로 저장하고, 변경 시 구독자에게 새 문서를 전달
+    get() 이 반환하는 문서는 공유 객체이므로 수정하려면 snapshot() 사본을 사용
+    """
+
+    def __init__(self, path, schema_path=None):
+        self.path = str(path)
+        self.schema_path = str(schema_path) if schema_path else None
+        self._lock = threading.RLock()
+        self._key = None
+        self._document = None
+        self._validator = None
+        self._validator_key = None
+        self._subscribers = []
+        self._watcher = None
+
+    def get(self):
+        with self._lock:
+            key = _file_key(self.path)
+            if key is None:
+                raise FileNotFoundError(f"Config file not found: {self.path}")
+            if key == self._key:
+                return self._document
+            with open(self.path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+            changed = self._key is not None
+            self._key, self._document = key, document
+        if changed:
+            self._notify(document)
+        return document
+
+    def section(self, name, default=None):
+        return self.get().get(name, {} if default is None else default)
+
+    def snapshot(self):
+        return copy.deepcopy(self.get())
+
+    def validator(self, schema_path=None):
+        """컴파일된 스키마 검증기 (스키마 파일이 바뀔 때만 다시 생성, 스키마가 없으면 None)"""
+        schema_path = schema_path or self.schema_path
+        if not schema_path:
+            return None
+        with self._lock:
+            key = (schema_path, _file_key(schema_path))
+            if key[1] is None:
+                raise FileNotFoundError(f"Schema file not found: {schema_path}")
+            if key != self._validator_key:
+                with open(schema_path, "r", encoding="utf-8") as f:
+                    schema = json.load(f)
+                cls = jsonschema.validators.validator_for(schema)
+                cls.check_schema(schema)
+                self._validator, self._validator_key = cls(schema), key
+            return self._validator
+
+    def validate(self, document, schema_path=None):
+        validator = self.validator(schema_path)
+        if validator is not None:
+            validator.validate(document)
+
+    def save(self, document, schema_path=None):
+        """검증 후 원자적으로 저장하고 구독자에게 알림"""
+        self.validate(document, schema_path)
+        with self._lock:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            tmp = os.path.join(directory, f".{os.path.basename(self.path)}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._key, self._document = _file_key(self.path), copy.deepcopy(document)
+        self._notify(self._document)
+
+    def update_section(self, name, value):
+        """최상위 항목 하나만 바꿔 저장 (다른 항목은 파일의 최신 값 유지)"""
+        with self._lock:
+            document = self.snapshot() if _file_key(self.path) else {}
+            document[name] = value
+            self.save(document)
+
+    def subscribe(self, callback):
+        """
+        변경 시 callback(document) 호출, 해제 함수 반환 (호출 스레드: get/save 를 부른 스레드 또는 watch 스레드)
+        Tk 처럼 특정 스레드에서만 다뤄야 하는 구독자는 큐에 넣기만 하고 자기 스레드에서 반영
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _notify(self, document):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(document)
+            except Exception:
+                # logger 모듈이 이 모듈을 사용하므로 표준 logging 으로 기록
+                logging.getLogger(__name__).exception("설정 변경 알림 처리 실패")
+
+    def watch(self, interval=2.0):
+        """백그라운드 스레드에서 주기적으로 파일 변경을 확인 (상주 프로세스용, 중복 호출 시 기존 스레드 사용)"""
+        with self._lock:
+            if self._watcher is not None:
+                return self._watcher
+            stop_event = threading.Event()
+
+            def loop():
+                while not stop_event.wait(interval):
+                    try:
+                        self.get()
+                    except (OSError, ValueError):
+                        pass  # 저장 도중이거나 잘못된 JSON 이면 이전 값을 유지하고 다음 주기에 재시도
+
+            self._watcher = stop_event
+            threading.Thread(target=loop, name="config-watch", daemon=True).start()
+            return stop_event
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def config_store(path=DEFAULT_CONFIG_PATH):
+    """경로별 공용 ConfigStore (같은 파일은 프로세스 전체에서 하나의 캐시를 공유)"""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ConfigStore(path)
+        return _stores[key]
 
 
 class ConfigLoader:
@@ -9,12 +164,10 @@ class ConfigLoader:
         self.schema_path = schema_path
         self.config = None
         self.schema = None
+        self.store = config_store(config_path)
 
     def load_config(self):
-        if not os.path.exists(self.config_path):
-            raise FileNotFoundError(f"Config file not found: {self.config_path}")
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            self.config = json.load(f)
+        self.config = self.store.get()
 
     def get_config(self):
         if self.config is None:
@@ -32,12 +185,8 @@ class ConfigLoader:
             raise ValueError("Schema not loaded. Call 'load_schema()' first.")
         if self.config is None:
             raise ValueError("Config not loaded. Call 'load_config()' first.")
-        jsonschema.validate(instance=self.config, schema=self.schema)
+        self.store.validate(self.config, self.schema_path)
 
     def save_config(self, new_config):
-        if self.schema:
-            jsonschema.validate(instance=new_config, schema=self.schema)
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(new_config, f, indent=4)
+        self.store.save(new_config, self.schema_path if self.schema else None)
         self.config = new_config  # 내부 config도 업데이트
-
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = {name: i + 1 for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+DOW_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+# (최소, 최대, 이름 표) - 분, 시, 일, 월, 요일 순
+FIELDS = [(0, 59, {}), (0, 23, {}), (1, 31, {}), (1, 12, MONTH_NAMES), (0, 7, DOW_NAMES)]
+
+# 다음 실행 시각을 찾을 때 이 기간 안에 일치하는 시각이 없으면 오류 (예: 2월 30일)
+SEARCH_YEARS = 5
+
+
+def _parse_value(text, names):
+    text = text.lower()
+    if text in names:
+        return names[text]
+    return int(text)
+
+
+def _parse_field(text, low, high, names):
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"잘못된 step: {text}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = _parse_value(start_text, names), _parse_value(end_text, names)
+        else:
+            start = _parse_value(part, names)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"범위를 벗어난 값: {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """5필드 cron 표현식 (분 시 일 월 요일, 목록/범위/step/이름/@매크로 지원)"""
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = MACROS.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 5개 필드여야 함: {expression!r}")
+        parsed = [_parse_field(text, low, high, names) for text, (low, high, names) in zip(fields, FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {d % 7 for d in weekdays}   # 7 == 일요일
+        # 일/요일이 모두 제한된 경우 둘 중 하나만 맞아도 실행 (표준 cron 동작)
+        # Vixie cron 은 "*" 로 시작하는 필드(*/2 등)를 제한 없음으로 보고 이때는 둘 다 맞아야 실행
+        self._dom_any = fields[2].startswith("*")
+        self._dow_any = fields[4].startswith("*")
+
+    def _day_matches(self, dt):
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._dom_any or self._dow_any:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, dt):
+        """dt 이후(dt 제외) 처음으로 일치하는 시각 (분 단위, 로컬 naive datetime)"""
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t.year + SEARCH_YEARS
+        while t.year <= limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"일치하는 실행 시각 없음: {self.expression!r}")
+
+    def __repr__(self):
+        return f"CronExpression({self.expression!r})"
+
+
+class IntervalTrigger:
+    """고정 간격 실행 (예: backup_interval_hours)"""
+
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise ValueError("실행 간격은 0보다 커야 함")
+        self.seconds = seconds
+
+    def next_after(self, dt):
+        return dt + timedelta(seconds=self.seconds)
+
+    def __repr__(self):
+        return f"IntervalTrigger({self.seconds})"
+
+
+def make_trigger(schedule):
+    """cron 문자열 또는 초 단위 간격으로 트리거 생성"""
+    if isinstance(schedule, (int, float)):
+        return IntervalTrigger(schedule)
+    return CronExpression(schedule)
@@ -0,0 +1,78 @@
+import json
+import socket
+from src.utils.config import DEFAULT_CONFIG_PATH, config_store
+
+# GUI/CLI 가 가볍게 import 할 수 있도록 데몬 본체(src/daemon.py)와 분리 (psutil 등 로드 안 함)
+DEFAULT_SETTINGS = {
+    "socket_path": "/run/linux-optimizer.sock",
+    # 지정하면 소켓 파일 그룹을 바꿔 그 그룹 사용자도 접속 가능 (0660)
+    "socket_group": None,
+    "max_queue": 16,
+}
+CONNECT_TIMEOUT = 1.0
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class DaemonUnavailable(Exception):
+    """소켓이 없거나 접속 권한이 없음 (호출 측은 현재 프로세스에서 직접 실행)"""
+
+
+def load_settings(config_path=DEFAULT_CONFIG_PATH):
+    try:
+        return dict(DEFAULT_SETTINGS, **config_store(config_path).section("daemon"))
+    except (OSError, ValueError):
+        return dict(DEFAULT_SETTINGS)
+
+
+class DaemonClient:
+    """
+    데몬 클라이언트: 호출마다 연결 1개 (로컬 소켓이라 연결 비용은 무시할 수준)
+    on_event 를 주면 작업 중 전달되는 이벤트 알림을 받을 때마다 호출
+    """
+
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = socket_path or load_settings()["socket_path"]
+        self.timeout = timeout
+        self._next_id = 0
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(self.socket_path)
+        except (FileNotFoundError, ConnectionRefusedError, PermissionError, TimeoutError) as e:
+            sock.close()
+            raise DaemonUnavailable(f"{self.socket_path}: {e}") from e
+        sock.settimeout(self.timeout)
+        return sock
+
+    def call(self, method, params=None, on_event=None):
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params or {}}
+        with self._connect() as sock, sock.makefile("rwb") as stream:
+            stream.write((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+            stream.flush()
+            for line in stream:
+                message = json.loads(line)
+                if message.get("method") == "event":
+                    if on_event is not None:
+                        on_event(message["params"])
+                    continue
+                if message.get("id") != request["id"]:
+                    continue
+                if "error" in message:
+                    raise RpcError(message["error"]["code"], message["error"]["message"])
+                return message["result"]
+        raise ConnectionError("데몬이 응답 전에 연결을 끊음")
+
+    def available(self):
+        try:
+            return self.call("ping") == "pong"
+        except (DaemonUnavailable, OSError, ValueError):
+            return False
@@ -0,0 +1,72 @@
+import json
+import logging
+import sys
+import threading
+import time
+
+# 이벤트 종류: run_start, section_start, progress, log, section_end, run_end
+_emitter = None
+
+
+class EventEmitter:
+    """이벤트를 JSON Lines 로 기록 (여러 섹션 스레드에서 동시에 호출해도 줄 단위로 섞이지 않음)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def emit(self, event_type, **fields):
+        event = {"ts": round(time.time(), 3), "type": event_type, **fields}
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self.stream.write(line)
+            self.stream.flush()
+
+
+class EventLogHandler(logging.Handler):
+    """경고/오류 로그를 log 이벤트로 전달 (호출 스레드에서 실행되므로 현재 섹션을 알 수 있음)"""
+
+    def __init__(self, level=logging.WARNING):
+        super().__init__(level)
+
+    def emit(self, record):
+        emit("log", level=record.levelname, message=record.getMessage())
+
+
+def set_emitter(emitter):
+    global _emitter
+    _emitter = emitter
+
+
+def enabled():
+    return _emitter is not None
+
+
+def emit(event_type, **fields):
+    """이벤트 출력이 꺼져 있으면 아무것도 하지 않음"""
+    if _emitter is None:
+        return
+    if "section" not in fields:
+        # 순환 import 방지 (executor 는 이 모듈 없이도 사용 가능)
+        from src.utils.executor import current_section
+        section = current_section()
+        if section is not None:
+            fields["section"] = section
+    _emitter.emit(event_type, **fields)
+
+
+def progress(step, done, total):
+    """현재 섹션의 세부 단계 진행률"""
+    emit("progress", step=str(step), done=done, total=total)
+
+
+def parse_event(line):
+    """이벤트 줄 -> dict (이벤트가 아닌 줄은 None)"""
+    line = line.strip()
+    if not line.startswith("{"):
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) and "type" in event else None
@@ -0,0 +1,241 @@
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from src.utils import trace
+
+# 섹션 실행 스레드별 취소 토큰 (run_command 가 참조)
+_local = threading.local()
+# 시간 초과된 섹션 스레드가 모든 실행 슬롯을 차지할 때 종료를 기다리는 최대 시간
+ORPHAN_GRACE_SECONDS = 10
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._procs = set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+        with self._lock:
+            procs = list(self._procs)
+        for proc in procs:
+            _kill_process_group(proc)
+
+    def track(self, proc):
+        with self._lock:
+            self._procs.add(proc)
+        if self.cancelled:
+            _kill_process_group(proc)
+
+    def untrack(self, proc):
+        with self._lock:
+            self._procs.discard(proc)
+
+
+def _kill_process_group(proc):
+    # shell=True 로 실행된 명령은 자식까지 함께 종료해야 하므로 프로세스 그룹 단위로 종료
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+    except Exception:
+        proc.kill()
+
+
+def current_token():
+    return getattr(_local, "token", None)
+
+
+def current_section():
+    return getattr(_local, "section", None)
+
+
+class Section:
+    def __init__(self, name, func, args=(), depends_on=(), timeout=None):
+        self.name = name
+        self.func = func
+        self.args = tuple(args)
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+
+
+def _check_graph(sections):
+    names = {s.name for s in sections}
+    for s in sections:
+        for dep in s.depends_on:
+            if dep not in names:
+                raise ValueError(f"알 수 없는 선행 섹션: {s.name} -> {dep}")
+
+    # Kahn 알고리즘으로 순환 의존성 검사
+    indegree = {s.name: len(s.depends_on) for s in sections}
+    dependents = {s.name: [] for s in sections}
+    for s in sections:
+        for dep in s.depends_on:
+            dependents[dep].append(s.name)
+    queue = [name for name, deg in indegree.items() if deg == 0]
+    visited = 0
+    while queue:
+        name = queue.pop()
+        visited += 1
+        for child in dependents[name]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                queue.append(child)
+    if visited != len(sections):
+        raise ValueError("섹션 의존성 그래프에 순환이 있습니다.")
+
+
+def _run_section(section, token):
+    _local.token = token
+    _local.section = section.name
+    try:
+        with trace.span(section.name, cat="section"):
+            return section.func(*section.args)
+    finally:
+        _local.token = None
+        _local.section = None
+
+
+def _start_section(section, token):
+    """
+    섹션을 데몬 스레드에서 실행하고 Future 반환
+    (시간 초과 후에도 끝나지 않는 스레드가 인터프리터 종료를 막지 않도록 스레드 풀 대신 사용)
+    """
+    future = Future()
+    future.set_running_or_notify_cancel()
+
+    def target():
+        try:
+            future.set_result(_run_section(section, token))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name=f"section-{section.name}", daemon=True).start()
+    return future
+
+
+def run_sections(sections, max_workers=4, logger=None, cancel_event=None, on_event=None):
+    """
+    의존성 그래프에 따라 섹션을 병렬 실행하고 {섹션명: PASS/SKIP/FAIL} 을 반환
+    on_event(종류, **필드) 로 section_start / section_end(status, duration, reason) 를 전달
+    [PASS] 와 실행기가 판정한 결과(시간 초과/취소/예외/선행 실패) 줄은 여기서 기록
+    (섹션이 직접 반환한 SKIP/FAIL 은 섹션이 사유와 함께 기록, 시간 초과된 섹션의 늦은 결과는 무시)
+    """
+    _check_graph(sections)
+
+    results = {}
+    pending = {s.name: s for s in sections}
+    order = [s.name for s in sections]
+    running = {}  # future -> (section, token, deadline)
+    orphaned = {}  # 시간 초과/취소 후에도 아직 끝나지 않은 섹션 스레드: future -> 섹션명
+    started = {}  # 섹션명 -> 시작 시각
+    max_workers = max(1, max_workers)
+    stalled_until = None  # 모든 슬롯이 고아 스레드에 묶였을 때 기다리는 기한
+
+    def log(level, message):
+        if logger is not None:
+            getattr(logger, level)(message)
+
+    def event(event_type, **fields):
+        if on_event is not None:
+            on_event(event_type, **fields)
+
+    def finish(name, status, message=None):
+        results[name] = status
+        if message:
+            log("error" if status == "FAIL" else "warning", message)
+        elif status == "PASS":
+            log("info", f"[PASS] {name}")
+        duration = time.monotonic() - started[name] if name in started else 0.0
+        event("section_end", section=name, status=status, duration=round(duration, 3),
+              reason=message.split(" | ", 1)[-1] if message else None)
+
+    def abandon(future, section, token, message):
+        token.cancel()
+        del running[future]
+        orphaned[future] = section.name
+        finish(section.name, "FAIL", message)
+
+    while pending or running:
+        if cancel_event is not None and cancel_event.is_set():
+            for future, (section, token, _) in list(running.items()):
+                abandon(future, section, token, f"[FAIL] {section.name} | 실행 취소됨")
+            for name in list(pending):
+                finish(name, "SKIP", f"[SKIP] {name} | 실행 취소됨")
+            pending.clear()
+            break
+
+        # 끝난 고아 스레드는 슬롯 반환
+        for future in [f for f in orphaned if f.done()]:
+            log("info", f"{orphaned.pop(future)} | 시간 초과 후 스레드 종료됨 (결과 무시)")
+        capacity = max_workers - len(orphaned)
+
+        # 선행 섹션 결과에 따라 실행 가능/건너뛸 섹션 결정
+        for name in [n for n in order if n in pending]:
+            section = pending[name]
+            failed = [d for d in section.depends_on if results.get(d) == "FAIL"]
+            if failed:
+                del pending[name]
+                finish(name, "SKIP", f"[SKIP] {name} | 선행 섹션 실패: {', '.join(failed)}")
+                continue
+            if len(running) >= capacity:
+                continue
+            if all(d in results for d in section.depends_on):
+                del pending[name]
+                token = CancelToken()
+                deadline = time.monotonic() + section.timeout if section.timeout else None
+                started[name] = time.monotonic()
+                event("section_start", section=name)
+                future = _start_section(section, token)
+                running[future] = (section, token, deadline)
+                stalled_until = None
+
+        if not running:
+            if pending and capacity <= 0:
+                # 취소된 섹션 스레드가 정리될 때까지 잠시 기다린 뒤에도 슬롯이 없으면 남은 섹션 생략
+                stalled_until = stalled_until or time.monotonic() + ORPHAN_GRACE_SECONDS
+                remaining = stalled_until - time.monotonic()
+                if remaining > 0:
+                    wait(list(orphaned), timeout=remaining, return_when=FIRST_COMPLETED)
+                    continue
+                reason = "시간 초과된 섹션 스레드가 실행 슬롯을 점유 중"
+            else:
+                # 실행 중인 섹션이 없으면 남은 섹션은 모두 위에서 제출/생략 판정이 끝난 상태
+                reason = "선행 섹션 미완료"
+            for name in list(pending):
+                finish(name, "SKIP", f"[SKIP] {name} | {reason}")
+            pending.clear()
+            break
+
+        deadlines = [d for (_, _, d) in running.values() if d is not None]
+        wait_timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+        if cancel_event is not None:
+            wait_timeout = 0.2 if wait_timeout is None else min(wait_timeout, 0.2)
+        # 슬롯을 기다리는 섹션이 있으면 고아 스레드 종료에도 깨어남
+        waiting_on = list(running) + (list(orphaned) if pending else [])
+        done, _ = wait(waiting_on, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            if future not in running:
+                continue
+            section, _, _ = running.pop(future)
+            try:
+                status = future.result() or "PASS"
+            except Exception as e:
+                finish(section.name, "FAIL", f"[FAIL] {section.name} | 오류: {e}")
+                continue
+            finish(section.name, status)
+
+        now = time.monotonic()
+        for future, (section, token, deadline) in list(running.items()):
+            if deadline is not None and now >= deadline:
+                abandon(future, section, token, f"[FAIL] {section.name} | 시간 초과 ({section.timeout}s)")
+
+    return {name: results[name] for name in order if name in results}
@@ -0,0 +1,41 @@
+import contextlib
+import os
+
+# /proc, /sys, /etc 를 실제 시스템 대신 이 디렉토리 아래에서 찾음 (벤치마크/테스트용 합성 트리)
+ENV_VAR = "OPTIMIZER_FS_ROOT"
+
+_root = os.path.abspath(os.environ.get(ENV_VAR) or "/")
+
+
+def get_root():
+    return _root
+
+
+def set_root(path):
+    global _root
+    _root = os.path.abspath(path) if path else "/"
+
+
+@contextlib.contextmanager
+def use_root(path):
+    previous = _root
+    set_root(path)
+    try:
+        yield _root
+    finally:
+        set_root(previous)
+
+
+def hermetic():
+    """합성 루트 사용 중이면 True (외부 명령 실행/실제 프로세스 변경을 하지 않음)"""
+    return _root != "/"
+
+
+def host_path(path):
+    """시스템 경로 -> 현재 루트 기준 경로 (루트가 / 이거나 이미 루트 아래 경로면 그대로)"""
+    path = str(path)
+    if _root == "/" or not os.path.isabs(path):
+        return path
+    if path == _root or path.startswith(_root + os.sep):
+        return path
+    return os.path.join(_root, path.lstrip("/"))
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import stat
+import tarfile
+from datetime import datetime
+from pathlib import Path
+from src.utils.archive_index import open_indexed_tar_gz
+from src.utils import trace
+
+SIDECAR_SUFFIX = ".meta.json"
+
+# tarfile 추출 필터 (지원되는 버전에서만 사용)
+_EXTRACT_KWARGS = {"filter": "tar"} if hasattr(tarfile, "tar_filter") else {}
+
+
+def sidecar_path(archive_path):
+    archive_path = Path(archive_path)
+    return archive_path.with_name(archive_path.name + SIDECAR_SUFFIX)
+
+
+def load_sidecar(archive_path):
+    path = sidecar_path(archive_path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_sidecar(archive_path, meta):
+    path = sidecar_path(archive_path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, path)
+
+
+@trace.traced("backup.scan", cat="walk")
+def scan_tree(source):
+    """원본 트리를 {상대 경로: 메타데이터} 로 수집 (lstat 1회/항목)"""
+    entries = {}
+    stack = [(str(source), "")]
+    while stack:
+        abs_dir, rel_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                rel = f"{rel_dir}{entry.name}"
+                st = entry.stat(follow_symlinks=False)
+                info = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino,
+                        "mode": stat.S_IMODE(st.st_mode)}
+                if stat.S_ISDIR(st.st_mode):
+                    info["type"] = "dir"
+                    stack.append((entry.path, rel + "/"))
+                elif stat.S_ISLNK(st.st_mode):
+                    info["type"] = "symlink"
+                    info["target"] = os.readlink(entry.path)
+                elif stat.S_ISREG(st.st_mode):
+                    info["type"] = "file"
+                else:
+                    continue
+                entries[rel] = info
+    trace.add(entries=len(entries))
+    return entries
+
+
+def _unchanged(prev, cur):
+    if prev is None or prev["type"] != cur["type"]:
+        return False
+    if cur["type"] == "dir":
+        return prev.get("mode") == cur["mode"]
+    if cur["type"] == "symlink":
+        return prev.get("target") == cur.get("target")
+    return (prev["size"], prev["mtime_ns"], prev["inode"]) == (cur["size"], cur["mtime_ns"], cur["inode"])
+
+
+class _HashingReader:
+    def __init__(self, f):
+        self.f = f
+        self.hash = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self.hash.update(data)
+        return data
+
+
+def _add_from_source(tar, source, rel, info):
+    """원본 항목을 tar 에 추가하고 파일이면 sha256 을 반환"""
+    abs_path = os.path.join(source, rel)
+    if info["type"] != "file":
+        tar.add(abs_path, arcname=rel, recursive=False)
+        return None
+    with open(abs_path, "rb") as f:
+        tarinfo = tar.gettarinfo(arcname=rel, fileobj=f)
+        if tarinfo.islnk():
+            # 하드링크 대상이 다른 아카이브에 있을 수 있으므로 증분 체인에서는 독립 파일로 저장
+            tarinfo.type = tarfile.REGTYPE
+            tarinfo.linkname = ""
+            tarinfo.size = os.fstat(f.fileno()).st_size
+        reader = _HashingReader(f)
+        tar.addfile(tarinfo, reader)
+    return reader.hash.hexdigest()
+
+
+def find_previous(backup_dir, source, archive_suffix=".tar.gz"):
+    """같은 원본 디렉토리의 가장 최근 백업 (아카이브가 남아 있는 것만)"""
+    source = str(Path(source).resolve())
+    name = Path(source).name
+    pattern = f"*_{name}{archive_suffix}{SIDECAR_SUFFIX}"
+    for meta_path in sorted(Path(backup_dir).glob(pattern), reverse=True):
+        archive = meta_path.with_name(meta_path.name[:-len(SIDECAR_SUFFIX)])
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if meta.get("source") == source and archive.exists():
+            return archive, meta
+    return None, None
+
+
+@trace.traced("backup.incremental", cat="backup")
+def create_backup(source, archive_path, previous=None, synthetic_full_every=7, compression_level=6,
+                  workers=None):
+    """
+    증분 디렉토리 백업 생성
+    - 이전 백업이 없으면 전체(full) 백업
+    - 있으면 새로 생기거나 바뀐 항목만 아카이브하고 삭제 목록을 기록 (incremental)
+    - 체인 길이가 synthetic_full_every 에 도달하면 바뀌지 않은 항목을 기존 아카이브에서 복사해
+      원본을 다시 읽지 않고 독립적인 전체 백업(synthetic_full)을 만듦
+    """
+    source = Path(source).resolve()
+    archive_path = Path(archive_path)
+    prev_archive, prev_meta = previous if previous else (None, None)
+    prev_entries = prev_meta["entries"] if prev_meta else {}
+
+    current = scan_tree(source)
+    changed = [rel for rel, info in current.items() if not _unchanged(prev_entries.get(rel), info)]
+    deleted = sorted(set(prev_entries) - set(current))
+
+    if prev_meta is None:
+        kind, chain_length = "full", 0
+    elif prev_meta.get("chain_length", 0) + 1 >= synthetic_full_every:
+        kind, chain_length = "synthetic_full", 0
+    else:
+        kind, chain_length = "incremental", prev_meta.get("chain_length", 0) + 1
+
+    entries = {}
+    for rel, info in current.items():
+        entry = dict(info)
+        prev = prev_entries.get(rel)
+        if prev is not None and _unchanged(prev, info) and info["type"] != "dir":
+            entry["checksum"] = prev.get("checksum")
+            entry["archive"] = prev.get("archive")
+        entries[rel] = entry
+
+    changed_set = set(changed)
+    with open_indexed_tar_gz(archive_path, level=compression_level, workers=workers, source=source) as tar:
+        if kind == "synthetic_full":
+            # 바뀌지 않은 항목은 원래 담겨 있던 아카이브에서 그대로 복사
+            by_archive = {}
+            for rel, entry in entries.items():
+                if rel not in changed_set and entry["type"] != "dir":
+                    by_archive.setdefault(entry["archive"], set()).add(rel)
+            for origin, wanted in by_archive.items():
+                with tarfile.open(archive_path.parent / origin, "r:gz") as src:
+                    for member in src:
+                        if member.name in wanted:
+                            data = src.extractfile(member) if member.isfile() else None
+                            tar.addfile(member, data)
+
+        for rel in sorted(changed):
+            if entries[rel]["type"] == "dir":
+                # 디렉토리는 manifest 기록만으로 복원하므로 아카이브에 담지 않음
+                continue
+            entries[rel]["checksum"] = _add_from_source(tar, str(source), rel, entries[rel])
+            entries[rel]["archive"] = archive_path.name
+
+        if kind == "synthetic_full":
+            for entry in entries.values():
+                if entry["type"] != "dir":
+                    entry["archive"] = archive_path.name
+
+    meta = {
+        "version": 1,
+        "kind": kind,
+        "source": str(source),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "parent": prev_archive.name if prev_archive is not None and kind == "incremental" else None,
+        "chain_length": chain_length,
+        "entries": entries,
+        "changed": len(changed),
+        "deleted": deleted,
+    }
+    write_sidecar(archive_path, meta)
+    return meta
+
+
+def required_archives(meta):
+    """이 시점을 복원하는 데 필요한 아카이브 이름 집합"""
+    return {entry["archive"] for entry in meta["entries"].values() if entry.get("archive")}
+
+
+@trace.traced("restore.extract", cat="restore")
+def restore_backup(archive_path, dest, meta=None):
+    """manifest 에 기록된 시점의 트리를 필요한 아카이브만 골라 겹쳐서 복원"""
+    archive_path = Path(archive_path)
+    meta = meta or load_sidecar(archive_path)
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    entries = meta["entries"]
+
+    for rel, entry in sorted(entries.items()):
+        if entry["type"] == "dir":
+            (dest / rel).mkdir(parents=True, exist_ok=True)
+
+    by_archive = {}
+    for rel, entry in entries.items():
+        if entry["type"] != "dir":
+            by_archive.setdefault(entry["archive"], set()).add(rel)
+
+    for origin, wanted in by_archive.items():
+        with tarfile.open(archive_path.parent / origin, "r:gz") as tar:
+            for member in tar:
+                if member.name in wanted:
+                    tar.extract(member, path=dest, **_EXTRACT_KWARGS)
+
+    # 하위 항목 기록 후 디렉토리 권한 적용 (깊은 경로부터)
+    for rel, entry in sorted(entries.items(), reverse=True):
+        if entry["type"] == "dir":
+            os.chmod(dest / rel, entry["mode"])
+    return dest
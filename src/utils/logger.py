@@ -1,40 +1,209 @@
+import atexit
+import gzip
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+from datetime import datetime
 from pathlib import Path
-import json
+from src.utils.config import config_store
 
 CONFIG_PATH = Path("config/optimizer_settings.json")
 
-def get_logger(name=__name__):
-    logger = logging.getLogger(name)
+DEFAULT_SETTINGS = {
+    "enable": True,
+    "log_level": "INFO",
+    "log_file_path": "logs/system.log",
+    "max_log_size_mb": 50,
+    "backup_count": 5,
+    "compress_rotated": True,
+    "json_log_path": None,      # 지정하면 같은 기록을 JSON Lines 로도 저장
+    "queue_size": 0,            # 0 이면 무제한 (가득 차면 새 기록은 버리고 버린 개수를 다음 기록 앞에 경고로 남김)
+}
+FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+
+# LogRecord 기본 속성 (JSON 기록 시 extra 로 넘긴 필드만 골라내기 위함)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_lock = threading.Lock()
+_settings = None
+_queue_handler = None
+_listener = None
+_process = None
+
+
+def load_settings(config_path=CONFIG_PATH):
+    """log_management 설정 (프로세스당 1회만 읽고, 이후 log_level 변경은 구독으로 반영)"""
+    global _settings
+    if _settings is None:
+        store = config_store(config_path)
+        try:
+            config = store.section("log_management")
+        except Exception:
+            config = {}
+        _settings = dict(DEFAULT_SETTINGS, **config)
+        store.subscribe(_on_config_change)
+    return _settings
+
+
+def _level(settings):
+    return getattr(logging, str(settings["log_level"]).upper(), logging.INFO)
+
+
+def _on_config_change(document):
+    # 파일/핸들러 구성은 재시작 시 반영하고, 로그 레벨만 실행 중인 로거에 바로 적용
+    level = document.get("log_management", {}).get("log_level", DEFAULT_SETTINGS["log_level"])
+    if str(level).upper() == str(_settings["log_level"]).upper():
+        return
+    _settings["log_level"] = level
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if isinstance(logger, logging.Logger) and _queue_handler in logger.handlers:
+            logger.setLevel(_level(_settings))
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    큐가 가득 차면 기록을 버리고 개수만 셈 (기본 QueueHandler 는 queue.Full 을 handleError 로 넘겨 traceback 출력)
+    다시 자리가 나면 버린 개수를 경고 기록으로 먼저 넣음
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported = 0
+
+    def enqueue(self, record):
+        # Handler.handle 이 핸들러 잠금을 잡은 상태로 호출하므로 카운터 갱신은 스레드 안전
+        try:
+            if self.dropped > self._reported:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                    "msg": f"로그 대기열 가득 참 | 기록 {self.dropped - self._reported}건 버림"}))
+                self._reported = self.dropped
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
-    if logger.handlers:
-        return logger  # 이미 설정된 핸들러가 있다면 그대로 반환
 
-    logger.setLevel(logging.DEBUG)
+def set_process(name):
+    """
+    이 프로세스의 이름 (로그 파일을 system-<name>.log 처럼 분리)
+    GUI/데몬/스케줄러가 같은 파일을 각자 RotatingFileHandler 로 회전시키면 서로의 기록을 덮어쓰므로 프로세스별 파일 사용
+    """
+    global _process
+    with _lock:
+        if name == _process:
+            return
+        _process = name
+        if _listener is not None:
+            _stop()
+            _start(load_settings())
 
-    # 기본 로그 경로
-    default_log_path = Path("logs/system.log")
 
-    # 설정 파일에서 로그 경로 로드
-    try:
-        with open(CONFIG_PATH) as f:
-            config = json.load(f)
-            log_path = Path(config.get("log_management", {}).get("log_file_path", default_log_path))
-    except Exception:
-        log_path = default_log_path
+def process_log_path(path, process=None):
+    process = process or _process
+    if not process:
+        return path
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}-{process}{path.suffix}"))
 
-    log_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # 파일 핸들러 추가
-    file_handler = logging.FileHandler(log_path)
-    file_handler.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+def _gzip_namer(name):
+    return name + ".gz"
 
-    # 콘솔 출력도 유지하고 싶다면 StreamHandler도 추가
+
+def _gzip_rotator(source, dest):
+    # 회전된 파일만 압축 (백그라운드 스레드에서 실행되므로 호출 측은 기다리지 않음)
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _rotating_handler(path, settings):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=int(settings["max_log_size_mb"] * 1024 * 1024),
+        backupCount=settings["backup_count"], encoding="utf-8")
+    if settings["compress_rotated"]:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+def build_handlers(settings, process=None):
+    """실제로 기록하는 핸들러 목록 (QueueListener 스레드에서 실행, 파일은 프로세스별로 분리)"""
+    formatter = logging.Formatter(FORMAT)
+    handlers = []
+    if settings["enable"]:
+        file_handler = _rotating_handler(process_log_path(settings["log_file_path"], process), settings)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+        if settings.get("json_log_path"):
+            json_handler = _rotating_handler(process_log_path(settings["json_log_path"], process), settings)
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+    handlers.append(stream_handler)
+    return handlers
+
+
+def _start(settings):
+    global _queue_handler, _listener
+    if _queue_handler is None:
+        _queue_handler = DroppingQueueHandler(queue.Queue(settings["queue_size"]))
+        atexit.register(shutdown_logging)
+    # 종료 후 다시 시작해도 기존 로거가 가진 같은 큐를 계속 사용
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *build_handlers(settings),
+                                               respect_handler_level=True)
+    _listener.start()
+
+
+def _stop():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def shutdown_logging():
+    """대기 중인 기록을 모두 쓰고 백그라운드 스레드 종료"""
+    with _lock:
+        _stop()
+
+
+def get_logger(name=__name__):
+    logger = logging.getLogger(name)
+
+    if logger.handlers:
+        return logger  # 이미 설정된 핸들러가 있다면 그대로 반환
+
+    settings = load_settings()
+    with _lock:
+        if _listener is None:
+            _start(settings)
 
+    # 호출 스레드는 큐에 넣기만 하고 파일/콘솔 기록은 QueueListener 스레드가 수행
+    logger.setLevel(_level(settings))
+    logger.addHandler(_queue_handler)
     return logger
@@ -0,0 +1,382 @@
+import bisect
+import math
+import os
+import threading
+import time
+from src.utils.config import DEFAULT_CONFIG_PATH, config_store
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SETTINGS = {
+    "enable": True,
+    # node_exporter --collector.textfile.directory
+    "textfile_dir": "/var/lib/node_exporter/textfile_collector",
+    "interval_seconds": 60,
+}
+# 메트릭별 라벨 조합 상한 (초과분은 OVERFLOW 라벨 값 하나로 합침)
+MAX_SERIES = 200
+OVERFLOW = "__overflow__"
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+PREFIX = "linux_optimizer_"
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer() and abs(value) < 2 ** 53:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, documentation, labelnames=(), max_series=MAX_SERIES):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        # 새 시계열/스레드 셀 등록과 수집에만 사용 (값 갱신에는 사용하지 않음)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames} 필요, 받은 값 {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _bounded(self, key, known):
+        if key in known or len(known) < self.max_series:
+            return key
+        return (OVERFLOW,) * len(self.labelnames)
+
+
+class _ShardedMetric(_Metric):
+    """
+    스레드별 셀에 누적하고 수집할 때 합산 (갱신 경로에 락 없음)
+    셀은 소유 스레드만 수정하며, 종료된 스레드의 셀은 수집 시 합계에 합쳐 메모리를 회수
+    """
+
+    def __init__(self, name, documentation, labelnames=(), max_series=MAX_SERIES):
+        super().__init__(name, documentation, labelnames, max_series)
+        self._local = threading.local()
+        self._cells = []      # (스레드, 키, 셀)
+        self._retired = {}    # 키 -> 종료된 스레드 셀 합계
+        self._series = set()
+
+    def _cell_size(self):
+        raise NotImplementedError
+
+    def _cell(self, labels):
+        key = self._key(labels)
+        cells = getattr(self._local, "cells", None)
+        if cells is None:
+            cells = self._local.cells = {}
+        cell = cells.get(key)
+        if cell is None:
+            with self._lock:
+                bounded = self._bounded(key, self._series)
+                self._series.add(bounded)
+                cell = [0.0] * self._cell_size()
+                self._cells.append((threading.current_thread(), bounded, cell))
+            cells[key] = cell
+        return cell
+
+    def collect(self):
+        """키 -> 합산 셀"""
+        with self._lock:
+            alive = []
+            for thread, key, cell in self._cells:
+                if thread.is_alive():
+                    alive.append((thread, key, cell))
+                else:
+                    total = self._retired.setdefault(key, [0.0] * len(cell))
+                    for i, value in enumerate(cell):
+                        total[i] += value
+            self._cells = alive
+            totals = {key: list(cell) for key, cell in self._retired.items()}
+            for _, key, cell in alive:
+                total = totals.setdefault(key, [0.0] * len(cell))
+                for i, value in enumerate(cell):
+                    total[i] += value
+        return totals
+
+
+class Counter(_ShardedMetric):
+    kind = "counter"
+
+    def _cell_size(self):
+        return 1
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError(f"{self.name}: counter 는 감소할 수 없음")
+        self._cell(labels)[0] += amount
+
+    def samples(self):
+        for key, cell in sorted(self.collect().items()):
+            yield self.name, self.labelnames, key, (), cell[0]
+
+
+class Histogram(_ShardedMetric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, max_series=MAX_SERIES):
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(sorted(buckets))
+
+    def _cell_size(self):
+        # 버킷별 개수 (마지막은 +Inf), 합계, 개수
+        return len(self.buckets) + 3
+
+    def observe(self, value, **labels):
+        cell = self._cell(labels)
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def samples(self):
+        for key, cell in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), cell):
+                cumulative += count
+                yield f"{self.name}_bucket", self.labelnames, key, (("le", _format_value(bound)),), cumulative
+            yield f"{self.name}_sum", self.labelnames, key, (), cell[-2]
+            yield f"{self.name}_count", self.labelnames, key, (), cell[-1]
+
+
+class Gauge(_Metric):
+    """마지막으로 설정한 값 (dict 항목 대입 1회로 갱신)"""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), max_series=MAX_SERIES):
+        super().__init__(name, documentation, labelnames, max_series)
+        self._values = {}
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        if key not in self._values:
+            with self._lock:
+                key = self._bounded(key, self._values)
+        self._values[key] = float(value)
+
+    def set_to_current_time(self, **labels):
+        self.set(time.time(), **labels)
+
+    def samples(self):
+        for key, value in sorted(dict(self._values).items()):
+            yield self.name, self.labelnames, key, (), value
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, cls, name, documentation, labelnames=(), **kwargs):
+        """같은 이름이면 기존 메트릭 반환 (모듈 재import 등에 안전)"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"{name}: 다른 종류/라벨로 이미 등록됨")
+            return metric
+
+    def families(self, extra_labels=()):
+        """[(이름, 설명, 종류, [(샘플 키, 값)])] - 샘플 키는 '이름{라벨}' 문자열"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = []
+        for metric in metrics:
+            samples = [(f"{name}{_labels(names, key, tuple(extra_labels) + extra)}", value)
+                       for name, names, key, extra, value in metric.samples()]
+            families.append((metric.name, metric.documentation, metric.kind, samples))
+        return families
+
+
+REGISTRY = Registry()
+
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter, PREFIX + name, documentation, labelnames)
+
+
+def gauge(name, documentation, labelnames=()):
+    return REGISTRY.register(Gauge, PREFIX + name, documentation, labelnames)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram, PREFIX + name, documentation, labelnames, buckets=buckets)
+
+
+# ── textfile 출력 ──
+
+def parse_textfile(path):
+    """이전에 기록한 .prom -> {이름: [설명, 종류, {샘플 키: 값}]} (없으면 빈 dict)"""
+    families = {}
+    current = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return families
+    for line in lines:
+        if line.startswith("# HELP "):
+            name, _, documentation = line[7:].partition(" ")
+            current = families.setdefault(name, ["", "untyped", {}])
+            current[0] = documentation
+        elif line.startswith("# TYPE "):
+            name, _, kind = line[7:].partition(" ")
+            current = families.setdefault(name, ["", "untyped", {}])
+            current[1] = kind
+        elif line and not line.startswith("#") and current is not None:
+            key, _, value = line.rpartition(" ")
+            try:
+                current[2][key] = float(value)
+            except ValueError:
+                continue
+    return families
+
+
+class TextfileWriter:
+    """
+    레지스트리를 .prom 파일로 원자적으로 기록 (임시 파일 + rename)
+    짧게 실행되는 프로세스도 counter/histogram 이 계속 증가하도록 처음 기록할 때 기존 파일 값을 기준값으로 읽어 더함
+    """
+
+    def __init__(self, path, job, registry=REGISTRY):
+        self.path = path
+        self.job = job
+        self.registry = registry
+        self._baseline = None
+        self._lock = threading.Lock()
+
+    def render(self):
+        if self._baseline is None:
+            self._baseline = parse_textfile(self.path) if self.path else {}
+        merged = {name: [doc, kind, dict(samples)] for name, (doc, kind, samples) in self._baseline.items()}
+        for name, documentation, kind, samples in self.registry.families((("process", self.job),)):
+            family = merged.setdefault(name, [documentation, kind, {}])
+            family[0], family[1] = documentation, kind
+            base = self._baseline.get(name, [None, None, {}])[2]
+            for key, value in samples:
+                family[2][key] = value + base.get(key, 0.0) if kind in ("counter", "histogram") else value
+        lines = []
+        for name, (documentation, kind, samples) in sorted(merged.items()):
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{key} {_format_value(value)}" for key, value in samples.items())
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        with self._lock:
+            text = self.render()
+            directory = os.path.dirname(self.path) or "."
+            tmp = os.path.join(directory, f".{os.path.basename(self.path)}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.chmod(tmp, 0o644)
+            # textfile collector 가 쓰는 도중의 파일을 읽지 않도록 rename 으로 교체
+            os.replace(tmp, self.path)
+
+
+_job = "cli"
+_writers = {}
+_writers_lock = threading.Lock()
+_periodic = None
+
+
+def set_job(job):
+    """이 프로세스의 job 이름 (파일 이름과 process 라벨에 사용, 프로세스별 파일을 분리해 시계열 중복 방지)"""
+    global _job
+    _job = job
+
+
+def load_settings(config_path=DEFAULT_CONFIG_PATH):
+    try:
+        return dict(DEFAULT_SETTINGS, **config_store(config_path).section("metrics"))
+    except (OSError, ValueError):
+        return dict(DEFAULT_SETTINGS)
+
+
+def textfile_path(settings, job=None):
+    return os.path.join(settings["textfile_dir"], f"linux_optimizer_{job or _job}.prom")
+
+
+def _writer(settings):
+    path = textfile_path(settings)
+    with _writers_lock:
+        if path not in _writers:
+            _writers[path] = TextfileWriter(path, _job)
+        return _writers[path]
+
+
+def write_textfile(settings=None):
+    """설정에 따라 .prom 기록 (비활성화되었거나 디렉토리가 없으면 건너뜀, 기록하면 True)"""
+    settings = settings or load_settings()
+    if not settings.get("enable"):
+        return False
+    if not os.path.isdir(settings["textfile_dir"]):
+        logger.debug(f"[SKIP] 메트릭 | textfile 디렉토리 없음: {settings['textfile_dir']}")
+        return False
+    try:
+        _writer(settings).write()
+        return True
+    except OSError as e:
+        logger.warning(f"[FAIL] 메트릭 기록 실패 | 오류: {e}")
+        return False
+
+
+def exposition(job=None):
+    """이 프로세스의 현재 메트릭을 텍스트 형식으로 (파일 기준값 없이, 데몬 status/metrics 응답용)"""
+    return TextfileWriter(None, job or _job).render()
+
+
+def write_after_run():
+    """단발 실행 종료 시 기록 (상주 프로세스는 주기적으로 기록하므로 생략)"""
+    if _periodic is None:
+        write_textfile()
+
+
+def start_periodic(interval=None):
+    """
+    상주 프로세스용: interval 초마다 기록하는 데몬 스레드 시작
+    반환: 중지 함수 (스레드를 멈추고 마지막으로 1회 기록할 때까지 대기)
+    """
+    global _periodic
+    if _periodic is not None:
+        return _periodic
+    interval = interval or load_settings()["interval_seconds"]
+    stop_event = threading.Event()
+
+    def loop():
+        while not stop_event.wait(interval):
+            write_textfile()
+        write_textfile()
+
+    thread = threading.Thread(target=loop, name="metrics-textfile", daemon=True)
+    thread.start()
+
+    def stop(timeout=10):
+        global _periodic
+        stop_event.set()
+        thread.join(timeout)
+        _periodic = None
+
+    _periodic = stop
+    return stop
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import tarfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from src.utils import trace
+
+BLOCK_SIZE = 1024 * 1024
+
+
+def _compress_block(data, level):
+    # 블록마다 독립된 gzip 멤버로 압축 (zlib 은 압축 중 GIL 을 해제하므로 스레드 병렬화 가능)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class ParallelGzipWriter:
+    """
+    pigz 방식 병렬 gzip 압축기
+    입력을 BLOCK_SIZE 단위로 나눠 여러 스레드에서 압축하고 순서대로 기록
+    결과는 gzip 멤버를 이어 붙인 표준 형식이라 gzip/tar 등 기존 도구로 그대로 읽을 수 있음
+    """
+
+    def __init__(self, target, level=6, workers=None, block_size=BLOCK_SIZE):
+        if isinstance(target, (str, os.PathLike)):
+            self._file = open(target, "wb")
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self.level = level
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.block_size = block_size
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pgzip")
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._uncompressed = 0   # 지금까지 받은 원본 바이트 수
+        self._written = 0        # 지금까지 기록한 압축 바이트 수
+        # (원본 오프셋, 압축 오프셋) 블록 시작점 목록 - 임의 접근 인덱스용
+        self.blocks = []
+        self._next_block_offset = 0
+        # 기록한 압축 데이터의 sha256 (백업 카탈로그 체크섬용, 파일을 다시 읽지 않음)
+        self._digest = hashlib.sha256()
+        self.closed = False
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._uncompressed
+
+    @property
+    def checksum(self):
+        return self._digest.hexdigest()
+
+    def write(self, data):
+        self._buffer += data
+        self._uncompressed += len(data)
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[:self.block_size])
+            del self._buffer[:self.block_size]
+            self._submit(block)
+        return len(data)
+
+    def _submit(self, block):
+        self._pending.append((self._next_block_offset, self._pool.submit(_compress_block, block, self.level)))
+        self._next_block_offset += len(block)
+        # 압축 결과가 메모리에 무한정 쌓이지 않도록 진행 중인 블록 수를 제한
+        while len(self._pending) > self.workers * 2:
+            self._write_next()
+
+    def _write_next(self):
+        offset, future = self._pending.popleft()
+        payload = future.result()
+        self.blocks.append((offset, self._written))
+        self._file.write(payload)
+        self._digest.update(payload)
+        self._written += len(payload)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            # 남은 데이터 기록 (입력이 비어 있어도 유효한 gzip 이 되도록 빈 멤버 1개는 기록)
+            if self._buffer or (not self.blocks and not self._pending):
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._write_next()
+            # 압축 구간(trace span)에 원본/압축 크기 기록
+            trace.add(bytes=self._uncompressed, bytes_written=self._written)
+        finally:
+            self._pool.shutdown(wait=True)
+            self.closed = True
+            if self._owns_file:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def open_tar_gz(path, level=6, workers=None):
+    """병렬 gzip 으로 스트리밍 기록하는 tar 아카이브"""
+    with ParallelGzipWriter(path, level=level, workers=workers) as gz:
+        with tarfile.open(fileobj=gz, mode="w") as tar:
+            yield tar
+
+
+def compress_stream(f_in, dest_path, level=6, workers=None):
+    """압축 후 기록된 .gz 파일의 sha256 을 반환"""
+    with trace.span("compress", cat="compress", path=str(dest_path)), \
+            ParallelGzipWriter(dest_path, level=level, workers=workers) as gz:
+        while True:
+            data = f_in.read(BLOCK_SIZE)
+            if not data:
+                break
+            gz.write(data)
+    return gz.checksum
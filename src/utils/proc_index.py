@@ -0,0 +1,138 @@
+import errno
+import os
+import re
+from src.utils.fsroot import hermetic, host_path
+
+# scheduler_policy 이름 -> os 상수 (실시간 정책만 우선순위 1~99 사용)
+POLICIES = {
+    "SCHED_OTHER": os.SCHED_OTHER,
+    "SCHED_BATCH": os.SCHED_BATCH,
+    "SCHED_IDLE": os.SCHED_IDLE,
+    "SCHED_FIFO": os.SCHED_FIFO,
+    "SCHED_RR": os.SCHED_RR,
+}
+REALTIME_POLICIES = {os.SCHED_FIFO, os.SCHED_RR}
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        # 스캔 도중 종료된 프로세스
+        return None
+
+
+class ProcessIndex:
+    """
+    /proc 1회 스캔으로 만든 프로세스 색인
+    - 이름(comm) -> PID 목록, PID -> cmdline
+    - 스레드(TID)는 일치한 프로세스에 대해서만 /proc/<pid>/task 에서 읽어 캐시
+    자기 자신(현재 프로세스)은 pgrep 처럼 결과에서 제외
+    """
+
+    def __init__(self, proc_root="/proc"):
+        self.proc_root = host_path(proc_root)
+        self.by_name = {}
+        self.cmdlines = {}
+        self._tids = {}
+
+    @classmethod
+    def scan(cls, proc_root="/proc"):
+        index = cls(proc_root)
+        proc_root = index.proc_root
+        own_pid = os.getpid()
+        with os.scandir(proc_root) as it:
+            for entry in it:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                if pid == own_pid:
+                    continue
+                comm = _read(os.path.join(entry.path, "comm"))
+                if comm is None:
+                    continue
+                cmdline = _read(os.path.join(entry.path, "cmdline")) or b""
+                index.by_name.setdefault(comm.rstrip(b"\n").decode(errors="replace"), []).append(pid)
+                index.cmdlines[pid] = cmdline.replace(b"\0", b" ").strip().decode(errors="replace")
+        return index
+
+    def __len__(self):
+        return len(self.cmdlines)
+
+    def match(self, pattern, full=False):
+        """pgrep 과 같은 규칙: 이름(comm)에서 정규식 검색, full=True 면 전체 cmdline 에서 검색"""
+        regex = re.compile(pattern)
+        if full:
+            return sorted(pid for pid, cmdline in self.cmdlines.items() if regex.search(cmdline))
+        return sorted(pid for name, pids in self.by_name.items() if regex.search(name) for pid in pids)
+
+    def tids(self, pid):
+        """프로세스의 모든 스레드 ID (nice/스케줄러 정책은 스레드 단위로 적용되므로 필요)"""
+        if pid not in self._tids:
+            try:
+                self._tids[pid] = sorted(int(t) for t in os.listdir(os.path.join(self.proc_root, str(pid), "task")))
+            except OSError:
+                self._tids[pid] = []
+        return self._tids[pid]
+
+    def match_tids(self, pattern, full=False):
+        pids = self.match(pattern, full)
+        return pids, [tid for pid in pids for tid in self.tids(pid)]
+
+
+def _new_result():
+    return {"changed": 0, "unchanged": 0, "gone": 0, "failed": 0, "errors": []}
+
+
+def _record_error(result, tid, e):
+    if e.errno == errno.ESRCH:
+        # 적용 직전에 종료된 스레드
+        result["gone"] += 1
+    else:
+        result["failed"] += 1
+        result["errors"].append(f"{tid}: {e.strerror}")
+
+
+def _synthetic(result, tids):
+    # 합성 루트의 TID 는 실제 프로세스가 아니므로 시스템 콜을 호출하지 않음
+    result["gone"] = len(tids)
+    return result
+
+
+def set_nice(tids, nice):
+    """os.setpriority 로 스레드별 nice 값 적용 (이미 같은 값이면 건너뜀)"""
+    result = _new_result()
+    if hermetic():
+        return _synthetic(result, tids)
+    for tid in tids:
+        try:
+            if os.getpriority(os.PRIO_PROCESS, tid) == nice:
+                result["unchanged"] += 1
+                continue
+            os.setpriority(os.PRIO_PROCESS, tid, nice)
+            result["changed"] += 1
+        except OSError as e:
+            _record_error(result, tid, e)
+    return result
+
+
+def set_scheduler(tids, policy, priority=0):
+    """os.sched_setscheduler 로 스레드별 스케줄링 정책 적용 (이미 같으면 건너뜀)"""
+    if policy not in REALTIME_POLICIES:
+        priority = 0
+    param = os.sched_param(priority)
+    result = _new_result()
+    if hermetic():
+        return _synthetic(result, tids)
+    for tid in tids:
+        try:
+            if (os.sched_getscheduler(tid) == policy
+                    and os.sched_getparam(tid).sched_priority == priority):
+                result["unchanged"] += 1
+                continue
+            os.sched_setscheduler(tid, policy, param)
+            result["changed"] += 1
+        except OSError as e:
+            _record_error(result, tid, e)
+    return result
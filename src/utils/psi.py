@@ -0,0 +1,50 @@
+import os
+from src.utils.fsroot import host_path
+
+PRESSURE_DIR = "/proc/pressure"
+
+
+def parse_pressure(text):
+    """
+    PSI 파일 내용 -> {"some": {"avg10", "avg60", "avg300", "total"}, "full": {...}}
+    (cpu 처럼 full 줄이 없는 자원은 some 만 포함)
+    """
+    result = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        values = dict(field.split("=", 1) for field in fields)
+        result[kind] = {key: int(value) if key == "total" else float(value) for key, value in values.items()}
+    return result
+
+
+def read_pressure(resource, pressure_dir=PRESSURE_DIR):
+    with open(host_path(os.path.join(pressure_dir, resource)), "r") as f:
+        return parse_pressure(f.read())
+
+
+def psi_available(pressure_dir=PRESSURE_DIR):
+    return os.path.exists(host_path(os.path.join(pressure_dir, "memory")))
+
+
+class PsiTrigger:
+    """
+    PSI 트리거 fd: window_us 동안 stall_us 이상 정체되면 POLLPRI 이벤트 발생
+    (비특권 사용자는 window 가 2초 배수여야 하는 등 커널 제약이 있으므로 실패 시 주기 읽기로 대체)
+    """
+
+    def __init__(self, resource, kind="some", stall_us=150000, window_us=1000000, pressure_dir=PRESSURE_DIR):
+        self.resource = resource
+        self.fd = os.open(host_path(os.path.join(pressure_dir, resource)), os.O_RDWR | os.O_NONBLOCK)
+        try:
+            os.write(self.fd, f"{kind} {stall_us} {window_us}\0".encode())
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
@@ -0,0 +1,73 @@
+import re
+from datetime import datetime
+
+DAY_SECONDS = 86400
+
+# GFS 단계별 기간 키 (같은 키를 가진 백업 중 가장 최근 1개만 해당 단계에서 보존)
+GFS_TIERS = {
+    "daily": lambda dt: dt.date(),
+    "weekly": lambda dt: dt.isocalendar()[:2],
+    "monthly": lambda dt: (dt.year, dt.month),
+}
+
+_TIMESTAMP_PREFIX = re.compile(r"^\d{8}_\d{6}_")
+
+
+def group_key(backup):
+    """보존 정책은 원본 경로별로 적용 (원본을 모르는 기존 백업은 타임스탬프를 뗀 이름 기준)"""
+    return backup.get("source") or _TIMESTAMP_PREFIX.sub("", backup["name"])
+
+
+def _gfs_keep(items, gfs):
+    keep = set()
+    for tier, count in (gfs or {}).items():
+        if tier not in GFS_TIERS or not count:
+            continue
+        seen = set()
+        for backup in items:
+            key = GFS_TIERS[tier](datetime.fromtimestamp(backup["created"]))
+            if key in seen:
+                continue
+            if len(seen) >= count:
+                break
+            seen.add(key)
+            keep.add(backup["name"])
+    return keep
+
+
+def plan_retention(backups, now, max_age_days=None, keep_last=None, gfs=None, dependencies=None):
+    """
+    카탈로그 행 목록으로 한 번에 보존/삭제 대상을 계산 (파일 시스템 접근 없음)
+    - 원본별 최신 keep_last 개 이내이면서 max_age_days 이내인 백업은 보존
+    - gfs: {"daily": N, "weekly": N, "monthly": N} 단계별 대표 백업은 기간/개수 제한과 무관하게 보존
+    - 원본별 가장 최근 백업은 항상 보존
+    - 보존 대상이 복원에 필요로 하는 백업(증분 체인)은 만료돼도 함께 보존
+    반환: {"keep": 이름 집합, "delete": 삭제할 행 목록(오래된 순), "pinned": 의존성 때문에 남긴 이름 집합}
+    """
+    dependencies = dependencies or {}
+    groups = {}
+    for backup in backups:
+        groups.setdefault(group_key(backup), []).append(backup)
+
+    keep = set()
+    for items in groups.values():
+        items.sort(key=lambda b: (b["created"], b["name"]), reverse=True)
+        keep.add(items[0]["name"])
+        for position, backup in enumerate(items):
+            within_count = keep_last is None or position < keep_last
+            within_age = max_age_days is None or now - backup["created"] <= max_age_days * DAY_SECONDS
+            if within_count and within_age:
+                keep.add(backup["name"])
+        keep |= _gfs_keep(items, gfs)
+
+    pinned = set()
+    stack = list(keep)
+    while stack:
+        for required in dependencies.get(stack.pop(), ()):
+            if required not in keep:
+                keep.add(required)
+                pinned.add(required)
+                stack.append(required)
+
+    delete = sorted((b for b in backups if b["name"] not in keep), key=lambda b: (b["created"], b["name"]))
+    return {"keep": keep, "delete": delete, "pinned": pinned}
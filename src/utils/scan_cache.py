@@ -0,0 +1,91 @@
+import json
+import os
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL,
+    remaining INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pending (
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    due REAL NOT NULL,
+    PRIMARY KEY (dir, name)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_UNDER_ROOT = "(path = ? OR substr(path, 1, ?) = ?)"
+
+
+class ScanCache:
+    """
+    unified_cleanup 증분 스캔용 디렉토리 인덱스 (SQLite)
+    - dirs: 디렉토리별 mtime, 하위 디렉토리 목록, 정리 후 남은 항목 수
+    - pending: 아직 min_file_age_minutes 에 도달하지 않은 빈 파일과 재검사 시각
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def _root_args(self, root):
+        prefix = root.rstrip("/") + "/"
+        return (root, len(prefix), prefix)
+
+    def load(self, root):
+        """root 하위의 캐시를 ({dir: (mtime_ns, subdirs, remaining)}, {dir: {name: due}}) 로 반환"""
+        args = self._root_args(root)
+        with self._lock:
+            dir_rows = self._conn.execute(
+                f"SELECT path, mtime_ns, subdirs, remaining FROM dirs WHERE {_UNDER_ROOT}", args).fetchall()
+            pending_rows = self._conn.execute(
+                f"SELECT dir, name, due FROM pending WHERE {_UNDER_ROOT.replace('path', 'dir')}", args).fetchall()
+
+        dirs = {path: (mtime_ns, json.loads(subdirs), remaining) for path, mtime_ns, subdirs, remaining in dir_rows}
+        pending = {}
+        for dir_path, name, due in pending_rows:
+            pending.setdefault(dir_path, {})[name] = due
+        return dirs, pending
+
+    def store(self, root, dirs, pending):
+        """root 하위 캐시를 이번 실행 결과로 교체 (단일 트랜잭션)"""
+        args = self._root_args(root)
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM dirs WHERE {_UNDER_ROOT}", args)
+            self._conn.execute(f"DELETE FROM pending WHERE {_UNDER_ROOT.replace('path', 'dir')}", args)
+            self._conn.executemany(
+                "INSERT INTO dirs (path, mtime_ns, subdirs, remaining) VALUES (?, ?, ?, ?)",
+                ((path, mtime_ns, json.dumps(subdirs), remaining)
+                 for path, (mtime_ns, subdirs, remaining) in dirs.items()))
+            self._conn.executemany(
+                "INSERT INTO pending (dir, name, due) VALUES (?, ?, ?)",
+                ((dir_path, name, due) for dir_path, names in pending.items() for name, due in names.items()))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM dirs")
+            self._conn.execute("DELETE FROM pending")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
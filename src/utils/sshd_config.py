@@ -0,0 +1,139 @@
+import glob
+import os
+import re
+import subprocess
+from src.utils.fsroot import hermetic, host_path
+
+SSHD_CONFIG = "/etc/ssh/sshd_config"
+MAX_INCLUDE_DEPTH = 16
+
+_DIRECTIVE_RE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9]*)(?:\s*=\s*|\s+)(.*?)\s*$")
+_COMMENTED_RE = re.compile(r"^\s*#\s*([A-Za-z][A-Za-z0-9]*)(?:\s*=\s*|\s+)")
+
+
+def validate_sshd(path):
+    """sshd -t 로 문법 검사 -> (성공 여부, 오류 메시지), sshd 가 없으면 (None, 사유)"""
+    if hermetic():
+        return None, "합성 루트 사용 중"
+    try:
+        result = subprocess.run(["sshd", "-t", "-f", path], capture_output=True, text=True)
+    except OSError as e:
+        return None, str(e)
+    return result.returncode == 0, result.stderr.strip()
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+    os.replace(tmp, path)
+
+
+class SshdConfig:
+    """
+    sshd_config 와 Include 된 파일을 한 번에 읽어 메모리에서 수정
+    - sshd 와 같이 전역 영역(Match 밖)에서 처음 나온 값이 유효값
+    - 값을 바꿀 때는 유효값이 있는 줄(Include 파일 포함)을 고치고, 없으면 주 파일의 첫 Match 앞에 추가
+    """
+
+    def __init__(self, path=SSHD_CONFIG):
+        self.path = path
+        self.base_dir = os.path.dirname(path)
+        self.files = {}       # 경로 -> 줄 목록 (파일은 한 번만 읽음)
+        self.originals = {}   # 경로 -> 읽은 내용
+        self.entries = []     # 적용 순서대로 (소문자 키, 값, 경로, 줄 번호, Match 안 여부)
+        self._index()
+
+    def _lines(self, path):
+        if path not in self.files:
+            with open(path, "r") as f:
+                self.originals[path] = f.read()
+            self.files[path] = self.originals[path].splitlines()
+        return self.files[path]
+
+    def _index(self):
+        self.entries = []
+        self._scan(self.path, False, 0, set())
+
+    def _scan(self, path, in_match, depth, seen):
+        if depth > MAX_INCLUDE_DEPTH or path in seen:
+            return in_match
+        seen.add(path)
+        for number, line in enumerate(self._lines(path)):
+            match = _DIRECTIVE_RE.match(line)
+            if not match:
+                continue
+            key, value = match.group(1).lower(), match.group(2)
+            if key == "match":
+                in_match = True
+            elif key == "include":
+                # Include 는 그 자리에 파일 내용을 펼친 것과 같음 (Match 안이면 Match 조건 적용)
+                for pattern in value.split():
+                    if not os.path.isabs(pattern):
+                        pattern = os.path.join(self.base_dir, pattern)
+                    pattern = host_path(pattern)
+                    for included in sorted(glob.glob(pattern)):
+                        self._scan(included, in_match, depth + 1, seen)
+            self.entries.append((key, value, path, number, in_match))
+        return in_match
+
+    def get(self, key):
+        key = key.lower()
+        return next((value for k, value, _, _, in_match in self.entries if k == key and not in_match), None)
+
+    def set(self, key, value):
+        """전역 유효값을 변경 (이미 같으면 False)"""
+        value = str(value)
+        current = self.get(key)
+        if current is not None and current.lower() == value.lower():
+            return False
+        line = f"{key} {value}"
+        for k, _, path, number, in_match in self.entries:
+            if k == key.lower() and not in_match:
+                self.files[path][number] = line
+                break
+        else:
+            lines = self.files[self.path]
+            match_at = next((number for k, _, path, number, _ in self.entries
+                             if k == "match" and path == self.path), len(lines))
+            # 주석 처리된 기본값 줄이 있으면 그 자리에 기록
+            commented = next((i for i, text in enumerate(lines[:match_at])
+                              if (m := _COMMENTED_RE.match(text)) and m.group(1).lower() == key.lower()), None)
+            if commented is not None:
+                lines[commented] = line
+            else:
+                lines.insert(match_at, line)
+        self._index()
+        return True
+
+    def changed_files(self):
+        return {path: "\n".join(lines) + "\n" for path, lines in self.files.items()
+                if lines != self.originals[path].splitlines()}
+
+    def write(self, validate=validate_sshd):
+        """
+        변경된 파일만 원자적으로 기록 후 sshd -t 로 검사, 실패하면 원래 내용으로 되돌림
+        반환: 기록한 파일 목록 (변경 없음이면 빈 목록), 검사 실패 시 ValueError
+        """
+        changed = self.changed_files()
+        if not changed:
+            return []
+        written = []
+        try:
+            for path, text in changed.items():
+                _write_atomic(path, text)
+                written.append(path)
+            ok, error = validate(self.path)
+        except OSError:
+            for path in written:
+                _write_atomic(path, self.originals[path])
+            raise
+        if ok is False:
+            for path in written:
+                _write_atomic(path, self.originals[path])
+            raise ValueError(f"sshd -t 검사 실패: {error}")
+        self.originals.update(changed)
+        return written
@@ -0,0 +1,166 @@
+import os
+import random
+import time
+
+# 실제 pid_max(최대 4194304)보다 큰 번호를 사용해 실제 프로세스와 겹치지 않게 함
+PID_BASE = 10_000_000
+PROCESS_NAMES = ["nginx", "postgres", "python3", "java", "sshd", "bash", "redis-server", "node",
+                 "kworker/0:1", "systemd-journal", "containerd", "dockerd"]
+# 이름별 장치 종류 (classify 기준: nvme 접두사, rotational 값, device 디렉토리 유무)
+DEVICE_KINDS = [("sd", "1", True), ("nvme", "0", True), ("sd", "0", True), ("dm-", "0", False), ("loop", "0", False)]
+SCHEDULERS = "[mq-deadline] kyber bfq none"
+
+SCALES = {
+    "small": {"pids": 300, "threads_per_pid": 2, "cpus": 4, "block_devices": 6,
+              "temp_files": 5_000, "temp_fanout": 500, "backup_files": 300, "blocked_ports": 50},
+    "medium": {"pids": 5_000, "threads_per_pid": 4, "cpus": 32, "block_devices": 24,
+               "temp_files": 100_000, "temp_fanout": 1_000, "backup_files": 3_000, "blocked_ports": 300},
+    "large": {"pids": 20_000, "threads_per_pid": 8, "cpus": 128, "block_devices": 64,
+              "temp_files": 1_000_000, "temp_fanout": 2_000, "backup_files": 20_000, "blocked_ports": 1_000},
+}
+
+UFW_USER_RULES_TEMPLATE = """*filter
+:ufw-user-input - [0:0]
+:ufw-user-output - [0:0]
+:ufw-user-forward - [0:0]
+### RULES ###
+
+### tuple ### allow tcp 22 0.0.0.0/0 any 0.0.0.0/0 in
+-A ufw-user-input -p tcp --dport 22 -j ACCEPT
+
+### END RULES ###
+COMMIT
+"""
+
+SSHD_CONFIG_TEMPLATE = """Include /etc/ssh/sshd_config.d/*.conf
+#PermitRootLogin prohibit-password
+#MaxAuthTries 6
+PasswordAuthentication yes
+UsePAM yes
+Subsystem sftp /usr/lib/openssh/sftp-server
+Match User backup
+    PasswordAuthentication yes
+"""
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _root_path(root, path):
+    return os.path.join(root, path.lstrip("/"))
+
+
+def build_proc(root, pids, threads_per_pid, **_):
+    """/proc/<pid>/{comm,cmdline,task/<tid>}, /proc/sys, /proc/pressure"""
+    proc = _root_path(root, "/proc")
+    for i in range(pids):
+        pid = PID_BASE + i * (threads_per_pid + 1)
+        name = PROCESS_NAMES[i % len(PROCESS_NAMES)]
+        base = os.path.join(proc, str(pid))
+        _write(os.path.join(base, "comm"), name + "\n")
+        _write(os.path.join(base, "cmdline"), f"/usr/bin/{name}\0--worker\0{i}\0")
+        for tid in range(pid, pid + threads_per_pid):
+            os.makedirs(os.path.join(base, "task", str(tid)), exist_ok=True)
+    reset_proc_sys(root)
+    pressure = "some avg10=0.00 avg60=0.00 avg300=0.00 total=0\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+    for resource in ("memory", "io", "cpu"):
+        _write(_root_path(root, f"/proc/pressure/{resource}"), pressure)
+
+
+def reset_proc_sys(root):
+    for key, value in {"vm/swappiness": "60", "vm/drop_caches": "0", "vm/compact_memory": "0",
+                       "kernel/pid_max": "4194304"}.items():
+        _write(_root_path(root, f"/proc/sys/{key}"), value + "\n")
+
+
+def build_sys(root, cpus, block_devices, **_):
+    """cpufreq governor, dmi, /sys/block/<dev>/queue (실행할 때마다 초기값으로 되돌림)"""
+    _write(_root_path(root, "/sys/class/dmi/id/product_name"), "Synthetic Machine\n")
+    for cpu in range(cpus):
+        _write(_root_path(root, f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_governor"), "powersave\n")
+    counters = {}
+    for i in range(block_devices):
+        prefix, rotational, hardware = DEVICE_KINDS[i % len(DEVICE_KINDS)]
+        index = counters.get(prefix, 0)
+        counters[prefix] = index + 1
+        if prefix == "sd":
+            name = f"sd{chr(ord('a') + index % 26)}{index // 26 or ''}"
+        elif prefix == "nvme":
+            name = f"nvme{index}n1"
+        else:
+            name = f"{prefix}{index}"
+        base = _root_path(root, f"/sys/block/{name}")
+        _write(os.path.join(base, "size"), "976773168\n")
+        if hardware:
+            os.makedirs(os.path.join(base, "device"), exist_ok=True)
+        queue = {"rotational": rotational, "scheduler": SCHEDULERS, "read_ahead_kb": "128",
+                 "nr_requests": "64", "rq_affinity": "1", "nomerges": "0"}
+        for attr, value in queue.items():
+            _write(os.path.join(base, "queue", attr), value + "\n")
+
+
+def build_etc(root, **_):
+    """ufw / sshd 설정 (실행할 때마다 초기값으로 되돌림)"""
+    _write(_root_path(root, "/etc/ufw/ufw.conf"), "ENABLED=yes\nLOGLEVEL=low\n")
+    _write(_root_path(root, "/etc/default/ufw"),
+           'IPV6=yes\nDEFAULT_INPUT_POLICY="ACCEPT"\nDEFAULT_OUTPUT_POLICY="ACCEPT"\n')
+    _write(_root_path(root, "/etc/ufw/user.rules"), UFW_USER_RULES_TEMPLATE)
+    _write(_root_path(root, "/etc/ufw/user6.rules"),
+           UFW_USER_RULES_TEMPLATE.replace("ufw-", "ufw6-").replace("0.0.0.0/0", "::/0"))
+    _write(_root_path(root, "/etc/ssh/sshd_config"), SSHD_CONFIG_TEMPLATE)
+    _write(_root_path(root, "/etc/ssh/sshd_config.d/50-cloud-init.conf"), "PasswordAuthentication yes\n")
+
+
+def build_temp_tree(root, temp_files, temp_fanout, seed=0, **_):
+    """
+    정리 대상 임시 디렉토리: temp_fanout 개 파일씩 하위 디렉토리에 나눠 생성
+    절반은 오래된 파일(삭제 대상), 일부 디렉토리는 비워 둠
+    """
+    rng = random.Random(seed)
+    tmp = _root_path(root, "/tmp/synthetic")
+    old = time.time() - 7 * 86400
+    for d in range(0, temp_files, temp_fanout):
+        directory = os.path.join(tmp, f"d{d // temp_fanout:05d}")
+        os.makedirs(directory, exist_ok=True)
+        for i in range(d, min(d + temp_fanout, temp_files)):
+            path = os.path.join(directory, f"f{i:07d}.tmp")
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            if rng.random() < 0.2:
+                os.write(fd, b"x" * rng.randint(1, 512))
+            os.close(fd)
+            if i % 2 == 0:
+                os.utime(path, (old, old))
+    os.makedirs(os.path.join(tmp, "empty", "nested"), exist_ok=True)
+    return tmp
+
+
+def build_backup_source(root, backup_files, seed=0, **_):
+    """백업 대상: 크기가 다양한 파일 (일부는 내용이 같아 중복 제거 효과를 볼 수 있음)"""
+    rng = random.Random(seed)
+    source = _root_path(root, "/home/user/data")
+    shared = rng.randbytes(64 * 1024)
+    for i in range(backup_files):
+        path = os.path.join(source, f"dir{i % 20:02d}", f"file{i:06d}.bin")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(shared if i % 5 == 0 else rng.randbytes(rng.randint(100, 32 * 1024)))
+    return source
+
+
+def build_synthetic_root(root, scale="small", seed=0, **overrides):
+    """
+    합성 /proc, /sys, /etc 와 임시/백업 디렉토리를 root 아래에 생성
+    반환: 생성한 경로와 크기 정보
+    """
+    sizes = dict(SCALES[scale] if isinstance(scale, str) else scale, **overrides)
+    root = os.path.abspath(root)
+    build_proc(root, **sizes)
+    build_sys(root, **sizes)
+    build_etc(root, **sizes)
+    tmp = build_temp_tree(root, seed=seed, **sizes)
+    source = build_backup_source(root, seed=seed, **sizes)
+    return {"root": root, "sizes": sizes, "tmp_dir": tmp, "backup_source": source,
+            "process_names": PROCESS_NAMES}
@@ -1,8 +1,18 @@
+import glob
+from src.utils.fsroot import host_path
+
+GOVERNOR_GLOB = "/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_governor"
+
+
 def is_virtual_machine():
     try:
-        with open("/sys/class/dmi/id/product_name", "r") as f:
+        with open(host_path("/sys/class/dmi/id/product_name"), "r") as f:
             name = f.read().lower()
             return any(kw in name for kw in ["vmware", "virtualbox", "qemu", "kvm", "hyper-v"])
     except Exception:
         return False
 
+
+def governor_paths():
+    return glob.glob(host_path(GOVERNOR_GLOB))
+
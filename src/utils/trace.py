@@ -0,0 +1,211 @@
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# 추적이 꺼져 있으면 span() 은 전역 변수 확인 1회 후 공용 빈 객체를 반환 (기록/시간 측정 없음)
+_tracer = None
+_local = threading.local()
+THREAD_IO = "/proc/thread-self/io"
+MAX_EVENTS = 200_000
+
+
+def _thread_syscalls():
+    """현재 스레드의 read/write 계열 시스템 콜 누적 횟수 (지원하지 않으면 None)"""
+    try:
+        with open(THREAD_IO, "rb") as f:
+            fields = dict(line.split(b":", 1) for line in f.read().splitlines() if b":" in line)
+        return int(fields[b"syscr"]) + int(fields[b"syscw"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, **counters):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    구간 1개: 벽시계/CPU 시간, 시스템 콜 수, 카운터(bytes, subprocesses 등)
+    카운터는 종료 시 같은 스레드의 상위 구간에도 더해짐
+    """
+
+    __slots__ = ("tracer", "name", "cat", "args", "counters", "_wall", "_cpu", "_syscalls")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.counters = {}
+
+    def add(self, **counters):
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self._syscalls = _thread_syscalls()
+        self._cpu = time.thread_time_ns()
+        self._wall = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter_ns() - self._wall
+        cpu = time.thread_time_ns() - self._cpu
+        syscalls = _thread_syscalls()
+        stack = _local.stack
+        stack.pop()
+        if syscalls is not None and self._syscalls is not None:
+            self.counters["syscalls"] = syscalls - self._syscalls
+        if stack:
+            parent = stack[-1]
+            parent.add(**{k: v for k, v in self.counters.items() if k != "syscalls"})
+        if exc_type is not None:
+            self.args = dict(self.args, error=exc_type.__name__)
+        self.tracer.record(self, wall, cpu)
+        return False
+
+
+class Tracer:
+    def __init__(self, max_events=MAX_EVENTS):
+        self.pid = os.getpid()
+        self.origin = time.perf_counter_ns()
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self.threads = {}
+        self._lock = threading.Lock()
+
+    def record(self, span, wall_ns, cpu_ns):
+        event = (span.name, span.cat, span._wall - self.origin, wall_ns, cpu_ns,
+                 threading.get_native_id(), span.args, span.counters)
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            self.events.append(event)
+            self.threads.setdefault(event[5], threading.current_thread().name)
+
+    def chrome_trace(self):
+        """Chrome trace-event 형식 (chrome://tracing, Perfetto 에서 열기)"""
+        trace_events = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                        for tid, name in self.threads.items()]
+        for name, cat, start, wall, cpu, tid, args, counters in self.events:
+            trace_events.append({
+                "name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": tid,
+                "ts": start / 1000, "dur": wall / 1000,
+                "args": {**args, **counters, "cpu_ms": round(cpu / 1e6, 3)},
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped}}
+
+    def write_chrome_trace(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False, default=str)
+
+    def summary(self):
+        """구간 이름별 합계: count, wall_ms, cpu_ms, 카운터 합 (wall_ms 큰 순)"""
+        rows = {}
+        for name, cat, _, wall, cpu, _, _, counters in self.events:
+            row = rows.setdefault(name, {"name": name, "cat": cat, "count": 0, "wall_ms": 0.0, "cpu_ms": 0.0})
+            row["count"] += 1
+            row["wall_ms"] += wall / 1e6
+            row["cpu_ms"] += cpu / 1e6
+            for key, value in counters.items():
+                row[key] = row.get(key, 0) + value
+        return sorted(rows.values(), key=lambda row: row["wall_ms"], reverse=True)
+
+
+def enabled():
+    return _tracer is not None
+
+
+def start(max_events=MAX_EVENTS):
+    global _tracer
+    _tracer = Tracer(max_events)
+    return _tracer
+
+
+def stop():
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def span(name, cat="app", **args):
+    """with trace.span("cleanup.walk", cat="cleanup", path=p) as s: ... s.add(bytes=n)"""
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return Span(tracer, name, cat, args)
+
+
+def add(**counters):
+    """현재 스레드에서 열려 있는 가장 안쪽 구간에 카운터 누적"""
+    if _tracer is None:
+        return
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].add(**counters)
+
+
+def traced(name=None, cat="app"):
+    """함수 전체를 구간으로 기록하는 데코레이터"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with Span(_tracer, span_name, cat, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def format_summary(rows):
+    lines = [f"{'구간':<28} {'횟수':>6} {'wall(ms)':>11} {'cpu(ms)':>11} {'syscalls':>9} {'프로세스':>8} {'bytes':>14}"]
+    for row in rows:
+        lines.append(f"{row['name'][:28]:<28} {row['count']:>6} {row['wall_ms']:>11.1f} {row['cpu_ms']:>11.1f} "
+                     f"{row.get('syscalls', '-'):>9} {row.get('subprocesses', 0):>8} {row.get('bytes', 0):>14}")
+    return lines
+
+
+@contextlib.contextmanager
+def profile(path, stream=None):
+    """path 가 있으면 블록 실행 동안 추적하고 Chrome trace JSON 저장 + 요약표 출력 (없으면 아무것도 안 함)"""
+    if not path:
+        yield None
+        return
+    tracer = start()
+    try:
+        yield tracer
+    finally:
+        stop()
+        tracer.write_chrome_trace(path)
+        stream = stream or sys.stderr
+        for line in format_summary(tracer.summary()):
+            print(line, file=stream)
+        print(f"-- trace 저장: {path} (구간 {len(tracer.events)}개"
+              + (f", 누락 {tracer.dropped}개" if tracer.dropped else "") + ")", file=stream)
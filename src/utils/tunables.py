@@ -0,0 +1,106 @@
+import os
+import re
+from src.utils.fsroot import host_path
+
+PROC_SYS = "/proc/sys"
+
+# 읽기가 불가능하거나 값이 유지되지 않는 트리거성 키는 항상 기록
+WRITE_ONLY_KEYS = {"vm.drop_caches", "vm.compact_memory"}
+
+_SELECTED_RE = re.compile(r"\[([^\]]+)\]")
+
+
+def tunable_path(key):
+    """sysctl 키(vm.swappiness) 또는 절대 경로(/sys/...)를 실제 파일 경로로 변환"""
+    if key.startswith("/"):
+        return host_path(key)
+    return host_path(os.path.join(PROC_SYS, *key.split(".")))
+
+
+def parse_value(raw):
+    """'mq-deadline [none]' 처럼 선택지 형식이면 선택된 값만 반환"""
+    raw = raw.strip()
+    match = _SELECTED_RE.search(raw)
+    if match:
+        return match.group(1)
+    return raw
+
+
+def parse_choices(raw):
+    """선택지 형식 파일의 전체 선택지 목록 ('[none] mq-deadline' -> ['none', 'mq-deadline'])"""
+    return [token.strip("[]") for token in raw.split()]
+
+
+def read_tunable(key):
+    path = tunable_path(key)
+    with open(path, "r") as f:
+        return parse_value(f.read())
+
+
+def _same_value(current, desired):
+    # 탭/공백 구분 다중 값(net.ipv4.tcp_rmem 등)도 동일하게 비교
+    return current.split() == desired.split()
+
+
+def _write(path, value):
+    # sysfs/procfs 는 한 번의 write 로 값을 받아야 하므로 버퍼 없이 직접 기록
+    fd = os.open(path, os.O_WRONLY | os.O_TRUNC)
+    try:
+        os.write(fd, value.encode())
+    finally:
+        os.close(fd)
+
+
+def write_tunables(values, dry_run=False):
+    """
+    {키: 값} 을 순서대로 적용하고 키별 결과 목록을 반환
+    status: changed / unchanged / failed / planned(dry_run)
+    """
+    items = values.items() if isinstance(values, dict) else values
+    results = []
+    for key, value in items:
+        path = tunable_path(key)
+        desired = str(value).strip()
+        result = {"key": key, "path": path, "old": None, "new": desired, "status": None, "error": None}
+
+        if key not in WRITE_ONLY_KEYS:
+            try:
+                result["old"] = read_tunable(path)
+            except OSError as e:
+                result["status"] = "failed"
+                result["error"] = str(e)
+                results.append(result)
+                continue
+            if _same_value(result["old"], desired):
+                result["status"] = "unchanged"
+                results.append(result)
+                continue
+
+        if dry_run:
+            result["status"] = "planned"
+            results.append(result)
+            continue
+
+        try:
+            _write(path, desired)
+            result["status"] = "changed"
+        except OSError as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        results.append(result)
+    return results
+
+
+def log_tunable_results(logger, results):
+    failed = 0
+    for r in results:
+        if r["status"] == "changed":
+            logger.info(f"[PASS] {r['key']}={r['new']} (이전: {r['old']})")
+        elif r["status"] == "unchanged":
+            logger.debug(f"[변경 없음] {r['key']}={r['new']}")
+        elif r["status"] == "planned":
+            logger.info(f"[계획] {r['key']}: {r['old']} -> {r['new']}")
+        else:
+            failed += 1
+            logger.error(f"[FAIL] {r['key']}={r['new']} | 오류: {r['error']}")
+    return failed == 0
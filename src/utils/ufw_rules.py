@@ -0,0 +1,252 @@
+import os
+import re
+
+UFW_CONF = "/etc/ufw/ufw.conf"
+UFW_DEFAULTS = "/etc/default/ufw"
+UFW_USER_RULES = ("/etc/ufw/user.rules", "/etc/ufw/user6.rules")
+
+RULES_BEGIN = "### RULES ###"
+RULES_END = "### END RULES ###"
+TUPLE_PREFIX = "### tuple ###"
+
+# 이 도구가 추가한 규칙 표시 (ufw status 에 주석으로 보이며, 설정에서 빠지면 이 규칙만 삭제)
+MANAGED_COMMENT = "linux-optimizer"
+MULTIPORT_LIMIT = 15
+TARGETS = {"deny": "DROP", "reject": "REJECT", "allow": "ACCEPT"}
+ANY_ADDRESSES = ("0.0.0.0/0", "::/0")
+POLICY_VARS = {"incoming": "DEFAULT_INPUT_POLICY", "outgoing": "DEFAULT_OUTPUT_POLICY"}
+
+
+def _read_text(path):
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+    os.replace(tmp, path)
+
+
+def parse_port_spec(spec):
+    """
+    blocked_ports 항목 -> [(proto, dport)]
+    23, "23/tcp", "6000:6007" 또는 "6000-6007"(범위), "80,443,8000:8080/tcp"(집합)
+    범위/집합은 multiport 라 프로토콜이 필요하므로 지정하지 않으면 tcp/udp 로 나눔
+    """
+    text = str(spec).replace(" ", "").lower()
+    proto = "any"
+    if "/" in text:
+        text, proto = text.split("/", 1)
+    if proto not in ("any", "tcp", "udp"):
+        raise ValueError(f"지원하지 않는 프로토콜: {spec}")
+
+    ports = []
+    for part in text.split(","):
+        bounds = re.split(r"[:-]", part)
+        if len(bounds) > 2 or not all(b.isdigit() for b in bounds):
+            raise ValueError(f"잘못된 포트: {spec}")
+        low, high = int(bounds[0]), int(bounds[-1])
+        if not 1 <= low <= high <= 65535:
+            raise ValueError(f"포트 범위 오류: {spec}")
+        ports.append(str(low) if low == high else f"{low}:{high}")
+
+    if len(ports) == 1 and ":" not in ports[0]:
+        return [(proto, ports[0])]
+
+    # multiport 는 규칙당 포트 15개까지 (범위는 2개로 계산)
+    chunks, chunk, weight = [], [], 0
+    for port in ports:
+        cost = 2 if ":" in port else 1
+        if chunk and weight + cost > MULTIPORT_LIMIT:
+            chunks.append(chunk)
+            chunk, weight = [], 0
+        chunk.append(port)
+        weight += cost
+    chunks.append(chunk)
+    protos = ["tcp", "udp"] if proto == "any" else [proto]
+    return [(p, ",".join(c)) for p in protos for c in chunks]
+
+
+def compile_rules(blocked_ports, directions=("in", "out"), action="deny"):
+    """설정의 포트 목록 -> 중복 없는 규칙 키 목록 [(action, proto, dport, direction)]"""
+    rules = []
+    for spec in blocked_ports:
+        for proto, dport in parse_port_spec(spec):
+            for direction in directions:
+                rule = (action, proto, dport, direction)
+                if rule not in rules:
+                    rules.append(rule)
+    return rules
+
+
+def tuple_line(rule, v6=False, comment=MANAGED_COMMENT):
+    action, proto, dport, direction = rule
+    anywhere = ANY_ADDRESSES[1] if v6 else ANY_ADDRESSES[0]
+    line = f"{TUPLE_PREFIX} {action} {proto} {dport} {anywhere} any {anywhere} {direction}"
+    if comment:
+        line += f" comment={comment.encode().hex()}"
+    return line
+
+
+def iptables_lines(rule, v6=False):
+    action, proto, dport, direction = rule
+    chain = f"{'ufw6' if v6 else 'ufw'}-user-{'input' if direction == 'in' else 'output'}"
+    match = f"-m multiport --dports {dport}" if ("," in dport or ":" in dport) else f"--dport {dport}"
+    protos = ["tcp", "udp"] if proto == "any" else [proto]
+    return [f"-A {chain} -p {p} {match} -j {TARGETS[action]}" for p in protos]
+
+
+def _rule_key(line):
+    """tuple 줄 -> (규칙 키, 관리 여부), 주소/출발 포트/인터페이스가 지정된 규칙은 키 None"""
+    fields = line[len(TUPLE_PREFIX):].split()
+    comment = next((f[len("comment="):] for f in fields if f.startswith("comment=")), "")
+    try:
+        managed = bytes.fromhex(comment).decode() == MANAGED_COMMENT
+    except ValueError:
+        managed = False
+    if len(fields) < 7:
+        return None, managed
+    action, proto, dport, dst, sport, src, direction = fields[:7]
+    if dst not in ANY_ADDRESSES or src not in ANY_ADDRESSES or sport != "any" or direction not in ("in", "out"):
+        return None, managed
+    return (action, proto, dport, direction), managed
+
+
+def parse_user_rules(text):
+    """
+    user.rules 내용 -> (RULES 앞부분, 규칙 블록 목록, END RULES 뒷부분)
+    블록: {"rule": 키, "managed": bool, "lines": tuple 줄 + iptables 줄}
+    """
+    lines = text.splitlines()
+    begin, end = lines.index(RULES_BEGIN), lines.index(RULES_END)
+    blocks = []
+    for line in lines[begin + 1:end]:
+        if line.startswith(TUPLE_PREFIX):
+            rule, managed = _rule_key(line)
+            blocks.append({"rule": rule, "managed": managed, "lines": [line]})
+        elif line.strip() and blocks:
+            blocks[-1]["lines"].append(line)
+    return lines[:begin], blocks, lines[end + 1:]
+
+
+def render_user_rules(text, desired, v6=False):
+    """관리 규칙 중 설정에서 빠진 것은 삭제하고 없는 규칙만 추가한 새 내용"""
+    head, blocks, tail = parse_user_rules(text)
+    kept, present = [], set()
+    for block in blocks:
+        if block["managed"] and block["rule"] not in desired:
+            continue
+        kept.append(block["lines"])
+        present.add(block["rule"])
+    for rule in desired:
+        if rule not in present:
+            kept.append([tuple_line(rule, v6)] + iptables_lines(rule, v6))
+
+    lines = head + [RULES_BEGIN, ""]
+    for block in kept:
+        lines += block + [""]
+    return "\n".join(lines + [RULES_END] + tail) + "\n"
+
+
+def _shell_vars(text):
+    values = {}
+    for line in (text or "").splitlines():
+        match = re.match(r'^\s*([A-Z_0-9]+)\s*=\s*"?([^"#]*)"?', line)
+        if match:
+            values[match.group(1)] = match.group(2).strip()
+    return values
+
+
+def set_shell_var(text, name, value):
+    pattern = re.compile(rf"^\s*{name}\s*=.*$", re.MULTILINE)
+    if pattern.search(text):
+        return pattern.sub(f'{name}="{value}"', text, count=1)
+    return text.rstrip("\n") + f'\n{name}="{value}"\n'
+
+
+def load_state(conf=UFW_CONF, defaults=UFW_DEFAULTS, rule_files=UFW_USER_RULES):
+    """ufw 명령 없이 설정 파일에서 현재 상태를 읽음 (미설치면 None)"""
+    conf_text = _read_text(conf)
+    if conf_text is None:
+        return None
+    texts = {path: _read_text(path) for path in rule_files}
+    texts = {path: text for path, text in texts.items()
+             if text is not None and RULES_BEGIN in text.splitlines() and RULES_END in text.splitlines()}
+    default_text = _read_text(defaults)
+    default_vars = _shell_vars(default_text)
+
+    rules, managed = set(), set()
+    if texts:
+        # IPv4 파일 기준으로 비교 (IPv6 파일은 같은 규칙 집합으로 함께 갱신)
+        for block in parse_user_rules(next(iter(texts.values())))[1]:
+            rules.add(block["rule"])
+            if block["managed"]:
+                managed.add(block["rule"])
+    rules.discard(None)
+    managed.discard(None)
+    return {
+        "conf": conf,
+        "defaults": defaults,
+        "default_text": default_text,
+        "texts": texts,
+        "enabled": _shell_vars(conf_text).get("ENABLED", "no") == "yes",
+        "incoming": default_vars.get(POLICY_VARS["incoming"], "DROP"),
+        "outgoing": default_vars.get(POLICY_VARS["outgoing"], "ACCEPT"),
+        "rules": rules,
+        "managed": managed,
+    }
+
+
+def plan_ufw(state, desired_rules, policies):
+    """
+    현재 상태와 목표(규칙 목록, {"incoming": "deny", ...})의 차이
+    반환: {"add", "remove", "policies": [(방향, 현재, 목표)], "enable", "files": {경로: 새 내용}}
+    """
+    add = [rule for rule in desired_rules if rule not in state["rules"]]
+    remove = sorted(state["managed"] - set(desired_rules))
+    changed_policies = [(direction, state[direction], TARGETS[policy])
+                        for direction, policy in policies.items() if state[direction] != TARGETS[policy]]
+
+    files = {}
+    for path, text in state["texts"].items():
+        new_text = render_user_rules(text, desired_rules, v6="user6" in os.path.basename(path))
+        if new_text != text:
+            files[path] = new_text
+    if changed_policies and state["default_text"] is not None:
+        text = state["default_text"]
+        for direction, _, target in changed_policies:
+            text = set_shell_var(text, POLICY_VARS[direction], target)
+        files[state["defaults"]] = text
+    return {"add": add, "remove": remove, "policies": changed_policies,
+            "enable": not state["enabled"], "files": files}
+
+
+def commit(state, plan, run):
+    """
+    변경된 파일을 모두 교체한 뒤 reload(비활성 상태면 enable) 1회로 반영
+    실패하면 원래 파일로 되돌리고 이전 상태로 다시 적재
+    """
+    if not plan["files"] and not plan["enable"]:
+        return True
+    originals = {path: state["texts"].get(path, state["default_text"]) for path in plan["files"]}
+    written = []
+    try:
+        for path, text in plan["files"].items():
+            _write_atomic(path, text)
+            written.append(path)
+        ok = run("ufw --force enable" if plan["enable"] else "ufw reload")
+    except OSError:
+        ok = False
+    if not ok:
+        for path in written:
+            _write_atomic(path, originals[path])
+        run("ufw reload" if state["enabled"] else "ufw --force disable")
+    return ok
@@ -0,0 +1,54 @@
+import os
+import tarfile
+import time
+from src.utils.archive_index import open_indexed_tar_gz, extract_members, load_index, match_members
+
+
+def build_archive(tmp_path, files):
+    archive = tmp_path / "backup.tar.gz"
+    with open_indexed_tar_gz(archive, level=1, workers=2) as tar:
+        for name, data in files.items():
+            path = tmp_path / "src" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            tar.add(str(path), arcname=name)
+    return archive
+
+
+def test_match_members():
+    """정확한 경로, 하위 경로, 글롭 패턴 모두 지원"""
+    names = ["etc/ssh/sshd_config", "etc/ssh/ssh_config", "etc/hosts", "./var/log/a.log"]
+    assert match_members(names, ["/etc/ssh/sshd_config"]) == ["etc/ssh/sshd_config"]
+    assert match_members(names, ["etc/ssh"]) == ["etc/ssh/sshd_config", "etc/ssh/ssh_config"]
+    assert match_members(names, ["*.log"]) == ["./var/log/a.log"]
+
+
+def test_extract_single_member_via_index(tmp_path):
+    """인덱스를 이용해 큰 아카이브 뒤쪽의 멤버 하나만 추출"""
+    files = {f"bulk/{i}.bin": os.urandom(512 * 1024) for i in range(8)}
+    files["etc/ssh/sshd_config"] = b"PermitRootLogin no\n"
+    files["etc/long/" + "n" * 150 + ".conf"] = b"long name"
+    archive = build_archive(tmp_path, files)
+
+    index = load_index(archive)
+    assert len(index["blocks"]) > 1
+    assert [name for name, _ in index["members"]] == list(files)
+
+    dest = tmp_path / "out"
+    start = time.monotonic()
+    restored = extract_members(archive, ["etc/ssh/sshd_config", "etc/long/*.conf"], dest)
+    assert time.monotonic() - start < 1
+    assert sorted(restored) == sorted(["etc/ssh/sshd_config", "etc/long/" + "n" * 150 + ".conf"])
+    assert (dest / "etc" / "ssh" / "sshd_config").read_bytes() == b"PermitRootLogin no\n"
+    assert not (dest / "bulk").exists()
+
+    # 표준 도구로도 읽을 수 있는 아카이브여야 함
+    with tarfile.open(archive, "r:gz") as tar:
+        assert len(tar.getnames()) == len(files)
+
+
+def test_extract_without_index(tmp_path):
+    """인덱스가 없는 기존 아카이브는 순차 스캔으로 추출"""
+    archive = build_archive(tmp_path, {"a.txt": b"a", "b.txt": b"b"})
+    (tmp_path / "backup.tar.gz.idx.json").unlink()
+    assert extract_members(archive, ["b.txt"], tmp_path / "out") == ["b.txt"]
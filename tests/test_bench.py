@@ -0,0 +1,33 @@
+import json
+from src import bench
+
+TINY = {"cpu_iterations": 1000, "memory_mb": 1, "alloc_count": 100, "file_mb": 1, "random_reads": 10,
+        "fork_count": 2, "fsync_count": 2}
+
+
+def test_run_bench_records_config_and_deltas(tmp_path):
+    """적용 전/후 모든 작업 부하를 측정하고 사용한 설정과 함께 결과 파일로 저장"""
+    calls = []
+    config = {"memory_optimization": {"swappiness": 10}}
+    result = bench.run_bench(config, lambda: calls.append(1) or {"applied": 1}, samples=3, sizes=TINY,
+                             work_dir=str(tmp_path / "work"), results_dir=str(tmp_path / "results"))
+    names = [name for name, _ in bench.WORKLOADS]
+    assert calls == [1]
+    assert list(result["before"]) == names and list(result["deltas"]) == names
+    assert all(d["ci95"] is not None for d in result["deltas"].values())
+    assert list((tmp_path / "work").iterdir()) == []
+
+    with open(result["path"]) as f:
+        saved = json.load(f)
+    assert saved["config"] == config
+    assert saved["applied"] == {"applied": 1}
+
+
+def test_compare_confidence_interval():
+    """차이가 신뢰구간보다 클 때만 유의미한 변화로 판단"""
+    before = {"w": bench.summarize([1.0, 1.1, 0.9, 1.0, 1.0])}
+    faster = {"w": bench.summarize([0.5, 0.55, 0.45, 0.5, 0.5])}
+    noisy = {"w": bench.summarize([0.98, 1.1, 0.92, 1.02, 0.96])}
+    delta = bench.compare(before, faster)["w"]
+    assert delta["significant"] and round(delta["percent"]) == -50
+    assert not bench.compare(before, noisy)["w"]["significant"]
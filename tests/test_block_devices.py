@@ -0,0 +1,93 @@
+from src.utils.block_devices import apply_io_profiles, build_device_settings, discover_devices, resolve_scheduler
+
+
+def make_disk(root, name, rotational="0", size="1000", scheduler="[mq-deadline] kyber bfq none", hardware=True):
+    queue = root / name / "queue"
+    queue.mkdir(parents=True)
+    (root / name / "size").write_text(size + "\n")
+    if hardware:
+        (root / name / "device").mkdir()
+    (queue / "rotational").write_text(rotational + "\n")
+    (queue / "scheduler").write_text(scheduler + "\n")
+    for attr, value in {"read_ahead_kb": "128", "nr_requests": "64", "rq_affinity": "1", "nomerges": "0"}.items():
+        (queue / attr).write_text(value + "\n")
+    return queue
+
+
+def test_discover_and_classify(tmp_path):
+    """장치 종류 분류와 빈 장치 제외"""
+    make_disk(tmp_path, "sda", rotational="1")
+    make_disk(tmp_path, "sdb")
+    make_disk(tmp_path, "nvme0n1", scheduler="[none] mq-deadline")
+    make_disk(tmp_path, "vda")
+    make_disk(tmp_path, "zram0", hardware=False)
+    make_disk(tmp_path, "loop0", size="0", hardware=False)
+    classes = {d["name"]: d["class"] for d in discover_devices(str(tmp_path))}
+    assert classes == {"sda": "rotational", "sdb": "ssd", "nvme0n1": "nvme", "vda": "ssd", "zram0": "virtual"}
+
+
+def add_slave(root, stacked, slave, partition=None):
+    """stacked/slaves/<이름> 링크 생성 (partition 이 있으면 디스크 아래 파티션을 가리킴)"""
+    target = root / slave
+    if partition:
+        target = target / partition
+        target.mkdir(exist_ok=True)
+        (target / "partition").write_text("1\n")
+    (root / stacked / "slaves").mkdir(exist_ok=True)
+    (root / stacked / "slaves" / target.name).symlink_to(target)
+
+
+def test_stacked_devices_follow_backing_disks(tmp_path):
+    """dm/md 는 하위 디스크(파티션, 중첩 포함) 종류의 read_ahead_kb 를 사용하고 scheduler 는 none 유지"""
+    make_disk(tmp_path, "sda", rotational="1")
+    make_disk(tmp_path, "nvme0n1", scheduler="[none] mq-deadline")
+    md = make_disk(tmp_path, "md0", hardware=False, scheduler="none")
+    add_slave(tmp_path, "md0", "sda", partition="sda1")
+    add_slave(tmp_path, "md0", "nvme0n1", partition="nvme0n1p1")
+    dm = make_disk(tmp_path, "dm-0", hardware=False, scheduler="none")
+    add_slave(tmp_path, "dm-0", "md0")
+    fast = make_disk(tmp_path, "dm-1", hardware=False, scheduler="none")
+    add_slave(tmp_path, "dm-1", "nvme0n1", partition="nvme0n1p1")
+
+    devices = {d["name"]: d for d in discover_devices(str(tmp_path))}
+    assert {name: (d["class"], d.get("backing")) for name, d in devices.items() if name[0] in "dm"} == {
+        "md0": ("stacked", "rotational"), "dm-0": ("stacked", "rotational"), "dm-1": ("stacked", "nvme")}
+    settings = build_device_settings(devices["dm-1"], {"scheduler": "bfq"})
+    assert settings == {"scheduler": "none", "read_ahead_kb": 128}
+
+    apply_io_profiles({"enable": True}, sys_block=str(tmp_path))
+    assert (md / "read_ahead_kb").read_text() == "1024"
+    assert (dm / "read_ahead_kb").read_text() == "1024"
+    assert (fast / "read_ahead_kb").read_text().strip() == "128"
+    assert (dm / "nr_requests").read_text().strip() == "64"
+
+
+def test_override_precedence_and_scheduler_alias():
+    """프로필 < 전역 값 < 글롭 < 정확한 이름 < 경로 순으로 병합, 구버전 스케줄러 이름 호환"""
+    device = {"name": "nvme0n1", "class": "nvme", "queue": "/unused"}
+    io_config = {
+        "read_ahead_kb": 256,
+        "devices": {"nvme0n1": {"nomerges": 1}, "nvme*": {"nomerges": 2, "read_ahead_kb": 64}},
+        "paths": {"/db": {"rq_affinity": 1}},
+    }
+    settings = build_device_settings(device, io_config, {"/db": {"nvme0n1"}})
+    assert settings == {"scheduler": "none", "read_ahead_kb": 64, "rq_affinity": 1, "nomerges": 1}
+
+    assert resolve_scheduler("deadline", ["mq-deadline", "none"]) == "mq-deadline"
+    assert resolve_scheduler("noop", ["none"]) == "none"
+    assert resolve_scheduler("bfq", ["mq-deadline", "none"]) is None
+
+
+def test_apply_profiles_writes_each_device(tmp_path):
+    """장치별 프로필을 sysfs 파일에 기록하고 미지원 스케줄러는 건너뜀"""
+    hdd = make_disk(tmp_path, "sda", rotational="1")
+    nvme = make_disk(tmp_path, "nvme0n1", scheduler="[mq-deadline] none")
+    make_disk(tmp_path, "sdb", scheduler="[none]")
+
+    results = {r["device"]: r for r in apply_io_profiles({"enable": True}, sys_block=str(tmp_path))}
+    assert (hdd / "read_ahead_kb").read_text() == "1024"
+    assert (hdd / "nr_requests").read_text() == "256"
+    assert (nvme / "scheduler").read_text() == "none"
+    assert (nvme / "rq_affinity").read_text() == "2"
+    assert results["sdb"]["skipped"] == ["scheduler mq-deadline: 사용 불가 (none)"]
+    assert all(r["status"] in ("changed", "unchanged") for d in results.values() for r in d["results"])
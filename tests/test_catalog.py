@@ -0,0 +1,76 @@
+from src.utils.catalog import BackupCatalog
+
+
+def make_record(name, created, source="/data"):
+    return {"name": name, "source": source, "size": 10, "file_count": 1, "format": "file",
+            "kind": None, "checksum": None, "created": created}
+
+
+def test_catalog_paging_filter_and_members(tmp_path):
+    """최신순 페이지 조회, 이름/원본 필터, 멤버 경로 검색"""
+    catalog = BackupCatalog(tmp_path / "catalog.sqlite")
+    for i in range(5):
+        catalog.add(make_record(f"backup_{i}", created=i), members=[f"/data/file_{i}", "/data/common"])
+    catalog.add(make_record("etc_100%", created=10, source="/etc"), members=["/etc/ssh/sshd_config"])
+
+    assert [r["name"] for r in catalog.list(limit=2)] == ["etc_100%", "backup_4"]
+    assert [r["name"] for r in catalog.list(offset=2, limit=2)] == ["backup_3", "backup_2"]
+    assert catalog.count(name_filter="100%") == 1
+    assert catalog.count(name_filter="/etc") == 1
+    assert catalog.count(name_filter="_") == 6
+    assert [r["name"] for r in catalog.list(contains="/data/file_3")] == ["backup_3"]
+    assert catalog.count(contains="/data/common") == 5
+
+    catalog.remove(["backup_3"])
+    assert catalog.count(contains="/data/file_3") == 0
+    assert catalog.members("backup_3") == []
+    catalog.close()
+
+
+def test_catalog_sync_only_when_directory_changes(tmp_path):
+    """백업 디렉토리 mtime 이 그대로면 describe 를 호출하지 않음"""
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    (backup_dir / "a").write_text("a")
+    (backup_dir / ".hidden").write_text("x")
+    calls = []
+
+    def describe(path):
+        calls.append(path)
+        return make_record(path.rsplit("/", 1)[-1], created=0), []
+
+    catalog = BackupCatalog(tmp_path / "catalog.sqlite")
+    is_backup = lambda name: not name.startswith(".")
+    catalog.sync(str(backup_dir), describe, is_backup)
+    catalog.sync(str(backup_dir), describe, is_backup)
+    assert len(calls) == 1
+    assert catalog.names() == {"a"}
+
+    (backup_dir / "a").unlink()
+    (backup_dir / "b").write_text("b")
+    catalog.sync(str(backup_dir), describe, is_backup)
+    assert catalog.names() == {"b"}
+    catalog.close()
+
+
+def test_catalog_sync_retries_failed_describe(tmp_path, caplog):
+    """describe 가 실패한 백업은 기록하고, 디렉토리가 그대로여도 다음 sync 때 다시 등록 시도"""
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    (backup_dir / "partial").write_text("x")
+    ready = []
+
+    def describe(path):
+        if not ready:
+            raise OSError("기록 중")
+        return make_record(path.rsplit("/", 1)[-1], created=0), []
+
+    catalog = BackupCatalog(tmp_path / "catalog.sqlite")
+    catalog.sync(str(backup_dir), describe, lambda name: True)
+    assert catalog.names() == set()
+    assert "partial 등록 실패" in caplog.text
+
+    ready.append(True)
+    catalog.sync(str(backup_dir), describe, lambda name: True)
+    assert catalog.names() == {"partial"}
+    catalog.close()
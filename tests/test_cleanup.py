@@ -0,0 +1,87 @@
+import os
+import time
+from src.utils.cleanup import run_cleanup
+
+
+def make_tree(root):
+    old = time.time() - 3600
+    (root / "a" / "b" / "c").mkdir(parents=True)
+    (root / "keep").mkdir()
+
+    for path in [root / "old_empty", root / "a" / "b" / "c" / "old_empty"]:
+        path.touch()
+        os.utime(path, (old, old))
+    (root / "new_empty").touch()
+    (root / "keep" / "data").write_text("payload")
+    os.symlink(root / "keep", root / "link")
+
+
+def test_cleanup_removes_old_empty_files_and_dirs(tmp_path):
+    """오래된 빈 파일과 비게 된 디렉토리만 삭제하고 통계를 반환"""
+    target = tmp_path / "target"
+    target.mkdir()
+    make_tree(target)
+    log_file = tmp_path / "logs" / "cleanup.log"
+
+    stats = run_cleanup({
+        "target_paths": [str(target), str(tmp_path / "missing")],
+        "min_file_age_minutes": 30,
+        "remove_empty_dirs": True,
+        "log_file_path": str(log_file),
+    })
+
+    assert sorted(os.listdir(target)) == ["keep", "link", "new_empty"]
+    assert (target / "keep" / "data").exists()
+    assert stats["files_deleted"] == 2
+    assert stats["dirs_deleted"] == 3
+    assert stats["entries"] == 9
+    assert stats["entries_per_sec"] > 0
+
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 5
+    assert any(line.endswith(f"Deleted empty directory: {target / 'a'}") for line in lines)
+
+
+def test_cleanup_keeps_dirs_when_disabled(tmp_path):
+    """remove_empty_dirs 가 false 면 빈 디렉토리는 유지"""
+    (tmp_path / "empty").mkdir()
+    stats = run_cleanup({
+        "target_paths": [str(tmp_path)],
+        "remove_empty_dirs": False,
+        "log_file_path": str(tmp_path / "cleanup.log"),
+    })
+    assert (tmp_path / "empty").is_dir()
+    assert stats["dirs_deleted"] == 0
+    assert not (tmp_path / "cleanup.log").exists()
+
+
+def test_incremental_cache_rechecks_only_changed_dirs(tmp_path):
+    """두 번째 실행은 바뀌지 않은 디렉토리를 다시 읽지 않고, 기한이 된 빈 파일만 재검사"""
+    target = tmp_path / "target"
+    (target / "static" / "deep").mkdir(parents=True)
+    (target / "static" / "deep" / "data").write_text("payload")
+    (target / "busy").mkdir()
+    (target / "busy" / "data").write_text("payload")
+    young = target / "static" / "young_empty"
+    young.touch()
+
+    cfg = {
+        "target_paths": [str(target)],
+        "min_file_age_minutes": 0.01,
+        "log_file_path": str(tmp_path / "cleanup.log"),
+        "incremental": True,
+        "scan_cache_path": str(tmp_path / "cache.sqlite"),
+    }
+    first = run_cleanup(cfg)
+    assert first["dirs_scanned"] == 4
+    assert young.exists()
+
+    # 나이 기준을 넘긴 빈 파일은 디렉토리를 다시 읽지 않고 pending 재검사로 삭제됨
+    time.sleep(1)
+    (target / "busy" / "new_file").write_text("payload")
+
+    second = run_cleanup(cfg)
+    assert not young.exists()
+    assert second["files_deleted"] == 1
+    assert second["dirs_scanned"] == 1
+    assert second["dirs_skipped"] == 3
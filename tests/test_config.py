@@ -94,3 +94,39 @@ def test_invalid_update():
     with pytest.raises(Exception):
         config.save_config(invalid_config)
 
+
+
+def test_store_cache_and_subscribers(tmp_path):
+    """파일이 바뀐 경우에만 다시 읽고, 원자적 저장/외부 변경 모두 구독자에게 알림"""
+    from src.utils.config import ConfigStore
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"log_level": "INFO", "max_threads": 4}))
+    store = ConfigStore(path)
+    first = store.get()
+    assert store.get() is first
+
+    seen = []
+    unsubscribe = store.subscribe(lambda doc: seen.append(doc["max_threads"]))
+    store.update_section("max_threads", 8)
+    assert json.loads(path.read_text())["max_threads"] == 8
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    # 다른 프로세스가 파일을 교체한 경우 (inode 변경)
+    replacement = tmp_path / "other.json"
+    replacement.write_text(json.dumps({"log_level": "DEBUG", "max_threads": 2}))
+    os.replace(replacement, path)
+    assert store.get()["log_level"] == "DEBUG"
+    assert seen == [8, 2]
+
+    unsubscribe()
+    store.update_section("max_threads", 1)
+    assert seen == [8, 2]
+
+
+def test_store_reuses_compiled_validator():
+    """스키마 파일이 바뀌지 않으면 같은 검증기를 재사용"""
+    config = ConfigLoader(config_path=CONFIG_FILE, schema_path=SCHEMA_FILE)
+    validator = config.store.validator(SCHEMA_FILE)
+    assert config.store.validator(SCHEMA_FILE) is validator
+    with pytest.raises(Exception):
+        config.store.validate({"log_level": "INFO", "max_threads": 0}, SCHEMA_FILE)
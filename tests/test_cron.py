@@ -0,0 +1,31 @@
+from datetime import datetime
+import pytest
+from src.utils.cron import CronExpression, IntervalTrigger, make_trigger
+
+
+def test_next_after_basic_fields():
+    """분/시 목록·범위·step 과 월/요일 이름 처리"""
+    assert CronExpression("*/30 * * * *").next_after(datetime(2024, 1, 1, 10, 29, 59)) == datetime(2024, 1, 1, 10, 30)
+    assert CronExpression("0 */6 * * *").next_after(datetime(2024, 1, 1, 18, 0)) == datetime(2024, 1, 2, 0, 0)
+    assert CronExpression("15 9-17/4 * * *").next_after(datetime(2024, 1, 1, 13, 16)) == datetime(2024, 1, 1, 17, 15)
+    assert CronExpression("0 0 1 feb *").next_after(datetime(2024, 3, 5)) == datetime(2025, 2, 1)
+    assert CronExpression("@weekly").next_after(datetime(2024, 6, 26)) == datetime(2024, 6, 30)
+    assert CronExpression("0 12 * * MON-FRI").next_after(datetime(2024, 6, 29, 13)) == datetime(2024, 7, 1, 12)
+
+
+def test_day_of_month_or_day_of_week():
+    """일/요일이 모두 지정되면 둘 중 하나만 맞아도 실행 (표준 cron)"""
+    cron = CronExpression("0 0 13 * 5")
+    # 2024-06-07 은 금요일, 2024-06-13 은 목요일
+    assert cron.next_after(datetime(2024, 6, 1)) == datetime(2024, 6, 7)
+    assert cron.next_after(datetime(2024, 6, 12)) == datetime(2024, 6, 13)
+    assert CronExpression("0 0 29 2 *").next_after(datetime(2024, 3, 1)) == datetime(2028, 2, 29)
+    # "*/2" 처럼 * 로 시작하는 필드는 제한 없음으로 취급 -> 홀수 날짜이면서 월요일 (2024-06-17)
+    assert CronExpression("0 0 */2 * 1").next_after(datetime(2024, 6, 4)) == datetime(2024, 6, 17)
+
+
+def test_invalid_expressions():
+    for expression in ["* * * *", "60 * * * *", "*/0 * * * *", "0 0 31 2 *"]:
+        with pytest.raises(ValueError):
+            CronExpression(expression).next_after(datetime(2024, 1, 1))
+    assert isinstance(make_trigger(3600), IntervalTrigger)
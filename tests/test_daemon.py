@@ -0,0 +1,164 @@
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+from pathlib import Path
+import pytest
+from src import daemon
+from src.utils.daemon_client import DaemonClient, DaemonUnavailable, RpcError
+
+
+@pytest.fixture
+def serve(tmp_path):
+    """임시 소켓으로 데몬 서버를 띄우고 (handlers 로 실제 최적화 대신 가짜 작업 사용) 클라이언트 반환"""
+    servers = []
+
+    def start(handlers, max_queue=4):
+        settings = {"socket_path": str(tmp_path / "d.sock"), "max_queue": max_queue}
+        server = daemon.create_server(settings, daemon.OptimizerDaemon(settings, handlers))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return DaemonClient(settings["socket_path"], timeout=10)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+        server.optimizer.stop()
+
+
+def test_immediate_methods_and_errors(serve, tmp_path):
+    """ping/status/metrics 는 바로 응답, 알 수 없는 메서드/잘못된 인자는 JSON-RPC 오류"""
+    client = serve({"echo": lambda params, send, caller: params})
+    assert client.available()
+    assert client.call("echo", {"x": 1}) == {"x": 1}
+    status = client.call("status")
+    assert status["running"] is None and status["completed"] == 1
+    assert status["last"]["echo"]["status"] == "ok"
+    assert isinstance(client.call("metrics"), str)
+
+    with pytest.raises(RpcError) as info:
+        client.call("nope")
+    assert info.value.code == daemon.METHOD_NOT_FOUND
+
+    with pytest.raises(DaemonUnavailable):
+        DaemonClient(str(tmp_path / "missing.sock")).call("ping")
+
+
+def test_events_stream_and_queue_full(serve):
+    """작업 중 이벤트는 같은 연결로 전달되고, 대기열이 가득 차면 새 작업은 바로 거절"""
+    release = threading.Event()
+
+    def slow(params, send, caller):
+        daemon.ConnectionEmitter(send).emit("progress", step="wait", done=0, total=1)
+        release.wait(10)
+        return "done"
+
+    client = serve({"slow": slow}, max_queue=1)
+    received, results = [], []
+    first = threading.Thread(target=lambda: results.append(
+        DaemonClient(client.socket_path).call("slow", on_event=received.append)))
+    first.start()
+    while client.call("status")["running"] != "slow":
+        pass
+    second = threading.Thread(target=lambda: results.append(DaemonClient(client.socket_path).call("slow")))
+    second.start()
+    while client.call("status")["queued"] != 1:
+        pass
+
+    with pytest.raises(RpcError) as info:
+        client.call("slow")
+    assert info.value.code == daemon.QUEUE_FULL
+
+    release.set()
+    first.join(10)
+    second.join(10)
+    assert results == ["done", "done"]
+    assert received[0]["type"] == "progress" and received[0]["step"] == "wait"
+    assert client.call("status")["completed"] == 2
+
+
+NOBODY = daemon.Caller(pid=1, uid=65534, gid=65534)
+
+
+def call(optimizer, method, params, caller):
+    return optimizer.dispatch(json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}),
+                              lambda message: None, caller)
+
+
+def test_non_root_rejected_for_root_only_methods():
+    """optimize/install_defaults 는 root 만, 자격 증명을 얻지 못한 연결은 모든 작업 거부"""
+    ran = []
+    optimizer = daemon.OptimizerDaemon(handlers={name: lambda params, send, caller: ran.append(caller.uid)
+                                                 for name in ("optimize", "install_defaults", "backup")})
+    try:
+        for method in ("optimize", "install_defaults"):
+            assert call(optimizer, method, {}, NOBODY)["error"]["code"] == daemon.PERMISSION_DENIED
+        unknown = daemon.Caller(None, None, None)
+        assert call(optimizer, "backup", {}, unknown)["error"]["code"] == daemon.PERMISSION_DENIED
+        assert call(optimizer, "status", {}, NOBODY)["result"]["completed"] == 0
+        assert call(optimizer, "optimize", {}, daemon.Caller(1, 0, 0))["result"] is None
+        assert ran == [0]
+    finally:
+        optimizer.stop()
+
+
+def test_relative_paths_rejected():
+    """상대 경로는 데몬 작업 디렉토리 기준으로 해석되므로 backup path/restore dest 모두 거부"""
+    optimizer = daemon.OptimizerDaemon()
+    try:
+        for method, params in (("backup", {"path": "etc"}), ("restore", {"backup": "x.tar.gz", "dest": "restored"})):
+            assert call(optimizer, method, params, daemon.Caller(1, 0, 0))["error"]["code"] == daemon.INVALID_PARAMS
+    finally:
+        optimizer.stop()
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="권한을 낮춰 실행하려면 root 필요")
+def test_non_root_backup_and_restore_use_caller_permissions(monkeypatch):
+    """읽을 수 없는 파일은 백업 거부(원본은 호출자 권한으로만 읽음), 다른 사용자의 백업과 쓸 수 없는 위치로의 복원도 거부"""
+    # pytest 의 tmp_path 상위 디렉토리는 root 전용(0700) 이라 다른 uid 가 접근할 수 있는 곳에 생성
+    tmp_path = Path(tempfile.mkdtemp(dir="/tmp"))
+    os.chmod(tmp_path, 0o755)
+    monkeypatch.chdir(tmp_path)
+    secret = tmp_path / "secret"
+    secret.write_text("root only")
+    os.chmod(secret, 0o600)
+    public = tmp_path / "public"
+    public.mkdir()
+    (public / "a.txt").write_text("hello")
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    os.chmod(shared, 0o777)
+
+    optimizer = daemon.OptimizerDaemon()
+    try:
+        assert call(optimizer, "backup", {"path": str(secret)}, NOBODY)["error"]["code"] == daemon.PERMISSION_DENIED
+        (public / "hidden").write_text("x")
+        os.chmod(public / "hidden", 0o600)
+        assert call(optimizer, "backup", {"path": str(public)}, NOBODY)["error"]["code"] == daemon.PERMISSION_DENIED
+        os.unlink(public / "hidden")
+
+        root_backup = call(optimizer, "backup", {"path": str(secret)}, daemon.Caller(1, 0, 0))["result"]
+        name = os.path.basename(root_backup["message"].rsplit(": ", 1)[1])
+        response = call(optimizer, "restore", {"backup": name, "dest": str(shared)}, NOBODY)
+        assert response["error"]["code"] == daemon.PERMISSION_DENIED
+
+        # 데몬은 원본을 직접 읽지 않으므로 root 전용 파일을 가리키는 링크는 링크로만 저장
+        (public / "link").symlink_to(secret)
+        mine = call(optimizer, "backup", {"path": str(public)}, NOBODY)["result"]
+        assert mine["ok"]
+        name = os.path.basename(mine["message"].rsplit(": ", 1)[1])
+        with tarfile.open(tmp_path / "custom_backups" / name) as tar:
+            assert tar.getmember("link").issym()
+            assert tar.extractfile("a.txt").read() == b"hello"
+        assert optimizer.owner_of(name) == NOBODY.uid
+        assert call(optimizer, "restore", {"backup": name, "dest": str(tmp_path)}, NOBODY)["result"]["ok"] is False
+        assert call(optimizer, "restore", {"backup": name, "dest": str(shared)}, NOBODY)["result"]["ok"] is True
+        restored = next(shared.iterdir())
+        assert restored.stat().st_uid == NOBODY.uid
+        assert (restored / "a.txt").read_text() == "hello"
+    finally:
+        optimizer.stop()
+        shutil.rmtree(tmp_path)
@@ -0,0 +1,34 @@
+import io
+from src.utils import events
+from src.utils.executor import Section, run_sections
+
+
+def test_section_events_with_progress():
+    """섹션 시작/종료와 섹션 스레드에서 보낸 진행률이 JSON Lines 로 기록"""
+    stream = io.StringIO()
+    events.set_emitter(events.EventEmitter(stream))
+
+    def work(items):
+        for i, item in enumerate(items, 1):
+            events.progress(item, i, len(items))
+        return "PASS"
+
+    def broken(_):
+        raise RuntimeError("boom")
+
+    try:
+        results = run_sections([Section("CPU", work, (["a", "b"],)),
+                                Section("Disk", broken, (None,)),
+                                Section("After", work, ([],), depends_on=["Disk"])],
+                               on_event=events.emit)
+    finally:
+        events.set_emitter(None)
+
+    parsed = [events.parse_event(line) for line in stream.getvalue().splitlines()]
+    assert results == {"CPU": "PASS", "Disk": "FAIL", "After": "SKIP"}
+    progress = [(e["section"], e["step"], e["done"]) for e in parsed if e["type"] == "progress"]
+    assert progress == [("CPU", "a", 1), ("CPU", "b", 2)]
+    ends = {e["section"]: e for e in parsed if e["type"] == "section_end"}
+    assert ends["Disk"]["status"] == "FAIL" and ends["Disk"]["reason"] == "오류: boom"
+    assert ends["After"]["status"] == "SKIP" and ends["After"]["duration"] == 0.0
+    assert events.parse_event("2024-01-01 [INFO] [PASS] CPU") is None
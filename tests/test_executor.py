@@ -0,0 +1,122 @@
+import logging
+import subprocess
+import threading
+import time
+import pytest
+from src.utils.executor import Section, current_token, run_sections
+
+
+def sleeper(seconds, status="PASS"):
+    def run(_config):
+        time.sleep(seconds)
+        return status
+    return run
+
+
+def test_independent_sections_run_concurrently():
+    """독립 섹션은 동시에 실행되어 가장 느린 섹션 시간 정도로 끝나야 함"""
+    sections = [Section(name, sleeper(0.3), ({},)) for name in ["CPU", "I/O", "Memory", "Services"]]
+    start = time.monotonic()
+    results = run_sections(sections, max_workers=4)
+    elapsed = time.monotonic() - start
+    assert results == {"CPU": "PASS", "I/O": "PASS", "Memory": "PASS", "Services": "PASS"}
+    assert elapsed < 0.9
+
+
+def test_dependency_order():
+    """선행 섹션이 끝난 뒤에 후행 섹션이 시작되어야 함"""
+    order = []
+    lock = threading.Lock()
+
+    def record(name, delay):
+        def run(_config):
+            time.sleep(delay)
+            with lock:
+                order.append(name)
+        return run
+
+    sections = [
+        Section("Disk", record("Disk", 0), ({},), depends_on=["I/O"]),
+        Section("I/O", record("I/O", 0.2), ({},)),
+    ]
+    results = run_sections(sections, max_workers=2)
+    assert order == ["I/O", "Disk"]
+    assert results == {"Disk": "PASS", "I/O": "PASS"}
+
+
+def test_failed_dependency_skips_dependents():
+    """선행 섹션 실패 시 후행 섹션은 [SKIP] 처리"""
+    sections = [
+        Section("I/O", sleeper(0, "FAIL"), ({},)),
+        Section("Disk", sleeper(0), ({},), depends_on=["I/O"]),
+    ]
+    assert run_sections(sections) == {"I/O": "FAIL", "Disk": "SKIP"}
+
+
+def test_timeout_cancels_running_command():
+    """시간 초과 시 섹션은 [FAIL] 처리되고 실행 중인 하위 프로세스는 종료되어야 함"""
+    procs = []
+
+    def slow(_config):
+        proc = subprocess.Popen(["sleep", "30"], start_new_session=True)
+        procs.append(proc)
+        current_token().track(proc)
+        proc.wait()
+
+    start = time.monotonic()
+    results = run_sections([Section("Disk", slow, ({},), timeout=0.3)])
+    assert results == {"Disk": "FAIL"}
+    assert time.monotonic() - start < 5
+    assert procs[0].wait(timeout=5) != 0
+
+
+def test_cycle_is_rejected():
+    """순환 의존성은 실행 전에 거부되어야 함"""
+    sections = [
+        Section("A", sleeper(0), ({},), depends_on=["B"]),
+        Section("B", sleeper(0), ({},), depends_on=["A"]),
+    ]
+    with pytest.raises(ValueError):
+        run_sections(sections)
+
+
+def test_timed_out_section_never_logs_pass(caplog):
+    """시간 초과 후 늦게 끝난 섹션의 결과는 무시되고 [PASS] 줄이 기록되지 않아야 함"""
+    finished = threading.Event()
+
+    def stubborn(_config):
+        # 취소 토큰을 확인하지 않는 섹션
+        time.sleep(0.5)
+        finished.set()
+        return "PASS"
+
+    logger = logging.getLogger("test-executor")
+    with caplog.at_level(logging.INFO, logger="test-executor"):
+        results = run_sections([Section("CPU", stubborn, ({},), timeout=0.1),
+                                Section("I/O", sleeper(0), ({},))], logger=logger)
+        thread = next(t for t in threading.enumerate() if t.name == "section-CPU")
+        assert thread.daemon
+        assert finished.wait(5)
+        time.sleep(0.05)
+    assert results == {"CPU": "FAIL", "I/O": "PASS"}
+    messages = [r.getMessage() for r in caplog.records]
+    assert "[FAIL] CPU | 시간 초과 (0.1s)" in messages
+    assert "[PASS] I/O" in messages
+    assert not any(m.startswith("[PASS] CPU") for m in messages)
+
+
+def test_orphaned_thread_keeps_its_slot():
+    """시간 초과된 섹션 스레드가 끝날 때까지 그 슬롯에는 다음 섹션을 시작하지 않음 (max_workers 유지)"""
+    times = {}
+
+    def stubborn(_config):
+        time.sleep(0.4)
+        times["orphan_end"] = time.monotonic()
+
+    def record(_config):
+        times["next_start"] = time.monotonic()
+
+    results = run_sections([Section("CPU", stubborn, ({},), timeout=0.1),
+                            Section("I/O", record, ({},))], max_workers=1)
+    assert results == {"CPU": "FAIL", "I/O": "PASS"}
+    assert times["next_start"] >= times["orphan_end"]
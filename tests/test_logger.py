@@ -0,0 +1,65 @@
+import gzip
+import json
+import logging
+import logging.handlers
+import queue
+from src.utils import logger as log_module
+
+
+def test_rotation_compresses_and_json_sink(tmp_path):
+    """크기 초과 시 회전 파일을 gzip 으로 압축하고 JSON Lines 에는 extra 필드도 기록"""
+    settings = dict(log_module.DEFAULT_SETTINGS, log_file_path=str(tmp_path / "system.log"),
+                    json_log_path=str(tmp_path / "system.jsonl"), max_log_size_mb=0.001, backup_count=2)
+    log_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *log_module.build_handlers(settings)[:2])
+    test_logger = logging.getLogger("test_logger_rotation")
+    test_logger.propagate = False
+    test_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    try:
+        for i in range(40):
+            test_logger.warning(f"[PASS] 항목 {i}", extra={"section": "Disk"})
+    finally:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+    rotated = tmp_path / "system.log.1.gz"
+    assert rotated.exists() and not (tmp_path / "system.log.3.gz").exists()
+    assert "[WARNING] [PASS]" in gzip.open(rotated, "rt", encoding="utf-8").read()
+
+    last = json.loads((tmp_path / "system.jsonl").read_text(encoding="utf-8").splitlines()[-1])
+    assert last["message"] == "[PASS] 항목 39"
+    assert last["section"] == "Disk" and last["level"] == "WARNING"
+
+
+def test_full_queue_drops_and_counts(capsys):
+    """큐가 가득 차면 traceback 없이 버리고, 자리가 나면 버린 개수를 경고로 먼저 기록"""
+    handler = log_module.DroppingQueueHandler(queue.Queue(2))
+    test_logger = logging.getLogger("test_logger_drop")
+    test_logger.propagate = False
+    test_logger.addHandler(handler)
+    for i in range(5):
+        test_logger.warning(f"항목 {i}")
+    assert handler.dropped == 3
+    assert capsys.readouterr().err == ""
+
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == ["항목 0", "항목 1"]
+    test_logger.warning("항목 5")
+    notice, record = handler.queue.get_nowait(), handler.queue.get_nowait()
+    assert notice.levelname == "WARNING" and "3건 버림" in notice.getMessage()
+    assert record.getMessage() == "항목 5"
+
+
+def test_process_log_files_are_separate(tmp_path):
+    """프로세스 이름이 있으면 로그/JSON 파일을 프로세스별로 분리"""
+    settings = dict(log_module.DEFAULT_SETTINGS, log_file_path=str(tmp_path / "system.log"),
+                    json_log_path=str(tmp_path / "system.jsonl"))
+    handlers = log_module.build_handlers(settings, process="daemon")
+    try:
+        assert [h.baseFilename for h in handlers[:2]] == [str(tmp_path / "system-daemon.log"),
+                                                          str(tmp_path / "system-daemon.jsonl")]
+    finally:
+        for handler in handlers:
+            handler.close()
+    assert log_module.process_log_path("logs/system.log") == "logs/system.log"
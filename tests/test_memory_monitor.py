@@ -0,0 +1,96 @@
+from src.memory_monitor import MemoryPressureMonitor
+from src.utils.psi import parse_pressure
+
+
+def pressure(some, full=0.0):
+    return {"some": {"avg10": some, "avg60": 0.0, "avg300": 0.0, "total": 0},
+            "full": {"avg10": full, "avg60": 0.0, "avg300": 0.0, "total": 0}}
+
+
+class FakeHost:
+    """PSI 값과 적용된 tunable, 시계를 흉내내는 테스트 대역"""
+
+    def __init__(self):
+        self.memory = pressure(0.0)
+        self.io = pressure(0.0)
+        self.applied = []
+        self.now = 0.0
+
+    def read(self, resource):
+        return self.memory if resource == "memory" else self.io
+
+    def apply(self, values):
+        self.applied.append(values)
+        return [{"key": k, "path": k, "old": None, "new": str(v), "status": "changed", "error": None}
+                for k, v in values.items()]
+
+    def monitor(self, **config):
+        return MemoryPressureMonitor(dict(settle_seconds=0, **config), read=self.read, apply=self.apply,
+                                     clock=lambda: self.now, sleep=lambda _: None)
+
+
+def test_parse_pressure():
+    text = "some avg10=1.50 avg60=0.20 avg300=0.00 total=1234\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=5\n"
+    parsed = parse_pressure(text)
+    assert parsed["some"]["avg10"] == 1.5
+    assert parsed["full"]["total"] == 5
+
+
+def test_graded_escalation_with_cooldown_and_hysteresis():
+    """정체가 계속되면 cooldown 간격으로 한 단계씩 강화, 압력이 충분히 내려가야 초기화"""
+    host = FakeHost()
+    monitor = host.monitor(cooldown_seconds=60)
+    assert monitor.evaluate() is None
+
+    host.memory = pressure(30.0)
+    assert monitor.evaluate()["step"] == "compact"
+    host.now = 30
+    assert monitor.evaluate() is None                      # cooldown
+    host.now = 61
+    assert monitor.evaluate()["step"] == "drop_pagecache"
+    host.now = 122
+    assert monitor.evaluate()["step"] == "drop_all_caches"
+    host.now = 183
+    assert monitor.evaluate()["step"] == "drop_all_caches"  # 최대 단계 유지
+
+    host.memory = pressure(5.0)                              # 히스테리시스 구간: 단계 유지
+    monitor.evaluate()
+    assert monitor.level == 3
+    host.memory = pressure(1.0)
+    monitor.evaluate()
+    assert monitor.level == 0
+    assert host.applied == [{"vm.compact_memory": 1}, {"vm.drop_caches": 1}, {"vm.drop_caches": 3},
+                            {"vm.drop_caches": 3}]
+
+
+def test_io_stall_holds_back_cache_drop():
+    """I/O 정체 중에는 캐시 삭제 대신 compaction 만 수행하고 단계는 올리지 않음"""
+    host = FakeHost()
+    monitor = host.monitor(cooldown_seconds=0)
+    host.memory = pressure(30.0, full=10.0)
+    host.io = pressure(50.0, full=40.0)
+    assert monitor.evaluate()["step"] == "compact"
+    host.now = 1
+    assert monitor.evaluate()["step"] == "compact"
+    assert monitor.level == 1
+
+
+def test_scheduled_reclaim_only_under_pressure(monkeypatch):
+    """예약 회수 작업은 정체가 없으면 캐시를 건드리지 않고, 정체가 이어지면 스케줄러 안에서 단계를 이어감"""
+    from src import memory_monitor, scheduler
+    host = FakeHost()
+    monkeypatch.setattr(memory_monitor, "psi_available", lambda: True)
+    monkeypatch.setattr(scheduler, "_pressure_monitor", host.monitor())
+    config = {"memory_optimization": {"drop_caches_on_schedule": True,
+                                      "pressure_monitor": {"settle_seconds": 0, "cooldown_seconds": 0}}}
+
+    assert scheduler.drop_caches_job(config) == "PASS"
+    assert host.applied == []
+
+    host.memory = pressure(30.0)
+    assert scheduler.drop_caches_job(config) == "PASS"
+    assert scheduler.drop_caches_job(config) == "PASS"
+    assert host.applied == [{"vm.compact_memory": 1}, {"vm.drop_caches": 1}]
+
+    config["memory_optimization"]["drop_caches_on_schedule"] = False
+    assert scheduler.drop_caches_job(config) == "SKIP"
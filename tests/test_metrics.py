@@ -0,0 +1,59 @@
+import threading
+from src.utils import metrics
+
+
+def test_counter_threads_and_histogram():
+    """스레드별 셀 합산 (종료된 스레드 포함), 히스토그램은 누적 버킷으로 출력"""
+    registry = metrics.Registry()
+    counter = registry.register(metrics.Counter, "c_total", "test", ("kind",))
+    hist = registry.register(metrics.Histogram, "h_seconds", "test", buckets=(0.1, 1))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(kind="a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    counter.inc(5, kind="b")
+    for value in (0.05, 0.5, 2):
+        hist.observe(value)
+
+    samples = dict(s for _, _, _, family in registry.families() for s in family)
+    assert samples['c_total{kind="a"}'] == 4000
+    assert samples['c_total{kind="b"}'] == 5
+    assert samples['h_seconds_bucket{le="0.1"}'] == 1
+    assert samples['h_seconds_bucket{le="1"}'] == 2
+    assert samples['h_seconds_bucket{le="+Inf"}'] == 3
+    assert samples["h_seconds_count"] == 3
+    # 종료된 스레드의 셀은 합계로 합쳐지고 목록에서 제거됨
+    assert len(counter._cells) == 1
+
+
+def test_series_bounded():
+    """라벨 조합이 상한을 넘으면 overflow 시계열 하나로 합침"""
+    gauge = metrics.Gauge("g", "test", ("path",), max_series=3)
+    for i in range(10):
+        gauge.set(i, path=f"/p{i}")
+    assert len(gauge._values) == 4
+    assert gauge._values[(metrics.OVERFLOW,)] == 9
+
+
+def test_textfile_accumulates_across_runs(tmp_path):
+    """원자적으로 기록하고, 새 프로세스(새 레지스트리)도 기존 counter 값에 이어서 증가"""
+    path = str(tmp_path / "linux_optimizer_test.prom")
+    for run in range(2):
+        registry = metrics.Registry()
+        registry.register(metrics.Counter, "runs_total", "runs").inc()
+        registry.register(metrics.Gauge, "last", "last value").set(run + 10)
+        writer = metrics.TextfileWriter(path, "test", registry)
+        writer.write()
+        writer.write()  # 같은 프로세스에서 다시 기록해도 중복 합산하지 않음
+
+    text = open(path).read()
+    assert "# TYPE runs_total counter" in text
+    assert 'runs_total{process="test"} 2\n' in text
+    assert 'last{process="test"} 11\n' in text
+    assert [p.name for p in tmp_path.iterdir()] == ["linux_optimizer_test.prom"]
@@ -0,0 +1,24 @@
+import sys
+from src.gui.sections.optimize_tab import run_optimizer_process
+
+
+def run(script):
+    received = []
+    run_optimizer_process(received.append, [sys.executable, "-c", script])
+    return received
+
+
+def test_crash_without_run_end_posts_error():
+    """run_end 없이 비정상 종료하면 stderr 끝부분을 error 이벤트로 전달"""
+    received = run("import sys; print('{\"type\": \"run_start\"}'); "
+                   "sys.stderr.write('x' * 100000 + '\\nsudo: a password is required\\n'); sys.exit(1)")
+    assert [e["type"] for e in received] == ["run_start", "error", "exit"]
+    assert received[1]["returncode"] == 1
+    assert received[1]["message"].endswith("sudo: a password is required")
+    assert received[2]["returncode"] == 1
+
+
+def test_failed_run_with_run_end_has_no_error_event():
+    """run_end 까지 보낸 실행은 종료 코드가 0 이 아니어도 error 이벤트 없음"""
+    received = run("import sys; print('{\"type\": \"run_end\", \"results\": {}, \"duration\": 0}'); sys.exit(1)")
+    assert [e["type"] for e in received] == ["run_end", "exit"]
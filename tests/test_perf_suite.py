@@ -0,0 +1,49 @@
+import os
+from src import perf_suite
+from src.utils import fsroot
+from src.utils.synthetic_root import build_synthetic_root
+
+TINY = {"pids": 30, "cpus": 2, "block_devices": 5, "temp_files": 200, "temp_fanout": 50,
+        "backup_files": 20, "blocked_ports": 5}
+
+
+def test_host_path_and_sections_stay_in_root(tmp_path):
+    """합성 루트에서는 /proc, /sys, /etc 경로가 루트 아래로 바뀌고 섹션이 루트 안의 파일만 수정"""
+    layout = build_synthetic_root(tmp_path / "root", "small", **TINY)
+    root = layout["root"]
+    assert fsroot.host_path("/proc/sys/vm/swappiness") == "/proc/sys/vm/swappiness"
+    with fsroot.use_root(root):
+        assert fsroot.hermetic()
+        target = fsroot.host_path("/proc/sys/vm/swappiness")
+        assert target == os.path.join(root, "proc/sys/vm/swappiness")
+        assert fsroot.host_path(target) == target
+        cases = perf_suite.build_cases(layout, str(tmp_path))
+        checks = {"section:Memory": ("proc/sys/vm/swappiness", "10"),
+                  "section:CPU": ("sys/devices/system/cpu/cpu0/cpufreq/scaling_governor", "performance"),
+                  "section:Security": ("etc/ssh/sshd_config", "PermitRootLogin no")}
+        for name, (path, expected) in checks.items():
+            setup, run = cases[name]
+            setup()
+            assert run() == "PASS"
+            with open(os.path.join(root, path)) as f:
+                assert expected in f.read()
+    assert not fsroot.hermetic()
+
+
+def test_run_suite_and_regression(tmp_path):
+    """모든 섹션/루틴을 측정하고, 기준선보다 크게 느려진 항목만 회귀로 표시"""
+    report = perf_suite.run_suite("small", repeat=1, **TINY)
+    assert set(report["results"]) == {
+        "section:CPU", "section:I/O", "section:Memory", "section:Services", "section:Security", "section:Disk",
+        "routine:proc_scan", "routine:plan", "routine:cleanup", "routine:backup_tar", "routine:backup_dedup"}
+    assert all("median" in result for result in report["results"].values())
+
+    baseline_path = str(tmp_path / "baseline.json")
+    perf_suite.save_baseline(report, baseline_path)
+    baseline = perf_suite.load_baseline(baseline_path)
+    assert all(row["status"] == "ok" for row in perf_suite.compare(report, baseline))
+
+    baseline["small"]["routine:backup_tar"] = report["results"]["routine:backup_tar"]["median"] / 10
+    rows = {row["name"]: row["status"] for row in perf_suite.compare(report, baseline)}
+    assert rows["routine:backup_tar"] == "regression"
+    assert rows["routine:cleanup"] == "ok"
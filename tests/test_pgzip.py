@@ -0,0 +1,39 @@
+import gzip
+import io
+import os
+import tarfile
+from src.utils.pgzip import ParallelGzipWriter, open_tar_gz
+
+
+def test_output_is_standard_gzip(tmp_path):
+    """블록별로 압축한 결과가 표준 gzip 으로 그대로 해제되어야 함"""
+    data = os.urandom(300_000) + b"compressible " * 200_000
+    target = tmp_path / "out.gz"
+    with ParallelGzipWriter(target, level=6, workers=4, block_size=256 * 1024) as gz:
+        for i in range(0, len(data), 100_000):
+            gz.write(data[i:i + 100_000])
+
+    assert gzip.decompress(target.read_bytes()) == data
+    assert len(gz.blocks) == -(-len(data) // (256 * 1024))
+    assert gz.blocks[0] == (0, 0)
+
+
+def test_empty_input(tmp_path):
+    """빈 입력도 유효한 gzip 파일이어야 함"""
+    target = tmp_path / "empty.gz"
+    with ParallelGzipWriter(target):
+        pass
+    assert gzip.decompress(target.read_bytes()) == b""
+
+
+def test_tar_stream(tmp_path):
+    """tar 를 병렬 gzip 으로 스트리밍 기록한 아카이브를 tarfile 로 읽을 수 있어야 함"""
+    payload = os.urandom(2 * 1024 * 1024)
+    archive = tmp_path / "backup.tar.gz"
+    with open_tar_gz(archive, level=1, workers=2) as tar:
+        info = tarfile.TarInfo("dir/data.bin")
+        info.size = len(payload)
+        tar.addfile(info, io.BytesIO(payload))
+
+    with tarfile.open(archive, "r:gz") as tar:
+        assert tar.extractfile("dir/data.bin").read() == payload
@@ -0,0 +1,67 @@
+from src import planner
+
+
+def make_ufw(tmp_path, enabled="no", rules=""):
+    conf = tmp_path / "ufw.conf"
+    conf.write_text(f"ENABLED={enabled}\n")
+    defaults = tmp_path / "ufw"
+    defaults.write_text('IPV6=yes\nDEFAULT_INPUT_POLICY="DROP"\nDEFAULT_OUTPUT_POLICY="ACCEPT"\n')
+    user_rules = tmp_path / "user.rules"
+    user_rules.write_text("*filter\n:ufw-user-input - [0:0]\n### RULES ###\n\n" + rules
+                          + "### END RULES ###\nCOMMIT\n")
+    return str(conf), str(defaults), [str(user_rules), str(tmp_path / "user6.rules")]
+
+
+def test_firewall_plan_single_commit(tmp_path, monkeypatch):
+    """이미 있는 규칙은 제외하고, 항목이 여러 개여도 reload(enable) 는 1회만 실행"""
+    paths = make_ufw(tmp_path, rules="### tuple ### deny any 23 0.0.0.0/0 any 0.0.0.0/0 in\n"
+                                     "-A ufw-user-input -p tcp --dport 23 -j DROP\n"
+                                     "-A ufw-user-input -p udp --dport 23 -j DROP\n\n")
+    monkeypatch.setattr(planner, "UFW_CONF", paths[0])
+    monkeypatch.setattr(planner, "UFW_DEFAULTS", paths[1])
+    monkeypatch.setattr(planner, "UFW_USER_RULES", paths[2])
+
+    fw = {"enable": True, "deny_all_by_default": True, "blocked_ports": [23, "6000:6007/tcp"]}
+    changes = planner.plan_firewall(fw)
+    assert [c["target"] for c in changes] == ["deny any 23 out", "deny tcp 6000:6007 in",
+                                              "deny tcp 6000:6007 out", "ufw"]
+
+    commands = []
+    monkeypatch.setattr(planner, "_run", lambda command: commands.append(command) or True)
+    assert planner.apply_plan(changes)["post_actions"] == ["commit_firewall"]
+    assert commands == ["ufw --force enable"]
+
+    (tmp_path / "ufw.conf").write_text("ENABLED=yes\n")
+    assert planner.plan_firewall(fw) == []
+
+
+def test_sshd_plan_and_single_reload(tmp_path, monkeypatch):
+    """달라진 지시어만 한 번에 기록하고 sshd reload 는 1회만 실행"""
+    path = tmp_path / "sshd_config"
+    path.write_text("#PermitRootLogin prohibit-password\nPasswordAuthentication no\n"
+                    "Match User backup\n    PasswordAuthentication yes\n")
+    ssh = {"permit_root_login": "no", "password_authentication": "no", "max_auth_tries": 3}
+    changes = planner.plan_sshd(ssh, str(path), validate=lambda p: (True, ""))
+    assert [c["target"] for c in changes] == ["PermitRootLogin", "MaxAuthTries"]
+
+    commands = []
+    monkeypatch.setattr(planner, "_run", lambda command: commands.append(command) or True)
+    result = planner.apply_plan(changes)
+    assert result == {"applied": 2, "failed": 0, "post_actions": ["commit_sshd"]}
+    assert commands == ["systemctl reload sshd"]
+    assert path.read_text().splitlines() == ["PermitRootLogin no", "PasswordAuthentication no", "MaxAuthTries 3",
+                                             "Match User backup", "    PasswordAuthentication yes"]
+    assert planner.plan_sshd(ssh, str(path)) == []
+
+
+def test_kernel_plan_skips_unchanged(tmp_path, monkeypatch):
+    """현재 값과 같은 sysctl 은 계획에서 제외"""
+    monkeypatch.setattr(planner, "is_virtual_machine", lambda: True)
+    monkeypatch.setattr("src.utils.tunables.PROC_SYS", str(tmp_path))
+    (tmp_path / "vm").mkdir()
+    (tmp_path / "vm" / "swappiness").write_text("60\n")
+    config = {"memory_optimization": {"swappiness": 10}, "performance_optimization": {"io": {"enable": False}}}
+    changes = planner.build_plan(config, ["kernel"])
+    assert [(c["target"], c["current"], c["desired"]) for c in changes] == [("vm.swappiness", "60", "10")]
+    assert planner.apply_plan(changes)["applied"] == 1
+    assert planner.build_plan(config, ["kernel"]) == []
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import time
+from src.utils.proc_index import ProcessIndex, set_nice, set_scheduler
+
+
+def make_proc(root, pid, comm, cmdline, tids=()):
+    proc = root / str(pid)
+    (proc / "task").mkdir(parents=True)
+    (proc / "comm").write_text(comm + "\n")
+    (proc / "cmdline").write_bytes(b"\0".join(arg.encode() for arg in cmdline) + b"\0")
+    for tid in (pid, *tids):
+        (proc / "task" / str(tid)).mkdir()
+
+
+def test_index_matches_name_and_cmdline(tmp_path):
+    """이름(comm) 정규식/전체 명령줄 검색과 스레드 목록"""
+    make_proc(tmp_path, 10, "nginx", ["nginx: master"], tids=[11, 12])
+    make_proc(tmp_path, 20, "nginx", ["nginx: worker"])
+    make_proc(tmp_path, 30, "python3", ["/usr/bin/python3", "app.py"])
+    (tmp_path / "self").mkdir()
+
+    index = ProcessIndex.scan(str(tmp_path))
+    assert len(index) == 3
+    assert index.match("nginx") == [10, 20]
+    assert index.match("^py") == [30]
+    assert index.match("app.py") == []
+    assert index.match("app.py", full=True) == [30]
+    assert index.match_tids("nginx") == ([10, 20], [10, 11, 12, 20])
+
+
+def test_set_nice_and_scheduler_on_child():
+    """자식 프로세스에 nice/정책을 직접 적용하고 같은 값은 다시 쓰지 않음"""
+    child = subprocess.Popen(["sleep", "5"])
+    try:
+        deadline = time.monotonic() + 2
+        while open(f"/proc/{child.pid}/comm").read().strip() != "sleep" and time.monotonic() < deadline:
+            time.sleep(0.01)  # exec 완료 대기
+        index = ProcessIndex.scan()
+        assert child.pid in index.match("^sleep$")
+        tids = index.tids(child.pid)
+        assert set_nice(tids, 5)["changed"] == 1
+        assert os.getpriority(os.PRIO_PROCESS, child.pid) == 5
+        assert set_nice(tids, 5)["unchanged"] == 1
+
+        assert set_scheduler(tids, os.SCHED_BATCH)["changed"] == 1
+        assert os.sched_getscheduler(child.pid) == os.SCHED_BATCH
+    finally:
+        child.kill()
+        child.wait()
+    assert set_nice([child.pid], 5)["gone"] == 1
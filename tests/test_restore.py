@@ -1 +1,230 @@
-# Placeholder for test_restore.py
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+import pytest
+import src.restore as restore
+from src.utils import chunk_store, incremental_backup
+
+
+@pytest.fixture
+def backup_env(tmp_path, monkeypatch):
+    """임시 백업 디렉토리와 설정 파일로 restore 모듈 경로를 교체"""
+    config_path = tmp_path / "optimizer_settings.json"
+
+    def set_settings(**settings):
+        config_path.write_text(json.dumps({"restore_settings": settings}))
+
+    set_settings(backup_format="dedup", compression_workers=2)
+    monkeypatch.setattr(restore, "CONFIG_PATH", config_path)
+    monkeypatch.setattr(restore, "CUSTOM_BACKUP_DIR", tmp_path / "custom_backups")
+    monkeypatch.setattr(restore, "STORE_DIR", tmp_path / "custom_backups" / ".store")
+    return tmp_path, set_settings
+
+
+def make_source(root):
+    (root / "sub").mkdir(parents=True)
+    (root / "big.bin").write_bytes(os.urandom(3 * 1024 * 1024))
+    (root / "sub" / "small.txt").write_text("hello")
+    return root
+
+
+def store_size(tmp_path):
+    chunks = tmp_path / "custom_backups" / ".store" / "chunks"
+    return sum(f.stat().st_size for f in chunks.rglob("*") if f.is_file())
+
+
+def test_dedup_backup_restore_and_gc(backup_env):
+    """중복 제거 백업은 같은 데이터를 다시 저장하지 않고, 삭제 시 참조 없는 청크만 정리"""
+    tmp_path, _ = backup_env
+    source = make_source(tmp_path / "data")
+
+    assert restore.backup_directory(source).startswith("✅")
+    first_size = store_size(tmp_path)
+    (source / "sub" / "small.txt").write_text("changed")
+    assert restore.backup_directory(source).startswith("✅")
+    assert store_size(tmp_path) - first_size < 1024
+
+    backups = restore.list_custom_backups()
+    assert len(backups) == 2
+    assert all(p.name.endswith(".manifest.json") for p in backups)
+
+    dest = tmp_path / "restored"
+    dest.mkdir()
+    newest = max(backups, key=lambda p: p.name)
+    assert restore.restore_custom_backup(newest, str(dest))
+    restored = dest / newest.name[:-len(".manifest.json")]
+    assert (restored / "big.bin").read_bytes() == (source / "big.bin").read_bytes()
+    assert (restored / "sub" / "small.txt").read_text() == "changed"
+
+    for backup in backups:
+        assert restore.delete_custom_backup(backup)
+    assert store_size(tmp_path) == 0
+
+
+def test_chunking_throughput_and_stable_boundaries():
+    """청크 분할은 바이트별 파이썬 루프 없이 빠르게 처리되고, 중간에 삽입해도 바뀌는 청크는 주변뿐"""
+    data = os.urandom(32 * 1024 * 1024)
+    start = time.perf_counter()
+    chunks = list(chunk_store.iter_chunks(io.BytesIO(data)))
+    elapsed = time.perf_counter() - start
+    assert b"".join(chunks) == data
+    assert all(chunk_store.MIN_CHUNK <= len(c) <= chunk_store.MAX_CHUNK for c in chunks[:-1])
+    # 이전 Gear 루프는 약 6MB/s, 느린 CI 에서도 충분한 여유를 두고 30MB/s 이상 요구
+    assert len(data) / elapsed > 30 * 1024 * 1024
+
+    before = {hashlib.sha256(c).digest() for c in chunks}
+    edited = data[:10_000_000] + b"inserted" + data[10_000_000:]
+    after = [hashlib.sha256(c).digest() for c in chunk_store.iter_chunks(io.BytesIO(edited))]
+    assert sum(digest not in before for digest in after) <= 2
+
+    # 같은 바이트만 있는 데이터는 최대 크기로 자름
+    assert [len(c) for c in chunk_store.iter_chunks(io.BytesIO(bytes(9 * 1024 * 1024)))] == \
+        [chunk_store.MAX_CHUNK, chunk_store.MAX_CHUNK, 1024 * 1024]
+
+
+def test_dedup_single_file(backup_env):
+    """단일 파일 중복 제거 백업은 날짜포함 이름으로 복원"""
+    tmp_path, _ = backup_env
+    source = tmp_path / "hosts"
+    source.write_text("127.0.0.1 localhost\n")
+
+    assert restore.backup_file(source).startswith("✅")
+    backup = restore.list_custom_backups()[0]
+    assert restore.restore_custom_backup(backup, str(tmp_path))
+    assert (tmp_path / backup.name[:-len(".manifest.json")]).read_text() == "127.0.0.1 localhost\n"
+
+
+def test_incremental_chain_and_synthetic_full(backup_env):
+    """증분 백업은 바뀐 파일만 담고, 각 시점 복원과 synthetic full 통합이 가능해야 함"""
+    tmp_path, set_settings = backup_env
+    set_settings(backup_format="tar.gz", incremental=True, synthetic_full_every=3)
+    source = tmp_path / "data"
+    (source / "sub").mkdir(parents=True)
+    (source / "keep.txt").write_text("v1")
+    (source / "sub" / "gone.txt").write_text("bye")
+
+    def backup():
+        result = restore.backup_directory(source)
+        assert result.startswith("✅")
+        time.sleep(1.1)  # 타임스탬프 이름 구분
+
+    backup()                                                # full
+    (source / "sub" / "gone.txt").unlink()
+    (source / "new.txt").write_text("new")
+    backup()                                                # incremental
+    (source / "keep.txt").write_text("v2")
+    backup()                                                # incremental
+    (source / "new.txt").write_text("newer")
+    backup()                                                # synthetic_full
+
+    archives = sorted(p for p in restore.list_custom_backups())
+    kinds = [incremental_backup.load_sidecar(a)["kind"] for a in archives]
+    assert kinds == ["full", "incremental", "incremental", "synthetic_full"]
+    with tarfile.open(archives[1]) as tar:
+        assert sorted(tar.getnames()) == ["new.txt"]
+
+    def restored(archive):
+        dest = tmp_path / "out" / archive.name
+        dest.mkdir(parents=True)
+        assert restore.restore_custom_backup(archive, str(dest))
+        root = dest / archive.name[:-len(".tar.gz")]
+        return {str(p.relative_to(root)): p.read_text() for p in root.rglob("*") if p.is_file()}
+
+    assert restored(archives[0]) == {"keep.txt": "v1", "sub/gone.txt": "bye"}
+    assert restored(archives[2]) == {"keep.txt": "v2", "new.txt": "new"}
+    assert restored(archives[3]) == {"keep.txt": "v2", "new.txt": "newer"}
+
+    # 부분 복원: 증분 시점의 파일을 실제로 담고 있는 아카이브에서 추출
+    partial = tmp_path / "partial"
+    partial.mkdir()
+    assert restore.restore_custom_backup_members(archives[2], ["keep.txt", "new*"], str(partial)) != []
+    root = partial / archives[2].name[:-len(".tar.gz")]
+    assert (root / "keep.txt").read_text() == "v2"
+    assert (root / "new.txt").read_text() == "new"
+
+    # 다른 증분 백업이 참조하는 전체 백업은 삭제 불가, synthetic full 은 독립적
+    assert not restore.delete_custom_backup(archives[0])
+    assert incremental_backup.required_archives(incremental_backup.load_sidecar(archives[3])) == {archives[3].name}
+
+
+def test_catalog_listing_and_contains_search(backup_env):
+    """카탈로그로 목록/페이지/포함 파일 검색을 하고, 외부에서 추가·삭제된 백업도 반영"""
+    tmp_path, set_settings = backup_env
+    set_settings(backup_format="tar.gz", compression_workers=2)
+    source = make_source(tmp_path / "data")
+    assert restore.backup_directory(source).startswith("✅")
+
+    rows, total = restore.query_backups()
+    assert total == 1
+    assert rows[0]["format"] == "tar.gz"
+    assert rows[0]["source"] == str(source.resolve())
+    assert rows[0]["file_count"] >= 2
+    assert len(rows[0]["checksum"]) == 64
+
+    wanted = str(source.resolve() / "sub" / "small.txt")
+    assert [p.name for p in restore.find_backups_containing(wanted)] == [rows[0]["name"]]
+    assert restore.find_backups_containing("/etc/ssh/sshd_config") == []
+
+    # 카탈로그를 거치지 않고 복사된 기존 백업 파일
+    legacy = tmp_path / "custom_backups" / "20200101_000000_hosts"
+    legacy.write_text("127.0.0.1 localhost\n")
+    os.utime(legacy, (1577836800, 1577836800))
+    names = [p.name for p in restore.list_custom_backups()]
+    assert names == [rows[0]["name"], legacy.name]
+    assert [p.name for p in restore.list_custom_backups(offset=1, limit=1)] == [legacy.name]
+    assert [p.name for p in restore.list_custom_backups(name_filter="hosts")] == [legacy.name]
+
+    legacy.unlink()
+    assert restore.query_backups()[1] == 1
+    assert restore.delete_custom_backup(restore.list_custom_backups()[0])
+    assert restore.query_backups() == ([], 0)
+
+
+def test_retention_after_backup(backup_env):
+    """백업 직후 보존 정책 적용: 증분 체인 의존성은 유지, dedup 은 일괄 삭제 후 청크 회수"""
+    tmp_path, set_settings = backup_env
+    set_settings(backup_format="tar.gz", incremental=True, synthetic_full_every=10, restore_points=1)
+    source = tmp_path / "data"
+    source.mkdir()
+    for i in range(3):
+        (source / f"f{i}.txt").write_text(str(i))
+        assert restore.backup_directory(source).startswith("✅")
+        time.sleep(1.1)  # 타임스탬프 이름 구분
+    # 최신 1개만 남기지만 증분이 참조하는 full/이전 증분은 보존
+    assert len(restore.list_custom_backups()) == 3
+
+    set_settings(backup_format="tar.gz", incremental=False, restore_points=1)
+    (source / "f0.txt").write_text("full again")
+    assert restore.backup_directory(source).startswith("✅")
+    assert len(restore.list_custom_backups()) == 1
+    assert not list((tmp_path / "custom_backups").glob("*.meta.json"))
+
+    set_settings(backup_format="dedup", compression_workers=2)
+    dedup_source = make_source(tmp_path / "dedup")
+    for _ in range(3):
+        assert restore.backup_directory(dedup_source).startswith("✅")
+    result = restore.apply_retention({"restore_points": 1})
+    assert len(result["deleted"]) == 2
+    assert result["bytes_reclaimed"] > 0
+    assert len(restore.list_custom_backups()) == 2
+    assert store_size(tmp_path) > 3 * 1024 * 1024 * 0.9
+
+
+def test_failed_archive_leaves_no_partial_backup(backup_env, monkeypatch):
+    """아카이브 기록 도중 실패하면 잘린 tar.gz/인덱스가 백업 목록에 남지 않음"""
+    tmp_path, set_settings = backup_env
+    set_settings(backup_format="tar.gz", compression_workers=2)
+    source = make_source(tmp_path / "src")
+
+    def failing_add(self, tarinfo, fileobj=None):
+        if tarinfo.name.endswith("small.txt"):
+            raise OSError("디스크 가득 참")
+        return tarfile.TarFile.addfile(self, tarinfo, fileobj)
+
+    monkeypatch.setattr(restore.archive_index._IndexingTarFile, "addfile", failing_add)
+    assert restore.backup_directory(source).startswith("❌")
+    assert list((tmp_path / "custom_backups").iterdir()) == []
+    assert restore.list_custom_backups() == []
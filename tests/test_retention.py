@@ -0,0 +1,37 @@
+from datetime import datetime
+from src.utils.retention import plan_retention
+
+DAY = 86400
+NOW = datetime(2024, 6, 30, 12).timestamp()
+
+
+def rows(days_ago, source="/data"):
+    return [{"name": f"b{d:03d}", "source": source, "created": NOW - d * DAY} for d in days_ago]
+
+
+def deleted(plan):
+    return [row["name"] for row in plan["delete"]]
+
+
+def test_age_and_count_limits():
+    """개수/기간 제한을 함께 적용하고 원본별로 따로 계산"""
+    backups = rows(range(10)) + rows([100], source="/etc")
+    plan = plan_retention(backups, NOW, max_age_days=7, keep_last=3)
+    assert plan["keep"] == {"b000", "b001", "b002", "b100"}
+    assert deleted(plan) == ["b009", "b008", "b007", "b006", "b005", "b004", "b003"]
+
+
+def test_gfs_tiers_keep_representatives():
+    """GFS 단계별 대표 백업은 개수 제한을 넘어도 보존"""
+    plan = plan_retention(rows(range(60)), NOW, keep_last=1, gfs={"weekly": 3, "monthly": 2})
+    # 2024-06-30 은 일요일: 주별 대표는 0, 7, 14일 전 / 월별 대표는 6월(0일 전), 5월(30일 전)
+    assert plan["keep"] == {"b000", "b007", "b014", "b030"}
+
+
+def test_dependencies_are_pinned():
+    """보존되는 증분 백업이 필요로 하는 이전 아카이브는 만료돼도 유지"""
+    backups = rows([0, 1, 2, 3])
+    deps = {"b000": {"b001", "b003"}, "b001": {"b003"}}
+    plan = plan_retention(backups, NOW, keep_last=1, dependencies=deps)
+    assert plan["pinned"] == {"b001", "b003"}
+    assert deleted(plan) == ["b002"]
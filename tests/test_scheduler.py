@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from src.scheduler import Job, Scheduler, build_jobs
+from src.utils.cron import IntervalTrigger
+
+
+def run_for(scheduler, seconds):
+    async def main():
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        await task
+    asyncio.run(main())
+
+
+def test_class_concurrency_limit_and_state(tmp_path):
+    """같은 종류의 작업은 제한 개수만큼만 동시에 실행하고 마지막 실행 결과를 저장"""
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.2)
+        with lock:
+            active[0] -= 1
+        return "PASS"
+
+    jobs = [Job(f"job{i}", IntervalTrigger(0.05), work, job_class="backup") for i in range(3)]
+    state_path = tmp_path / "state.json"
+    run_for(Scheduler(jobs, state_path=state_path, class_limits={"backup": 1}), 0.5)
+
+    assert peak[0] == 1
+    state = json.loads(state_path.read_text())
+    assert set(state) == {"job0", "job1", "job2"}
+    assert all(entry["status"] == "PASS" for entry in state.values())
+
+
+def test_missed_runs_are_coalesced(tmp_path):
+    """중지 중 여러 번 놓친 실행은 재시작 직후 1회만 실행, catch_up=False 면 건너뜀"""
+    state_path = tmp_path / "state.json"
+    last = (datetime.now() - timedelta(hours=5)).isoformat(timespec="seconds")
+    state_path.write_text(json.dumps({"hourly": {"last_run": last}, "skipped": {"last_run": last}}))
+    calls = []
+    jobs = [
+        Job("hourly", IntervalTrigger(3600), lambda: calls.append("hourly")),
+        Job("skipped", IntervalTrigger(3600), lambda: calls.append("skipped"), catch_up=False),
+    ]
+    run_for(Scheduler(jobs, state_path=state_path), 0.3)
+    assert calls == ["hourly"]
+
+
+def test_build_jobs_from_config():
+    """auto_backup 간격 작업과 문자열로 저장된 scheduled_tasks 를 모두 인식"""
+    config = {
+        "restore_settings": {"auto_backup": True, "backup_interval_hours": 12},
+        "automation": {"scheduled_tasks": [
+            "{'name': 'zombie_checker', 'schedule': '*/30 * * * *', 'command': 'ignored'}",
+            {"name": "custom", "schedule": "@daily", "command": "true", "class": "misc"},
+        ]},
+    }
+    jobs = {job.name: job for job in build_jobs(config)}
+    assert jobs["backup"].trigger.seconds == 12 * 3600
+    assert jobs["zombie_checker"].job_class == "maintenance"
+    assert jobs["custom"].job_class == "misc"
+
+
+def test_replace_jobs_keeps_unchanged_schedule(tmp_path):
+    """설정 변경 시 일정이 같은 작업은 다음 실행 시각을 유지하고 새 작업만 계획"""
+    scheduler = Scheduler([Job("a", IntervalTrigger(3600), lambda: None)], state_path=tmp_path / "state.json")
+    scheduler.next_due = scheduler.plan()
+    due = scheduler.next_due["a"]
+    scheduler.replace_jobs([Job("a", IntervalTrigger(3600), lambda: None),
+                            Job("b", IntervalTrigger(60), lambda: None)])
+    assert scheduler.next_due["a"] == due
+    assert set(scheduler.next_due) == {"a", "b"}
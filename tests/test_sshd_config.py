@@ -0,0 +1,40 @@
+import pytest
+from src.utils.sshd_config import SshdConfig
+
+
+def make_config(tmp_path):
+    (tmp_path / "sshd_config.d").mkdir()
+    (tmp_path / "sshd_config.d" / "50-cloud.conf").write_text("PasswordAuthentication yes\n")
+    main = tmp_path / "sshd_config"
+    main.write_text("Include sshd_config.d/*.conf\n#MaxAuthTries 6\nPasswordAuthentication no\n"
+                    "Match Group admins\n    Include sshd_config.d/*.conf\n    MaxAuthTries 10\n")
+    return main
+
+
+def test_effective_values_follow_include_and_match(tmp_path):
+    """Include 파일의 값이 먼저 적용되고 Match 블록 값은 전역 유효값이 아님"""
+    config = SshdConfig(str(make_config(tmp_path)))
+    assert config.get("passwordauthentication") == "yes"
+    assert config.get("MaxAuthTries") is None
+
+    assert config.set("PasswordAuthentication", "no")
+    assert config.set("MaxAuthTries", 3)
+    assert not config.set("maxauthtries", "3")
+    assert config.get("PasswordAuthentication") == "no"
+
+    written = config.write(validate=lambda path: (True, ""))
+    assert sorted(written) == [str(tmp_path / "sshd_config"), str(tmp_path / "sshd_config.d" / "50-cloud.conf")]
+    assert (tmp_path / "sshd_config.d" / "50-cloud.conf").read_text() == "PasswordAuthentication no\n"
+    assert (tmp_path / "sshd_config").read_text().splitlines()[1] == "MaxAuthTries 3"
+    assert config.write() == []
+
+
+def test_write_rolls_back_when_validation_fails(tmp_path):
+    """sshd -t 실패 시 원래 파일 유지"""
+    main = make_config(tmp_path)
+    before = main.read_text()
+    config = SshdConfig(str(main))
+    config.set("MaxAuthTries", "abc")
+    with pytest.raises(ValueError):
+        config.write(validate=lambda path: (False, "Bad number"))
+    assert main.read_text() == before
@@ -0,0 +1,53 @@
+import json
+import threading
+from src.utils import trace
+from src.utils.cleanup import run_cleanup
+
+
+def test_disabled_span_is_noop():
+    """추적이 꺼져 있으면 공용 빈 객체를 반환하고 아무것도 기록하지 않음"""
+    assert not trace.enabled()
+    assert trace.span("x") is trace.NULL_SPAN
+    with trace.span("x") as span:
+        span.add(bytes=1)
+        trace.add(bytes=1)
+
+
+def test_profile_records_nested_spans(tmp_path):
+    """하위 구간의 카운터가 상위 구간에 합산되고 Chrome trace 와 요약표로 내보냄"""
+    path = tmp_path / "trace.json"
+    target = tmp_path / "tmp"
+    target.mkdir()
+    (target / "old.tmp").write_bytes(b"x" * 10)
+    lines = []
+
+    class Stream:
+        def write(self, text):
+            lines.append(text)
+
+    def other_thread():
+        with trace.span("other"):
+            pass
+
+    with trace.profile(str(path), stream=Stream()) as tracer:
+        with trace.span("outer", cat="test") as outer:
+            with trace.span("inner", size=3):
+                trace.add(bytes=100, subprocesses=1)
+            worker = threading.Thread(target=other_thread)
+            worker.start()
+            worker.join()
+        run_cleanup({"target_paths": [str(target)], "min_file_age_minutes": 0,
+                     "log_file_path": str(tmp_path / "cleanup.log")})
+    assert not trace.enabled()
+    assert outer.counters["bytes"] == 100 and outer.counters["subprocesses"] == 1
+
+    rows = {row["name"]: row for row in tracer.summary()}
+    assert set(rows) >= {"outer", "inner", "other", "cleanup", "cleanup.walk"}
+    assert rows["cleanup"]["entries"] == rows["cleanup.walk"]["entries"] >= 1
+
+    events = json.loads(path.read_text())["traceEvents"]
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert spans["inner"]["args"]["size"] == 3
+    assert spans["outer"]["dur"] >= spans["inner"]["dur"]
+    assert spans["other"]["tid"] != spans["outer"]["tid"]
+    assert any("trace 저장" in line for line in lines)
@@ -0,0 +1,40 @@
+from src.utils.tunables import tunable_path, parse_value, write_tunables
+
+
+def test_tunable_path():
+    """sysctl 키는 /proc/sys 경로로, 절대 경로는 그대로 변환"""
+    assert tunable_path("vm.swappiness") == "/proc/sys/vm/swappiness"
+    assert tunable_path("/sys/block/sda/queue/scheduler") == "/sys/block/sda/queue/scheduler"
+
+
+def test_parse_selected_choice():
+    """선택지 형식 파일은 대괄호 안의 값만 현재 값으로 사용"""
+    assert parse_value("mq-deadline [none] kyber\n") == "none"
+    assert parse_value("60\n") == "60"
+
+
+def test_write_skips_unchanged_values(tmp_path):
+    """현재 값과 같으면 기록하지 않고, 다르면 기록 후 키별 결과를 반환"""
+    same = tmp_path / "swappiness"
+    same.write_text("10\n")
+    changed = tmp_path / "read_ahead_kb"
+    changed.write_text("4096\n")
+    multi = tmp_path / "tcp_rmem"
+    multi.write_text("4096\t131072\t6291456\n")
+
+    results = write_tunables({str(same): 10, str(changed): 128, str(multi): "4096 131072 6291456"})
+    statuses = {r["path"]: r["status"] for r in results}
+
+    assert statuses == {str(same): "unchanged", str(changed): "changed", str(multi): "unchanged"}
+    assert changed.read_text() == "128"
+    assert results[1]["old"] == "4096"
+
+
+def test_dry_run_and_missing_file(tmp_path):
+    """dry_run 은 기록하지 않으며, 없는 파일은 failed 로 보고"""
+    target = tmp_path / "scheduler"
+    target.write_text("[mq-deadline] none\n")
+
+    results = write_tunables([(str(target), "none"), (str(tmp_path / "missing"), 1)], dry_run=True)
+    assert [r["status"] for r in results] == ["planned", "failed"]
+    assert target.read_text() == "[mq-deadline] none\n"
@@ -0,0 +1,65 @@
+import pytest
+from src.utils import ufw_rules
+
+RULES = """*filter
+:ufw-user-input - [0:0]
+:ufw-user-output - [0:0]
+### RULES ###
+
+### tuple ### allow tcp 22 0.0.0.0/0 any 0.0.0.0/0 in
+-A ufw-user-input -p tcp --dport 22 -j ACCEPT
+
+{managed}
+### END RULES ###
+COMMIT
+"""
+
+
+def make_state(tmp_path, managed=""):
+    (tmp_path / "ufw.conf").write_text("ENABLED=yes\n")
+    (tmp_path / "ufw").write_text('DEFAULT_INPUT_POLICY="ACCEPT"\nDEFAULT_OUTPUT_POLICY="ACCEPT"\n')
+    (tmp_path / "user.rules").write_text(RULES.format(managed=managed))
+    return ufw_rules.load_state(str(tmp_path / "ufw.conf"), str(tmp_path / "ufw"), [str(tmp_path / "user.rules")])
+
+
+def test_parse_port_spec_ranges_and_sets():
+    """단일 포트, 범위, 집합(multiport 15개 제한) 해석"""
+    assert ufw_rules.parse_port_spec(23) == [("any", "23")]
+    assert ufw_rules.parse_port_spec("6000-6007") == [("tcp", "6000:6007"), ("udp", "6000:6007")]
+    assert ufw_rules.parse_port_spec("80, 443/tcp") == [("tcp", "80,443")]
+    many = ufw_rules.parse_port_spec(",".join(str(p) for p in range(1000, 1020)) + "/udp")
+    assert [len(dport.split(",")) for _, dport in many] == [15, 5]
+    with pytest.raises(ValueError):
+        ufw_rules.parse_port_spec("70000")
+    assert ufw_rules.iptables_lines(("deny", "tcp", "80,443", "out")) == [
+        "-A ufw-user-output -p tcp -m multiport --dports 80,443 -j DROP"]
+
+
+def test_render_keeps_unmanaged_and_removes_stale(tmp_path):
+    """직접 추가한 규칙은 유지, 설정에서 빠진 관리 규칙만 삭제"""
+    stale = ufw_rules.compile_rules([25])
+    managed = "\n\n".join("\n".join([ufw_rules.tuple_line(r)] + ufw_rules.iptables_lines(r)) for r in stale)
+    state = make_state(tmp_path, managed + "\n")
+    assert state["managed"] == set(stale)
+
+    desired = ufw_rules.compile_rules([23])
+    plan = ufw_rules.plan_ufw(state, desired, {"incoming": "deny"})
+    assert plan["add"] == desired and plan["remove"] == sorted(stale)
+    assert plan["policies"] == [("incoming", "ACCEPT", "DROP")]
+
+    assert ufw_rules.commit(state, plan, lambda command: command == "ufw reload")
+    state = ufw_rules.load_state(str(tmp_path / "ufw.conf"), str(tmp_path / "ufw"), [str(tmp_path / "user.rules")])
+    assert state["rules"] == {("allow", "tcp", "22", "in")} | set(desired)
+    assert state["incoming"] == "DROP"
+    assert ufw_rules.plan_ufw(state, desired, {"incoming": "deny"})["files"] == {}
+
+
+def test_commit_rolls_back_on_failure(tmp_path):
+    """reload 실패 시 원래 파일로 복구 후 다시 적재"""
+    state = make_state(tmp_path)
+    before = (tmp_path / "user.rules").read_text()
+    plan = ufw_rules.plan_ufw(state, ufw_rules.compile_rules(["8000:8100"]), {})
+    commands = []
+    assert not ufw_rules.commit(state, plan, lambda command: commands.append(command) and False)
+    assert commands == ["ufw reload", "ufw reload"]
+    assert (tmp_path / "user.rules").read_text() == before